@@ -5,20 +5,38 @@
 # Licensed under the MIT License (see LICENSE file for details)
 
 
-from .imports import time
+from .imports import time, typing, concurrent
 
 from .providers import ProvidersManager, ProvidersProxyTester
-from .util import ProxyInfo
+from .util import ProxyScore, ProxyInfo, ProbeEvent, ProxyListReader, ProxyListWriter, ProbeResultCache, DeadEndpointFilter, EventLoopThread, SocketProfile, SchemePriors
 from .logger import Logger
+from .metrics import MetricsRegistry, REGISTRY
+from .pool import ProxyPoolService, PoolSnapshot
 
 class ProxySea:
-    def __init__(self, _debug: bool = False) -> None:
+    def __init__(
+            self,
+            _debug: bool = False,
+            _result_cache: typing.Optional[ProbeResultCache] = None,
+            _dead_filter: typing.Optional[DeadEndpointFilter] = None,
+            _socket_profile: typing.Optional[SocketProfile] = None,
+            _scheme_priors: typing.Optional[SchemePriors] = None
+        ) -> None:
         self.debug: bool = _debug
 
-        self.logger: Logger = Logger(_logger_name = "ProxySea", _debug = self.debug)
+        self.logger: Logger = Logger(_logger_name = "ProxySea", _debug = self.debug, _background = True)
 
-        self.providers_manager: ProvidersManager = ProvidersManager(_debug = self.debug)
-        self.providers_proxy_tester: ProvidersProxyTester = ProvidersProxyTester(_debug = self.debug)
+        self.providers_manager: ProvidersManager = ProvidersManager(_debug = self.debug, _dead_filter = _dead_filter)
+        self.providers_proxy_tester: ProvidersProxyTester = ProvidersProxyTester(
+            _debug = self.debug,
+            _result_cache = _result_cache,
+            _dead_filter = _dead_filter,
+            _socket_profile = _socket_profile,
+            _scheme_priors = _scheme_priors
+        )
+
+        # Metrics recorded by all ProxySea components (probes, providers, task runners)
+        self.metrics: MetricsRegistry = REGISTRY
         
         # TODO: Create api server for proxies
         # self.api_server: ApiServer = ApiServer()
@@ -44,16 +62,22 @@ class ProxySea:
                 list[ProxyInfo]: A list of fetched proxies converted into `ProxyInfo` object.
         """
 
-        self.logger.log(f"Starting fetching proxies from {len(self.providers_manager.PROVIDERS)} public providers.")
+        self.logger.log("Starting fetching proxies from {} public providers.", len(self.providers_manager.PROVIDERS), _level = "INFO")
 
         proxies: list[ProxyInfo] = await self.providers_manager.fetch_proxies(_concurrent_tasks = _concurrent_tasks)
 
-        self.logger.log(f"Fetched {len(proxies)} proxies.")
+        self.logger.log("Fetched {} proxies.", len(proxies), _level = "INFO")
 
         return proxies
 
 
-    async def test_proxies(self, _proxies: list[ProxyInfo], _concurrent_tasks: int = 500) -> list[ProxyInfo]:
+    async def test_proxies(
+            self,
+            _proxies: list[ProxyInfo],
+            _concurrent_tasks: int = 500,
+            _deadline: typing.Optional[float] = None,
+            _priority: typing.Optional[ProxyScore] = None
+        ) -> list[ProxyInfo]:
         """
             Tests the given proxies concurrently and returns a list of verified proxies.
 
@@ -63,6 +87,11 @@ class ProxySea:
             Args:
                 _proxies (list[ProxyInfo]): A list of `ProxyInfo` objects to be tested.
                 _concurrent_tasks (int, optional): Maximum number of concurrent testing tasks. Defaults to 500.
+                _deadline (float, optional): Time budget (in seconds) for the whole batch. Probes still
+                    running when it expires are cancelled and their proxies come back with `is_tested`
+                    set to False. Defaults to no budget.
+                _priority (ProxyScore, optional): Score function, proxies are tested highest score first
+                    (see `ProxySea.util.priority`). Defaults to input order.
 
             Returns:
                 list[ProxyInfo]: A list of tested (e.g., working or verified) `ProxyInfo` objects.
@@ -72,7 +101,7 @@ class ProxySea:
         """
 
         start = time.perf_counter()
-        self.logger.log(f"Starting testing proxies.")
+        self.logger.log("Starting testing proxies.", _level = "INFO")
 
         if not _proxies:
             return []
@@ -80,11 +109,247 @@ class ProxySea:
         if not all(isinstance(proxy, ProxyInfo) for proxy in _proxies):
             raise ValueError("All items in _proxies must be instances of ProxyInfo.")
 
-        self.logger.log(f"Testing {len(_proxies)} proxies.")
+        self.logger.log("Testing {} proxies.", len(_proxies), _level = "INFO")
 
-        tested_proxies: list[ProxyInfo] = await self.providers_proxy_tester.test_proxies(_proxies = _proxies, _concurrent_tasks = _concurrent_tasks)
+        tested_proxies: list[ProxyInfo] = await self.providers_proxy_tester.test_proxies(
+            _proxies = _proxies,
+            _concurrent_tasks = _concurrent_tasks,
+            _deadline = _deadline,
+            _priority = _priority
+        )
         working: int = sum(proxy.is_active for proxy in tested_proxies)
 
-        self.logger.log(f"Tested {len(tested_proxies)} proxies, {working} of them are flagged as working. Tested all proxies in {float(time.perf_counter() - start):.2f} seconds.")
+        self.logger.log(
+            "Tested {} proxies, {} of them are flagged as working. Tested all proxies in {:.2f} seconds.",
+            sum(proxy.is_tested for proxy in tested_proxies), working, time.perf_counter() - start,
+            _level = "INFO"
+        )
 
         return tested_proxies
+
+
+    async def test_proxies_stream(
+            self,
+            _proxies: typing.Iterable[ProxyInfo] | typing.AsyncIterable[ProxyInfo],
+            _concurrent_tasks: int = 500,
+            _priority: typing.Optional[ProxyScore] = None,
+            _priority_window: typing.Optional[int] = None
+        ) -> typing.AsyncIterator[ProxyInfo]:
+        """
+            Tests proxies from an iterable or async iterable and yields them as tests complete.
+
+            Unlike `test_proxies`, the proxies are never collected into a list, so lists read
+            lazily with `ProxyListReader` can be tested with bounded memory. Results can be
+            written out incrementally with `ProxyListWriter`.
+
+            Args:
+                _proxies (Iterable[ProxyInfo] | AsyncIterable[ProxyInfo]): Proxies to test.
+                _concurrent_tasks (int, optional): Maximum number of concurrent testing tasks. Defaults to 500.
+                _priority (ProxyScore, optional): Score function, queued proxies are tested highest score first.
+                _priority_window (int, optional): Number of queued proxies ordered by `_priority`. Defaults to `_concurrent_tasks`.
+
+            Yields:
+                ProxyInfo: Tested proxies, in completion order.
+        """
+
+        stream: typing.AsyncIterator[ProxyInfo] = self.providers_proxy_tester.test_proxies_stream(
+            _proxies = _proxies,
+            _concurrent_tasks = _concurrent_tasks,
+            _priority = _priority,
+            _priority_window = _priority_window
+        )
+
+        async for proxy in stream:
+            yield proxy
+
+
+    def create_pool_service(
+            self,
+            _refresh_intervals: typing.Optional[dict[str, float]] = None,
+            _default_refresh_interval: float = 600.0,
+            _retest_interval: float = 120.0,
+            _concurrent_tasks: int = 200,
+            _max_pool_size: typing.Optional[int] = None,
+            _test_deadline: typing.Optional[float] = None,
+            _test_priority: typing.Optional[ProxyScore] = None
+        ) -> ProxyPoolService:
+        """
+            Creates a `ProxyPoolService` keeping a pool of working proxies fresh in the background.
+
+            The service uses the providers and the tester of this instance. Readers take
+            `service.snapshot`, an immutable `PoolSnapshot` swapped atomically on every refresh.
+
+            Args:
+                _refresh_intervals (dict[str, float], optional): Refresh interval (in seconds) per provider domain.
+                _default_refresh_interval (float, optional): Refresh interval of other providers. Defaults to 600.
+                _retest_interval (float, optional): Interval (in seconds) between re-tests of the pool. Defaults to 120.
+                _concurrent_tasks (int, optional): Maximum number of proxies tested at once. Defaults to 200.
+                _max_pool_size (int, optional): Maximum number of proxies in the pool. Defaults to no limit.
+                _test_deadline (float, optional): Time budget (in seconds) of one test round. Defaults to no budget.
+                _test_priority (ProxyScore, optional): Score function ordering the tests of a round. Defaults to input order.
+
+            Returns:
+                ProxyPoolService: The service, start it with `await service.start()` or `async with service:`.
+        """
+
+        return ProxyPoolService(
+            _providers = self.providers_manager.PROVIDERS,
+            _proxy_tester = self.providers_proxy_tester,
+            _refresh_intervals = _refresh_intervals,
+            _default_refresh_interval = _default_refresh_interval,
+            _retest_interval = _retest_interval,
+            _concurrent_tasks = _concurrent_tasks,
+            _max_pool_size = _max_pool_size,
+            _test_deadline = _test_deadline,
+            _test_priority = _test_priority,
+            _debug = self.debug
+        )
+
+
+class SyncProxySea:
+    """
+    Blocking facade of `ProxySea` for synchronous and multi-threaded code.
+
+    One event loop runs in a background thread for the whole life of the instance. Every method
+    runs its coroutine on that loop and blocks until it finishes, `submit()` returns a thread-safe
+    future instead. Because the loop is never torn down, pool services, rotators and everything
+    cached on the loop stay warm between calls, and a thread pool can share one instance.
+
+    Attributes:
+        proxy_sea (ProxySea): The async instance living on the loop.
+        loop_thread (EventLoopThread): The background loop.
+        pool_services (list[ProxyPoolService]): Services started with `start_pool_service()`.
+        metrics (MetricsRegistry): Metrics recorded by all ProxySea components.
+
+    Examples:
+    ```
+        >>> with SyncProxySea() as PS:
+        >>>     tested = PS.test_proxies(PS.fetch_proxies(), _deadline = 60)
+
+        >>>     service = PS.start_pool_service(_retest_interval = 120)
+        >>>     rotator = ProxyRotator(service) # Readable from any thread
+
+        >>>     future = PS.submit(PS.proxy_sea.fetch_proxies)
+        >>>     print(len(future.result()))
+        >>>     412 # Result of the print
+    ```
+    """
+
+    def __init__(
+            self,
+            _debug: bool = False,
+            _result_cache: typing.Optional[ProbeResultCache] = None,
+            _dead_filter: typing.Optional[DeadEndpointFilter] = None,
+            _socket_profile: typing.Optional[SocketProfile] = None,
+            _scheme_priors: typing.Optional[SchemePriors] = None
+        ) -> None:
+        self.loop_thread: EventLoopThread = EventLoopThread(_name = "ProxySea")
+        self.loop_thread.start()
+
+        async def create() -> ProxySea:
+            # Built on the loop, so everything it creates belongs to the loop
+            return ProxySea(
+                _debug = _debug,
+                _result_cache = _result_cache,
+                _dead_filter = _dead_filter,
+                _socket_profile = _socket_profile,
+                _scheme_priors = _scheme_priors
+            )
+
+        self.proxy_sea: ProxySea = self.loop_thread.run(create())
+        self.pool_services: list[ProxyPoolService] = []
+        self.metrics: MetricsRegistry = REGISTRY
+
+    def __enter__(self) -> "SyncProxySea":
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.close()
+
+    def submit(self, _function: typing.Callable[..., typing.Awaitable], *_args: typing.Any, **_kwargs: typing.Any) -> concurrent.futures.Future:
+        """
+        Runs `await _function(*_args, **_kwargs)` on the loop and returns a `concurrent.futures.Future` of its result.
+        """
+
+        async def call() -> typing.Any:
+            return await _function(*_args, **_kwargs)
+
+        return self.loop_thread.submit(call())
+
+    def run(self, _coroutine: typing.Coroutine, _timeout: typing.Optional[float] = None) -> typing.Any:
+        """
+        Runs a coroutine on the loop and blocks until it returns, e.g. `PS.run(service.wait_for_snapshot(0))`.
+        """
+
+        return self.loop_thread.run(_coroutine, _timeout = _timeout)
+
+    def fetch_proxies(self, _concurrent_tasks: int = 10) -> list[ProxyInfo]:
+        """
+        Blocking `ProxySea.fetch_proxies`.
+        """
+
+        return self.run(self.proxy_sea.fetch_proxies(_concurrent_tasks = _concurrent_tasks))
+
+    def test_proxies(
+            self,
+            _proxies: list[ProxyInfo],
+            _concurrent_tasks: int = 500,
+            _deadline: typing.Optional[float] = None,
+            _priority: typing.Optional[ProxyScore] = None
+        ) -> list[ProxyInfo]:
+        """
+        Blocking `ProxySea.test_proxies`.
+        """
+
+        return self.run(self.proxy_sea.test_proxies(
+            _proxies = _proxies,
+            _concurrent_tasks = _concurrent_tasks,
+            _deadline = _deadline,
+            _priority = _priority
+        ))
+
+    def test_proxies_stream(
+            self,
+            _proxies: typing.Iterable[ProxyInfo] | typing.AsyncIterable[ProxyInfo],
+            _concurrent_tasks: int = 500,
+            _priority: typing.Optional[ProxyScore] = None,
+            _priority_window: typing.Optional[int] = None
+        ) -> typing.Iterator[ProxyInfo]:
+        """
+        Blocking iterator over `ProxySea.test_proxies_stream`, proxies are yielded as their tests complete.
+        """
+
+        return self.loop_thread.iterate(self.proxy_sea.test_proxies_stream(
+            _proxies = _proxies,
+            _concurrent_tasks = _concurrent_tasks,
+            _priority = _priority,
+            _priority_window = _priority_window
+        ))
+
+    def start_pool_service(self, **_kwargs: typing.Any) -> ProxyPoolService:
+        """
+        Creates a `ProxyPoolService` (see `ProxySea.create_pool_service`) and starts it on the loop.
+
+        Its snapshots can be read from any thread, the service is stopped by `close()`.
+        """
+
+        service: ProxyPoolService = self.proxy_sea.create_pool_service(**_kwargs)
+
+        self.run(service.start())
+        self.pool_services.append(service)
+
+        return service
+
+    def close(self) -> None:
+        """
+        Stops the started pool services and the background loop.
+        """
+
+        if not self.loop_thread.is_running:
+            return
+
+        for service in self.pool_services:
+            self.run(service.stop())
+
+        self.pool_services.clear()
+        self.loop_thread.stop()
@@ -0,0 +1,2 @@
+from .httpx_transport import ProxyRotatingTransport
+from .requests_adapter import ProxyRotatingAdapter
@@ -0,0 +1,220 @@
+from ..imports import httpx, asyncio, collections, importlib, typing
+
+from ..logger import Logger
+from ..pool import ProxyRotator
+from ..util import ProxyInfo
+
+
+class ReleaseOnCloseStream(httpx.AsyncByteStream):
+    # Response body of an upstream transport, calls `_release` once when the response is closed
+    def __init__(self, _stream: httpx.AsyncByteStream, _release: typing.Callable[[], None]) -> None:
+        self.stream: httpx.AsyncByteStream = _stream
+        self.release: typing.Optional[typing.Callable[[], None]] = _release
+
+    async def __aiter__(self) -> typing.AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self.stream.aclose()
+
+        finally:
+            if self.release is not None:
+                release, self.release = self.release, None
+                release()
+
+
+class ProxyRotatingTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport sending every request (or session) through a proxy picked from a ProxySea pool.
+
+    One `httpx.AsyncHTTPTransport` is kept per proxy, so connections to a proxy are reused across
+    requests instead of being opened for every client. When a proxy fails with a transport error,
+    the failure is reported into the proxy's circuit breaker and idempotent requests are retried on
+    another proxy (unless their body is a stream that can't be sent twice).
+
+    Transports evicted from the LRU are closed once their last request and response are done.
+
+    Attributes:
+        rotator (ProxyRotator): Picks proxies and records their outcomes.
+        retries (int): Maximum number of other proxies tried after a failure of an idempotent request.
+        sticky (bool): If True, one proxy is used for all requests until it fails (session rotation).
+        session_key (Callable[[httpx.Request], str | None] | None): Maps requests to session keys. Requests
+            with the same key keep their proxy (consistent hashing) while it is healthy.
+        max_transports (int): Maximum number of per-proxy transports kept open, least recently used are closed.
+
+    Examples:
+    ```
+        >>> transport = ProxyRotatingTransport(ProxyRotator(service, _schemes = ("HTTP",)))
+
+        >>> async with httpx.AsyncClient(transport = transport) as client:
+        >>>     response = await client.get("http://example.com")
+    ```
+    """
+
+    IDEMPOTENT_METHODS: frozenset[str] = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"])
+
+    PROXY_URL_SCHEMES: dict[str, str] = {
+        "HTTP": "http",
+        "HTTPS": "https",
+        "SOCKS5": "socks5"
+    }
+
+    def __init__(
+            self,
+            _rotator: ProxyRotator,
+            _retries: int = 2,
+            _sticky: bool = False,
+            _session_key: typing.Optional[typing.Callable[[httpx.Request], typing.Optional[str]]] = None,
+            _max_transports: int = 256,
+            **_transport_kwargs: typing.Any
+        ) -> None:
+        """
+        Args:
+            _rotator (ProxyRotator): Picks proxies from the pool.
+            _retries (int): Maximum number of other proxies tried after a failure of an idempotent request.
+            _sticky (bool): If True, keep using one proxy until it fails instead of rotating per request.
+            _session_key (Callable | None): Maps a request to a session key (e.g. `lambda request: request.url.host`).
+            _max_transports (int): Maximum number of per-proxy transports kept open.
+            **_transport_kwargs: Passed to every `httpx.AsyncHTTPTransport` (e.g. `verify`, `retries`, `limits`).
+
+        Raises:
+            ValueError: If the rotator picks schemes httpx can't use, or SOCKS5 without `socksio` installed.
+        """
+
+        unsupported: list[str] = [scheme for scheme in _rotator.schemes if scheme not in self.PROXY_URL_SCHEMES]
+
+        if unsupported:
+            raise ValueError(f"httpx doesn't support {unsupported} proxies. Use some of them {list(self.PROXY_URL_SCHEMES)}.")
+
+        # Checked here, httpx would raise ImportError on the first SOCKS5 pick, outside of the failover
+        if "SOCKS5" in _rotator.schemes and importlib.util.find_spec("socksio") is None:
+            raise ValueError("httpx needs the socksio package for SOCKS5 proxies, install it with `pip install httpx[socks]`.")
+
+        self.rotator: ProxyRotator = _rotator
+        self.retries: int = _retries
+        self.sticky: bool = _sticky
+        self.session_key: typing.Optional[typing.Callable[[httpx.Request], typing.Optional[str]]] = _session_key
+        self.max_transports: int = _max_transports
+        self.transport_kwargs: dict[str, typing.Any] = _transport_kwargs
+
+        self.transports: collections.OrderedDict[str, httpx.AsyncHTTPTransport] = collections.OrderedDict()
+
+        # Requests (until their response is closed) using each transport, evicted transports wait for 0 to close
+        self.users: dict[httpx.AsyncHTTPTransport, int] = {}
+        self.evicted: set[httpx.AsyncHTTPTransport] = set()
+        self.close_tasks: set[asyncio.Task] = set()
+
+        self.current: typing.Optional[ProxyInfo] = None
+
+        self.logger: Logger = Logger(_logger_name = "ProxyRotatingTransport", _background = True)
+
+    def get_transport(self, _proxy: ProxyInfo) -> httpx.AsyncHTTPTransport:
+        transport: typing.Optional[httpx.AsyncHTTPTransport] = self.transports.get(_proxy.id)
+
+        if transport is not None:
+            self.transports.move_to_end(_proxy.id)
+            return transport
+
+        transport = self.transports[_proxy.id] = httpx.AsyncHTTPTransport(
+            proxy = f"{self.PROXY_URL_SCHEMES[_proxy.scheme]}://{_proxy.host}:{_proxy.port}",
+            **self.transport_kwargs
+        )
+
+        while len(self.transports) > self.max_transports:
+            _, evicted = self.transports.popitem(last = False)
+
+            if self.users.get(evicted):
+                self.evicted.add(evicted)
+
+            else:
+                self.close_later(evicted)
+
+        return transport
+
+    def acquire(self, _transport: httpx.AsyncHTTPTransport) -> None:
+        self.users[_transport] = self.users.get(_transport, 0) + 1
+
+    def release(self, _transport: httpx.AsyncHTTPTransport) -> None:
+        users: int = self.users.pop(_transport) - 1
+
+        if users:
+            self.users[_transport] = users
+
+        elif _transport in self.evicted:
+            self.evicted.discard(_transport)
+            self.close_later(_transport)
+
+    def close_later(self, _transport: httpx.AsyncHTTPTransport) -> None:
+        task: asyncio.Task = asyncio.create_task(_transport.aclose())
+
+        self.close_tasks.add(task)
+        task.add_done_callback(self.close_tasks.discard)
+
+    @staticmethod
+    def is_replayable(_request: httpx.Request) -> bool:
+        # Bodies given as bytes (or json, data) can be sent again, async iterators are consumed by the first attempt
+        return isinstance(_request.stream, httpx.ByteStream)
+
+    def choose(self, _exclude: set[str], _key: typing.Optional[str] = None) -> typing.Optional[ProxyInfo]:
+        if _key is not None:
+            return self.rotator.choose(_exclude = _exclude, _key = _key)
+
+        if self.sticky and self.current is not None and self.current.id not in _exclude and not self.current.is_blacklisted:
+            return self.current
+
+        self.current = self.rotator.choose(_exclude = _exclude)
+        return self.current
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempts: int = 1 + (self.retries if request.method in self.IDEMPOTENT_METHODS and self.is_replayable(request) else 0)
+        tried: set[str] = set()
+        error: typing.Optional[httpx.TransportError] = None
+        key: typing.Optional[str] = self.session_key(request) if self.session_key is not None else None
+
+        for _ in range(attempts):
+            proxy: typing.Optional[ProxyInfo] = self.choose(tried, _key = key)
+
+            if proxy is None:
+                break
+
+            tried.add(proxy.id)
+
+            transport: httpx.AsyncHTTPTransport = self.get_transport(proxy)
+            self.acquire(transport)
+
+            try:
+                response: httpx.Response = await transport.handle_async_request(request)
+
+            except httpx.TransportError as e:
+                self.release(transport)
+
+                error = e
+                self.rotator.report(proxy, _success = False, _client = "httpx")
+                self.logger.log("Request to {} via {} failed: {}", request.url, proxy.url, repr(e))
+                continue
+
+            except BaseException:
+                self.release(transport)
+                raise
+
+            response.stream = ReleaseOnCloseStream(response.stream, lambda transport = transport: self.release(transport))
+
+            self.rotator.report(proxy, _success = True, _client = "httpx")
+            return response
+
+        if error is not None:
+            raise error
+
+        raise httpx.ProxyError("No usable proxy in the pool.", request = request)
+
+    async def aclose(self) -> None:
+        transports: list[httpx.AsyncHTTPTransport] = [*self.transports.values(), *self.evicted]
+        self.transports.clear()
+        self.evicted.clear()
+
+        for transport in transports:
+            await transport.aclose()
+
+        await asyncio.gather(*self.close_tasks, return_exceptions = True)
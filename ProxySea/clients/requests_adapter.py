@@ -0,0 +1,172 @@
+from ..imports import requests, threading, collections, typing
+
+from ..logger import Logger
+from ..pool import ProxyRotator
+from ..util import ProxyInfo
+
+
+class ProxyRotatingAdapter(requests.adapters.HTTPAdapter):
+    """
+    requests adapter sending every request through a proxy picked from a ProxySea pool.
+
+    Mount it on a `requests.Session`. The urllib3 `ProxyManager` of every proxy is kept (up to
+    `max_proxy_managers`, least recently used are dropped), so connections through a proxy are reused
+    across calls instead of being opened for every request. Connection errors are reported into the
+    proxy's circuit breaker and idempotent requests are retried on another proxy, unless their body is
+    a stream that can't be sent twice (seekable files are rewound). The adapter can be shared by a
+    pool of threads.
+
+    Attributes:
+        rotator (ProxyRotator): Picks proxies and records their outcomes.
+        retries (int): Maximum number of other proxies tried after a failure of an idempotent request.
+        sticky (bool): If True, every thread keeps using one proxy until it fails.
+        session_key (Callable[[requests.PreparedRequest], str | None] | None): Maps requests to session keys.
+            Requests with the same key keep their proxy (consistent hashing) while it is healthy.
+        max_proxy_managers (int): Maximum number of per-proxy connection pools kept open.
+
+    Examples:
+    ```
+        >>> session = requests.Session()
+        >>> session.mount("http://", ProxyRotatingAdapter(ProxyRotator(service)))
+        >>> session.mount("https://", ProxyRotatingAdapter(ProxyRotator(service)))
+
+        >>> response = session.get("https://example.com", timeout = 5)
+    ```
+    """
+
+    IDEMPOTENT_METHODS: frozenset[str] = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"])
+
+    # SOCKS proxies need the PySocks extra (requests[socks])
+    PROXY_URL_SCHEMES: dict[str, str] = {
+        "HTTP": "http",
+        "HTTPS": "https",
+        "SOCKS5": "socks5h",
+        "SOCKS4": "socks4a"
+    }
+
+    def __init__(
+            self,
+            _rotator: ProxyRotator,
+            _retries: int = 2,
+            _sticky: bool = False,
+            _session_key: typing.Optional[typing.Callable[[typing.Any], typing.Optional[str]]] = None,
+            _max_proxy_managers: int = 256,
+            **_adapter_kwargs: typing.Any
+        ) -> None:
+        """
+        Args:
+            _rotator (ProxyRotator): Picks proxies from the pool.
+            _retries (int): Maximum number of other proxies tried after a failure of an idempotent request.
+            _sticky (bool): If True, every thread keeps using one proxy until it fails.
+            _session_key (Callable | None): Maps a prepared request to a session key (e.g. its cookie or host).
+            _max_proxy_managers (int): Maximum number of per-proxy connection pools kept open.
+            **_adapter_kwargs: Passed to `HTTPAdapter` (e.g. `pool_connections`, `pool_maxsize`).
+        """
+
+        self.rotator: ProxyRotator = _rotator
+        self.retries: int = _retries
+        self.sticky: bool = _sticky
+        self.session_key: typing.Optional[typing.Callable[[typing.Any], typing.Optional[str]]] = _session_key
+        self.max_proxy_managers: int = _max_proxy_managers
+
+        self.local: threading.local = threading.local()
+        self.managers_lock: threading.Lock = threading.Lock()
+        self.managers_order: collections.OrderedDict[str, None] = collections.OrderedDict()
+
+        self.logger: Logger = Logger(_logger_name = "ProxyRotatingAdapter", _background = True)
+
+        super().__init__(**_adapter_kwargs)
+
+    def proxy_manager_for(self, proxy: str, **proxy_kwargs: typing.Any):
+        # HTTPAdapter caches one ProxyManager per proxy URL, but neither bounds nor locks the cache
+        with self.managers_lock:
+            manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+
+            self.managers_order[proxy] = None
+            self.managers_order.move_to_end(proxy)
+
+            while len(self.managers_order) > self.max_proxy_managers:
+                evicted, _ = self.managers_order.popitem(last = False)
+
+                # Only dropped, not cleared: another thread may still be sending through it.
+                # Its idle connections are closed when the manager is garbage collected.
+                self.proxy_manager.pop(evicted)
+
+            return manager
+
+    def get_proxy_url(self, _proxy: ProxyInfo) -> str:
+        return f"{self.PROXY_URL_SCHEMES[_proxy.scheme]}://{_proxy.host}:{_proxy.port}"
+
+    def choose(self, _exclude: set[str], _key: typing.Optional[str] = None) -> typing.Optional[ProxyInfo]:
+        if _key is not None:
+            return self.rotator.choose(_exclude = _exclude, _key = _key)
+
+        current: typing.Optional[ProxyInfo] = getattr(self.local, "current", None)
+
+        if self.sticky and current is not None and current.id not in _exclude and not current.is_blacklisted:
+            return current
+
+        self.local.current = self.rotator.choose(_exclude = _exclude)
+        return self.local.current
+
+    @staticmethod
+    def get_body_position(_body: typing.Any) -> typing.Optional[int]:
+        # Offset a body is rewound to before a retry: 0 for in-memory bodies, the current offset of seekable
+        # files, None for generators and other streams the first attempt consumes
+        if _body is None or isinstance(_body, (bytes, bytearray, str)):
+            return 0
+
+        try:
+            return _body.tell() if hasattr(_body, "seek") and (not hasattr(_body, "seekable") or _body.seekable()) else None
+
+        except (OSError, ValueError):
+            return None
+
+    def send(self, request, stream = False, timeout = None, verify = True, cert = None, proxies = None):
+        body_position: typing.Optional[int] = self.get_body_position(request.body)
+        attempts: int = 1 + (self.retries if request.method in self.IDEMPOTENT_METHODS and body_position is not None else 0)
+        tried: set[str] = set()
+        error: typing.Optional[requests.exceptions.ConnectionError] = None
+        key: typing.Optional[str] = self.session_key(request) if self.session_key is not None else None
+
+        for attempt in range(attempts):
+            proxy: typing.Optional[ProxyInfo] = self.choose(tried, _key = key)
+
+            if proxy is None:
+                break
+
+            if attempt and hasattr(request.body, "seek"):
+                # The failed attempt may have sent part of the file
+                request.body.seek(body_position)
+
+            tried.add(proxy.id)
+            proxy_url: str = self.get_proxy_url(proxy)
+
+            try:
+                response = super().send(
+                    request,
+                    stream = stream,
+                    timeout = timeout,
+                    verify = verify,
+                    cert = cert,
+                    proxies = {"http": proxy_url, "https": proxy_url}
+                )
+
+            except requests.exceptions.ConnectionError as e:
+                error = e
+                self.rotator.report(proxy, _success = False, _client = "requests")
+                self.logger.log("Request to {} via {} failed: {}", request.url, proxy.url, repr(e))
+                continue
+
+            self.rotator.report(proxy, _success = True, _client = "requests")
+            return response
+
+        if error is not None:
+            raise error
+
+        raise requests.exceptions.ProxyError("No usable proxy in the pool.", request = request)
+
+    def close(self) -> None:
+        with self.managers_lock:
+            self.managers_order.clear()
+            super().close()
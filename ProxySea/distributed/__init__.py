@@ -0,0 +1,2 @@
+from .coordinator import DistributedCoordinator
+from .worker import DistributedWorker, run_worker
@@ -0,0 +1,273 @@
+from ..imports import asyncio, collections, itertools, time, typing
+
+from ..logger import Logger
+from ..metrics import DISTRIBUTED_LEASES_TOTAL
+from ..util import ProxyInfo
+from .protocol import MAX_MESSAGE_SIZE, send_message, read_message, encode_proxy
+
+
+class DistributedCoordinator:
+    """
+    Shards a proxy list into leased batches and hands them to `DistributedWorker` processes over TCP.
+
+    A single host runs out of ephemeral ports and file descriptors long before it runs out of
+    proxies to test. The coordinator spreads the probes over worker processes (on this host or
+    others): every worker leases a batch, tests it and streams the compact results back. Leases
+    expire after `lease_timeout` seconds, and are released at once when their worker disconnects,
+    so batches of crashed or stuck workers are handed to other workers.
+
+    Results are validated as a whole before any proxy is updated, a malformed reply never leaves a
+    batch half-applied.
+
+    The protocol is one JSON object per line. Workers send {"type": "lease"} and get a batch
+    ({"type": "batch", "lease": id, "proxies": [[scheme, host, port], ...]}), {"type": "wait"} while
+    all remaining batches are leased, or {"type": "done"}. Results are sent as {"type": "results",
+    "lease": id, "results": [[scheme, active, tested], ...]} in the order of the batch.
+
+    Attributes:
+        proxies (list[ProxyInfo]): Proxies to test, results are written into them.
+        batches (list[list[ProxyInfo]]): The proxies split into batches of `batch_size`. Blacklisted
+            proxies (open circuit) are not sent to workers, they are returned as tested like `test_proxy()` does.
+        pending (deque[int]): Indexes of batches waiting for a worker.
+        leases (dict[int, tuple[int, float]]): (batch index, expiry) of every active lease, by lease id.
+        expired (dict[int, int]): Batch index of every expired lease, by lease id. Late results of an
+            expired lease are still accepted while nobody else completed the batch.
+        completed (set[int]): Indexes of batches with results.
+        lease_timeout (float): Seconds a worker has to return the results of a batch.
+        address (tuple[str, int]): Host and port the coordinator listens on, set by `start()`.
+
+    Methods:
+        start() / stop():
+            Starts or stops the TCP server.
+
+        wait(_timeout):
+            Waits until every batch has results and returns the proxies.
+
+    Examples:
+    ```
+        >>> async with DistributedCoordinator(proxies, _batch_size = 1000) as coordinator:
+        >>>     host, port = coordinator.address
+        >>>     # Start workers: python -m ProxySea.distributed.worker --host HOST --port PORT
+        >>>     tested = await coordinator.wait()
+    ```
+    """
+
+    SCHEMES: frozenset[str] = frozenset(["HTTPS", "HTTP", "SOCKS5", "SOCKS4"])
+
+    def __init__(
+            self,
+            _proxies: typing.Iterable[ProxyInfo],
+            _host: str = "127.0.0.1",
+            _port: int = 0,
+            _batch_size: int = 500,
+            _lease_timeout: float = 60.0,
+            _debug: bool = False
+        ) -> None:
+        """
+        Args:
+            _proxies (Iterable[ProxyInfo]): Proxies to test.
+            _host (str): Address to listen on, "0.0.0.0" accepts workers from other hosts.
+            _port (int): Port to listen on, 0 picks a free port.
+            _batch_size (int): Proxies per lease.
+            _lease_timeout (float): Seconds before an unanswered lease is handed to another worker.
+        """
+
+        if _batch_size <= 0:
+            raise ValueError("You have to provide _batch_size > 0.")
+
+        self.proxies: list[ProxyInfo] = list(_proxies)
+        shipped: list[ProxyInfo] = []
+
+        for proxy in self.proxies:
+            if proxy.is_blacklisted:
+                # Workers only get the address, they can't know the circuit is open. Skipped here, like test_proxy does.
+                proxy.is_tested = True
+                continue
+
+            # Stays False if a worker reports it untested, it must not keep the flag of an earlier round
+            proxy.is_tested = False
+            shipped.append(proxy)
+
+        self.batches: list[list[ProxyInfo]] = [shipped[index:index + _batch_size] for index in range(0, len(shipped), _batch_size)]
+
+        self.pending: collections.deque[int] = collections.deque(range(len(self.batches)))
+        self.leases: dict[int, tuple[int, float]] = {}
+        self.expired: dict[int, int] = {}
+        self.completed: set[int] = set()
+
+        self.host: str = _host
+        self.port: int = _port
+        self.lease_timeout: float = _lease_timeout
+        self.lease_ids: typing.Iterator[int] = itertools.count(1)
+
+        self.server: typing.Optional[asyncio.AbstractServer] = None
+        self.address: typing.Optional[tuple[str, int]] = None
+        self.finished: asyncio.Event = asyncio.Event()
+
+        if not self.batches:
+            self.finished.set()
+
+        self.logger: Logger = Logger(_logger_name = "DistributedCoordinator", _debug = _debug, _background = True)
+
+    async def __aenter__(self) -> "DistributedCoordinator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self.handle, self.host, self.port, limit = MAX_MESSAGE_SIZE)
+        self.address = self.server.sockets[0].getsockname()[:2]
+
+        self.logger.log("Coordinator listening on {}:{} with {} batches.", *self.address, len(self.batches), _level = "INFO")
+
+    async def stop(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def wait(self, _timeout: typing.Optional[float] = None) -> list[ProxyInfo]:
+        await asyncio.wait_for(self.finished.wait(), timeout = _timeout)
+        return self.proxies
+
+    def requeue_expired(self) -> None:
+        now: float = time.monotonic()
+
+        for lease_id, (batch_index, expires_at) in list(self.leases.items()):
+            if expires_at <= now:
+                self.release(lease_id, _event = "expired")
+
+    def release(self, _lease_id: int, _event: str) -> None:
+        batch_index, _ = self.leases.pop(_lease_id)
+
+        if _event == "expired":
+            # The worker may only be slow, its results are still welcome if they come first
+            self.expired[_lease_id] = batch_index
+
+        if batch_index not in self.completed:
+            # Handed out first, it has waited the longest
+            self.pending.appendleft(batch_index)
+
+        DISTRIBUTED_LEASES_TOTAL.inc(_event)
+        self.logger.log("Lease {} of batch {} {}.", _lease_id, batch_index, _event)
+
+    def grant(self) -> dict:
+        self.requeue_expired()
+
+        while self.pending:
+            batch_index: int = self.pending.popleft()
+
+            if batch_index in self.completed:
+                continue
+
+            lease_id: int = next(self.lease_ids)
+            self.leases[lease_id] = (batch_index, time.monotonic() + self.lease_timeout)
+            DISTRIBUTED_LEASES_TOTAL.inc("granted")
+
+            return {"type": "batch", "lease": lease_id, "proxies": [encode_proxy(proxy) for proxy in self.batches[batch_index]]}
+
+        if self.finished.is_set():
+            return {"type": "done"}
+
+        # Everything left is leased, ask again when the first lease may have expired
+        next_expiry: float = min((expires_at for _, expires_at in self.leases.values()), default = time.monotonic() + 1)
+        return {"type": "wait", "delay": min(1.0, max(0.05, next_expiry - time.monotonic()))}
+
+    @staticmethod
+    def validate_results(_results: typing.Any, _batch: list[ProxyInfo]) -> typing.Optional[str]:
+        # Returns why the results can't be applied to the batch, or None if all of them can
+        if not isinstance(_results, list) or len(_results) != len(_batch):
+            return f"{len(_results) if isinstance(_results, list) else 'no'} results for {len(_batch)} proxies"
+
+        for index, row in enumerate(_results):
+            if not isinstance(row, list) or len(row) != 3:
+                return f"malformed result {index}"
+
+            scheme, active, tested = row
+
+            if tested and active and scheme and scheme not in DistributedCoordinator.SCHEMES:
+                return f"unknown scheme {scheme!r} in result {index}"
+
+        return None
+
+    def complete(self, _lease_id: int, _results: list) -> None:
+        lease: typing.Optional[tuple[int, float]] = self.leases.pop(_lease_id, None)
+
+        if lease is not None:
+            batch_index, _ = lease
+
+        elif _lease_id in self.expired:
+            # Expired and maybe handed to another worker, results are still good if nobody finished first
+            batch_index = self.expired.pop(_lease_id)
+
+        else:
+            # Unknown or released when its worker disconnected
+            return
+
+        if batch_index in self.completed:
+            return
+
+        batch: list[ProxyInfo] = self.batches[batch_index]
+        error: typing.Optional[str] = self.validate_results(_results, batch)
+
+        if error is not None:
+            self.logger.log("Lease {} returned {}, ignored.", _lease_id, error, _level = "WARNING")
+
+            # An expired lease's batch is already pending or leased again
+            if lease is not None:
+                self.pending.appendleft(batch_index)
+
+            return
+
+        for proxy, (scheme, active, tested) in zip(batch, _results):
+            if not tested:
+                continue
+
+            if active and scheme:
+                proxy.set_proxy_scheme(_scheme = scheme)
+
+            proxy.set_is_active(_active = bool(active))
+            proxy.update_connection_retries()
+            proxy.is_tested = True
+
+        self.completed.add(batch_index)
+        DISTRIBUTED_LEASES_TOTAL.inc("completed")
+
+        if len(self.completed) == len(self.batches):
+            self.logger.log("All {} batches tested.", len(self.batches), _level = "INFO")
+            self.finished.set()
+
+    async def handle(self, _reader: asyncio.StreamReader, _writer: asyncio.StreamWriter) -> None:
+        held: set[int] = set()
+
+        try:
+            while (message := await read_message(_reader)) is not None:
+                if message.get("type") == "lease":
+                    reply: dict = self.grant()
+
+                    if reply["type"] == "batch":
+                        held.add(reply["lease"])
+
+                    await send_message(_writer, reply)
+
+                elif message.get("type") == "results":
+                    held.discard(message["lease"])
+                    self.complete(message["lease"], message["results"])
+
+                    await send_message(_writer, {"type": "ack"})
+
+                else:
+                    await send_message(_writer, {"type": "error", "reason": f"Unknown message type: {message.get('type')}"})
+
+        except (ConnectionError, ValueError, KeyError, TypeError) as e:
+            self.logger.log("Worker connection failed → {}: {}", type(e).__name__, e, _level = "WARNING")
+
+        finally:
+            # Batches of a worker that went away don't wait for their lease to expire
+            for lease_id in held:
+                if lease_id in self.leases:
+                    self.release(lease_id, _event = "released")
+
+            _writer.close()
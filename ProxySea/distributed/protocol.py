@@ -0,0 +1,39 @@
+from ..imports import asyncio, json, typing
+
+from ..util import ProxyInfo
+
+# Longest accepted message line, a batch of 10 000 proxies is about 400 KB
+MAX_MESSAGE_SIZE: int = 16 * 1024 * 1024
+
+
+async def send_message(_writer: asyncio.StreamWriter, _message: dict) -> None:
+    # One compact JSON object per line
+    _writer.write(json.dumps(_message, separators = (",", ":")).encode() + b"\n")
+    await _writer.drain()
+
+
+async def read_message(_reader: asyncio.StreamReader) -> typing.Optional[dict]:
+    """
+    Reads one message, returns None when the peer closed the connection.
+    """
+
+    line: bytes = await _reader.readline()
+
+    if not line:
+        return None
+
+    return json.loads(line)
+
+
+def encode_proxy(_proxy: ProxyInfo) -> list:
+    return [_proxy.scheme, _proxy.host, _proxy.port]
+
+
+def decode_proxy(_values: list) -> ProxyInfo:
+    scheme, host, port = _values
+    return ProxyInfo(_scheme = scheme, _host = host, _port = port)
+
+
+def encode_result(_proxy: ProxyInfo) -> list:
+    # Results keep the order of the batch, so the address isn't sent back
+    return [_proxy.scheme if _proxy.is_active else None, int(_proxy.is_active), int(_proxy.is_tested)]
@@ -0,0 +1,112 @@
+from ..imports import asyncio, typing
+
+from ..logger import Logger
+from ..providers import ProvidersProxyTester
+from ..util import ProxyInfo
+from .protocol import MAX_MESSAGE_SIZE, send_message, read_message, decode_proxy, encode_result
+
+
+class DistributedWorker:
+    """
+    Leases batches of proxies from a `DistributedCoordinator`, tests them and sends the results back.
+
+    Run one worker per process (or per host); every worker keeps its own file descriptors and
+    ephemeral ports, so the number of probes in flight grows with the number of workers.
+
+    Attributes:
+        host (str): Address of the coordinator.
+        port (int): Port of the coordinator.
+        tester (ProvidersProxyTester): Tests the leased proxies.
+        concurrent_tasks (int): Maximum number of proxies tested at once.
+        batch_deadline (float | None): Time budget of one batch, results of proxies cut off are
+            sent as untested, or None.
+        tested (int): Number of proxies tested by this worker.
+
+    Examples:
+    ```
+        >>> await DistributedWorker("127.0.0.1", 7575, _concurrent_tasks = 2000).run()
+
+        $ python -m ProxySea.distributed.worker --host 10.0.0.5 --port 7575 --concurrency 2000
+    ```
+    """
+
+    def __init__(
+            self,
+            _host: str,
+            _port: int,
+            _tester: typing.Optional[ProvidersProxyTester] = None,
+            _concurrent_tasks: int = 500,
+            _batch_deadline: typing.Optional[float] = None,
+            _debug: bool = False
+        ) -> None:
+        self.host: str = _host
+        self.port: int = _port
+        self.tester: ProvidersProxyTester = _tester if _tester is not None else ProvidersProxyTester(_debug = _debug)
+        self.concurrent_tasks: int = _concurrent_tasks
+        self.batch_deadline: typing.Optional[float] = _batch_deadline
+
+        self.tested: int = 0
+
+        self.logger: Logger = Logger(_logger_name = "DistributedWorker", _debug = _debug, _background = True)
+
+    async def run(self) -> int:
+        """
+        Tests batches until the coordinator has none left, returns the number of proxies tested.
+        """
+
+        reader, writer = await asyncio.open_connection(self.host, self.port, limit = MAX_MESSAGE_SIZE)
+
+        try:
+            while True:
+                await send_message(writer, {"type": "lease"})
+                message: typing.Optional[dict] = await read_message(reader)
+
+                if message is None or message["type"] == "done":
+                    break
+
+                if message["type"] == "wait":
+                    await asyncio.sleep(message["delay"])
+                    continue
+
+                if message["type"] != "batch":
+                    raise ConnectionError(f"Unexpected message from the coordinator: {message}")
+
+                proxies: list[ProxyInfo] = [decode_proxy(values) for values in message["proxies"]]
+
+                tested: list[ProxyInfo] = await self.tester.test_proxies(
+                    proxies,
+                    _concurrent_tasks = self.concurrent_tasks,
+                    _deadline = self.batch_deadline
+                )
+
+                await send_message(writer, {"type": "results", "lease": message["lease"], "results": [encode_result(proxy) for proxy in tested]})
+                await read_message(reader)
+
+                self.tested += len(tested)
+                self.logger.log("Tested batch {} ({} proxies).", message["lease"], len(tested))
+
+        finally:
+            writer.close()
+
+        return self.tested
+
+
+def run_worker(_host: str, _port: int, _concurrent_tasks: int = 500, _batch_deadline: typing.Optional[float] = None) -> int:
+    """
+    Blocking entry point, e.g. the target of a `multiprocessing.Process`.
+    """
+
+    return asyncio.run(DistributedWorker(_host, _port, _concurrent_tasks = _concurrent_tasks, _batch_deadline = _batch_deadline).run())
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description = "Test proxies leased from a ProxySea DistributedCoordinator.")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, required = True)
+    parser.add_argument("--concurrency", type = int, default = 500)
+    parser.add_argument("--batch-deadline", type = float, default = None)
+    arguments = parser.parse_args()
+
+    print(f"Tested {run_worker(arguments.host, arguments.port, arguments.concurrency, arguments.batch_deadline)} proxies.")
@@ -1,28 +1,105 @@
+import importlib, importlib.util
+
+class LazyModule:
+    """
+    Placeholder for a module that is imported on first attribute access.
+
+    Third-party dependencies (httpx, bs4, lxml, py_mini_racer, colorama) and heavier standard library
+    modules (dataclasses) are expensive to import, and most short-lived processes only use some of them.
+    `LazyModule` only checks that the module is installed when ProxySea is imported, the import itself
+    is deferred until the module is used.
+
+    Submodules that are not imported by their parent package (e.g. `lxml.html`) are imported
+    on first access as well.
+
+    Examples:
+    ```
+        >>> httpx = LazyModule("httpx")
+        >>> client = httpx.AsyncClient() # httpx is imported here
+    ```
+    """
+
+    def __init__(self, _name: str) -> None:
+        if importlib.util.find_spec(_name) is None:
+            raise ModuleNotFoundError(f"No module named '{_name}'", name = _name)
+
+        self.__dict__["_name"] = _name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        if self._module is None:
+            self.__dict__["_module"] = importlib.import_module(self._name)
+
+        return self._module
+
+    def _has_submodule(self, _attribute: str) -> bool:
+        try:
+            return importlib.util.find_spec(f"{self._name}.{_attribute}") is not None
+
+        # Raised when the module is not a package
+        except ModuleNotFoundError:
+            return False
+
+    def __getattr__(self, _attribute: str):
+        module = self._load()
+
+        try:
+            value = getattr(module, _attribute)
+
+        except AttributeError:
+            # Only fall back to a submodule that exists, a typo must stay an AttributeError
+            if not self._has_submodule(_attribute):
+                raise
+
+            value = importlib.import_module(f"{self._name}.{_attribute}")
+
+        # Cache the attribute, following accesses skip __getattr__ entirely
+        self.__dict__[_attribute] = value
+        return value
+
+    def __repr__(self) -> str:
+        return f"<LazyModule '{self._name}' ({'loaded' if self._module is not None else 'not loaded'})>"
+
+
 try:
     # Networking imports
-    import httpx
+    httpx = LazyModule("httpx")
+    bs4 = LazyModule("bs4")
+    lxml = LazyModule("lxml")
+    py_mini_racer = LazyModule("py_mini_racer")
+    requests = LazyModule("requests")
     import socket
-    import bs4
-    import lxml
-    import py_mini_racer
     import ssl
 
     # Logger imports
+    colorama = LazyModule("colorama")
     import datetime
-    import colorama
-
-    # Tests imports
-    import pytest
-    import pytest_asyncio
-    import unittest
-    import poetry
+    import queue
+    import atexit
+    import sys
 
     # Additional imports
-    import dataclasses
+    dataclasses = LazyModule("dataclasses")
     import typing
     import struct
     import time
     import asyncio
     import random
+    import json
+    import threading
+    import contextlib
+    import bisect
+    import copy
+    import mmap
+    import csv
+    import io
+    import codecs
+    import os
+    import itertools
+    import collections
+    import hashlib
+    import array
+    import math
+    import concurrent.futures
 except Exception:
-    raise Exception("You have to install all of the dependencies before running this project.")
\ No newline at end of file
+    raise Exception("You have to install all of the dependencies before running this project.")
@@ -1,46 +1,211 @@
-from ..imports import datetime, colorama
+from ..imports import datetime, colorama, time, threading, typing, queue, atexit, sys
 
 
-class CLR:
-    RESET = colorama.Style.RESET_ALL
+class CLRMeta(type):
+    # Resolves color constants from colorama on first access, so colorama is only imported when something is printed.
+    def __getattr__(cls, _name: str) -> str:
+        if _name not in cls.COLORS:
+            raise AttributeError(_name)
 
-    # Standardowe kolory tekstu
-    CYAN = colorama.Fore.CYAN
-    RED = colorama.Fore.RED
-    GREEN = colorama.Fore.GREEN
-    YELLOW = colorama.Fore.YELLOW
-    MAGENTA = colorama.Fore.MAGENTA
-    BLUE = colorama.Fore.BLUE
-    WHITE = colorama.Fore.WHITE
+        group, attribute = cls.COLORS[_name]
+        value: str = getattr(getattr(colorama, group), attribute)
 
-    # "Pogrubione" kolory – jasne wersje
-    CYAN_BOLD = colorama.Fore.LIGHTCYAN_EX
-    RED_BOLD = colorama.Fore.LIGHTRED_EX
-    GREEN_BOLD = colorama.Fore.LIGHTGREEN_EX
-    YELLOW_BOLD = colorama.Fore.LIGHTYELLOW_EX
-    MAGENTA_BOLD = colorama.Fore.LIGHTMAGENTA_EX
-    BLUE_BOLD = colorama.Fore.LIGHTBLUE_EX
-    WHITE_BOLD = colorama.Fore.LIGHTWHITE_EX
+        setattr(cls, _name, value)
+        return value
 
-    # Style
-    BOLD = colorama.Style.BRIGHT
-    DIM = colorama.Style.DIM
-    NORMAL = colorama.Style.NORMAL
+
+class CLR(metaclass = CLRMeta):
+    COLORS: dict[str, tuple[str, str]] = {
+        "RESET": ("Style", "RESET_ALL"),
+
+        # Standardowe kolory tekstu
+        "CYAN": ("Fore", "CYAN"),
+        "RED": ("Fore", "RED"),
+        "GREEN": ("Fore", "GREEN"),
+        "YELLOW": ("Fore", "YELLOW"),
+        "MAGENTA": ("Fore", "MAGENTA"),
+        "BLUE": ("Fore", "BLUE"),
+        "WHITE": ("Fore", "WHITE"),
+
+        # "Pogrubione" kolory – jasne wersje
+        "CYAN_BOLD": ("Fore", "LIGHTCYAN_EX"),
+        "RED_BOLD": ("Fore", "LIGHTRED_EX"),
+        "GREEN_BOLD": ("Fore", "LIGHTGREEN_EX"),
+        "YELLOW_BOLD": ("Fore", "LIGHTYELLOW_EX"),
+        "MAGENTA_BOLD": ("Fore", "LIGHTMAGENTA_EX"),
+        "BLUE_BOLD": ("Fore", "LIGHTBLUE_EX"),
+        "WHITE_BOLD": ("Fore", "LIGHTWHITE_EX"),
+
+        # Style
+        "BOLD": ("Style", "BRIGHT"),
+        "DIM": ("Style", "DIM"),
+        "NORMAL": ("Style", "NORMAL")
+    }
+
+
+class LogWriter:
+    # Writes log records to stdout from a background thread, so formatting, timestamps and
+    # the blocking write never run on the caller's thread (e.g. the asyncio event loop).
+
+    _shared_writer: typing.Optional["LogWriter"] = None
+    _shared_writer_lock: threading.Lock = threading.Lock()
+
+    def __init__(self, _max_queue_size: int = 100_000) -> None:
+        self.queue: queue.Queue = queue.Queue(maxsize = _max_queue_size)
+        self.dropped: int = 0
+
+        self.thread: threading.Thread = threading.Thread(target = self.run, name = "ProxySea-LogWriter", daemon = True)
+        self.thread.start()
+
+        # Write out everything that is still queued when the interpreter exits
+        atexit.register(self.flush)
+
+    @classmethod
+    def get_shared_writer(cls) -> "LogWriter":
+        if cls._shared_writer is None:
+            with cls._shared_writer_lock:
+                if cls._shared_writer is None:
+                    cls._shared_writer = cls()
+
+        return cls._shared_writer
+
+    def write(self, _logger: "Logger", _record: tuple) -> None:
+        try:
+            self.queue.put_nowait((_logger, _record))
+
+        except queue.Full:
+            # Never block the caller, losing a debug line is cheaper than stalling the event loop
+            self.dropped += 1
+
+    def run(self) -> None:
+        while True:
+            logger, record = self.queue.get()
+
+            try:
+                sys.stdout.write(logger.format_record(record) + "\n")
+
+                if self.queue.empty():
+                    sys.stdout.flush()
+
+            except Exception:
+                pass
+
+            finally:
+                self.queue.task_done()
+
+    def flush(self) -> None:
+        self.queue.join()
 
 
 class Logger:
-    def __init__(self, _logger_name: str = "Logger", _debug: bool = False) -> None:
+    LEVELS: dict[str, int] = {
+        "DEBUG": 10,
+        "INFO": 20,
+        "WARNING": 30,
+        "ERROR": 40
+    }
+
+    LEVEL_COLORS: dict[str, str] = {
+        "DEBUG": "CYAN",
+        "INFO": "WHITE",
+        "WARNING": "YELLOW_BOLD",
+        "ERROR": "RED_BOLD"
+    }
+
+    # (second, timestamp) of the last formatted record, strftime runs at most once per second
+    _timestamp_cache: tuple[int, str] = (-1, "")
+    _timestamp_lock: threading.Lock = threading.Lock()
+
+    # Arguments of these types can't change before the writer thread formats them, anything else is snapshotted
+    IMMUTABLE_TYPES: tuple[type, ...] = (str, int, float, bool, bytes, type(None))
+
+    def __init__(
+            self,
+            _logger_name: str = "Logger",
+            _debug: bool = False,
+            _level: typing.Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "DEBUG",
+            _background: bool = False
+        ) -> None:
         self.debug: bool = _debug
 
+        if _level.upper() not in self.LEVELS:
+            raise ValueError(f"Unknown log level: {_level}. Use one of them {list(self.LEVELS)}.")
+
+        # Level information
+        self.level: str = _level.upper()
+        self.level_no: int = self.LEVELS[self.level]
+
         # ID Information
         self.logger_name: str = f"[{_logger_name}]"
 
+        # Records are formatted and written by the shared LogWriter thread when set to True
+        self.background: bool = _background
+
         self.CLR = CLR
-    
-    def log(self, message: str) -> None:
-        if not self.debug:
+
+    def is_enabled(self, _level: str = "DEBUG") -> bool:
+        # Cheap guard for call sites that need to compute expensive log arguments
+        return self.debug and self.LEVELS[_level] >= self.level_no
+
+    def log(self, message: typing.Any, *_args: typing.Any, _level: str = "DEBUG", **_fields: typing.Any) -> None:
+        # `message` is formatted with `_args` only when the record is written, background loggers only
+        # turn mutable arguments into strings here (see `snapshot_record()`):
+        #   >>> logger.log("Tested {} proxies in {:.2f} seconds.", count, elapsed, provider = "spys.one")
+        if not self.debug or self.LEVELS[_level] < self.level_no:
+            return
+
+        record: tuple = (time.time(), _level, message, _args, _fields)
+
+        if self.background:
+            LogWriter.get_shared_writer().write(self, self.snapshot_record(record))
             return
 
-        now: datetime.datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        print(self.format_record(record))
+
+    def info(self, message: typing.Any, *_args: typing.Any, **_fields: typing.Any) -> None:
+        self.log(message, *_args, _level = "INFO", **_fields)
+
+    def warning(self, message: typing.Any, *_args: typing.Any, **_fields: typing.Any) -> None:
+        self.log(message, *_args, _level = "WARNING", **_fields)
+
+    def error(self, message: typing.Any, *_args: typing.Any, **_fields: typing.Any) -> None:
+        self.log(message, *_args, _level = "ERROR", **_fields)
+
+    def flush(self) -> None:
+        # Waits until all records queued by background loggers are written
+        if LogWriter._shared_writer is not None:
+            LogWriter._shared_writer.flush()
+
+    def snapshot_record(self, _record: tuple) -> tuple:
+        # Mutable arguments (e.g. ProxyInfo) are rendered now, the writer thread formats the record later
+        # and would otherwise show their state at write time
+        created, level, message, args, fields = _record
+
+        if any(not isinstance(arg, self.IMMUTABLE_TYPES) for arg in args):
+            args = tuple(arg if isinstance(arg, self.IMMUTABLE_TYPES) else str(arg) for arg in args)
+
+        if any(not isinstance(value, self.IMMUTABLE_TYPES) for value in fields.values()):
+            fields = {key: value if isinstance(value, self.IMMUTABLE_TYPES) else str(value) for key, value in fields.items()}
+
+        return created, level, str(message), args, fields
+
+    def format_record(self, _record: tuple) -> str:
+        created, level, message, args, fields = _record
+
+        second: int = int(created)
+
+        with Logger._timestamp_lock:
+            cached_second, timestamp = Logger._timestamp_cache
+
+            if second != cached_second:
+                timestamp = datetime.datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+                Logger._timestamp_cache = (second, timestamp)
+
+        text: str = str(message).format(*args) if args else str(message)
+
+        if fields:
+            text += " " + " ".join(f"{CLR.DIM}{key}={CLR.RESET}{value}" for key, value in fields.items())
+
+        level_color: str = getattr(CLR, self.LEVEL_COLORS[level])
 
-        print(f"({CLR.YELLOW}{now}{CLR.RESET}) {CLR.GREEN}{self.logger_name}{CLR.RESET} {CLR.NORMAL}{message}{CLR.RESET}")
+        return f"({CLR.YELLOW}{timestamp}{CLR.RESET}) {CLR.GREEN}{self.logger_name}{CLR.RESET} {level_color}{level}{CLR.RESET} {CLR.NORMAL}{text}{CLR.RESET}"
@@ -0,0 +1,361 @@
+from ..imports import threading, contextlib, typing, time, bisect
+
+
+class MetricShards:
+    """
+    Per-thread storage for metric values.
+
+    Every thread records into its own dictionary, so recording never takes a lock. The lock is
+    only taken once per thread (to register its shard) and when values are collected.
+    """
+
+    def __init__(self) -> None:
+        self.local: threading.local = threading.local()
+        self.shards: list[dict] = []
+        self.lock: threading.Lock = threading.Lock()
+
+    def get(self) -> dict:
+        try:
+            return self.local.values
+
+        except AttributeError:
+            values: dict = {}
+
+            with self.lock:
+                self.shards.append(values)
+
+            self.local.values = values
+            return values
+
+    def snapshot(self) -> list[dict]:
+        with self.lock:
+            # dict.copy() runs without releasing the GIL, so a shard can't change while it is copied
+            return [shard.copy() for shard in self.shards]
+
+
+class Metric:
+    TYPE: str = "untyped"
+
+    def __init__(self, _name: str, _help: str, _labels: typing.Sequence[str] = ()) -> None:
+        self.name: str = _name
+        self.help: str = _help
+        self.labels: tuple[str, ...] = tuple(_labels)
+
+        self.shards: MetricShards = MetricShards()
+
+    def format_labels(self, _values: tuple, _extra: typing.Optional[tuple[str, str]] = None) -> str:
+        pairs: list[tuple[str, str]] = list(zip(self.labels, _values))
+
+        if _extra:
+            pairs.append(_extra)
+
+        if not pairs:
+            return ""
+
+        return "{" + ",".join(f'{name}="{self.escape_label_value(value)}"' for name, value in pairs) + "}"
+
+    @staticmethod
+    def escape_label_value(_value: typing.Any) -> str:
+        return str(_value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    def expose(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.TYPE}"]
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing value, e.g. number of probes sent.
+
+    Examples:
+    ```
+        >>> probes = Counter("probes_total", "Probes sent.", ["scheme"])
+        >>> probes.inc("HTTP")
+        >>> print(probes.value("HTTP"))
+        >>> 1 # Result of the print
+    ```
+    """
+
+    TYPE: str = "counter"
+
+    def inc(self, *_label_values: typing.Any, _amount: float = 1) -> None:
+        values: dict = self.shards.get()
+        values[_label_values] = values.get(_label_values, 0) + _amount
+
+    def collect(self) -> dict[tuple, float]:
+        totals: dict[tuple, float] = {}
+
+        for shard in self.shards.snapshot():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0) + value
+
+        return totals
+
+    def value(self, *_label_values: typing.Any) -> float:
+        return self.collect().get(_label_values, 0)
+
+    def expose(self) -> list[str]:
+        lines: list[str] = super().expose()
+
+        for key, value in sorted(self.collect().items(), key = lambda item: tuple(map(str, item[0]))):
+            lines.append(f"{self.name}{self.format_labels(key)} {value}")
+
+        return lines
+
+
+class Gauge(Counter):
+    """
+    Value that can go up and down, e.g. number of tasks in flight.
+
+    `inc()` and `dec()` are lock-free and can be called from any thread. `set()` overrides the
+    value and is meant to be called from a single owner thread.
+    """
+
+    TYPE: str = "gauge"
+
+    def __init__(self, _name: str, _help: str, _labels: typing.Sequence[str] = ()) -> None:
+        super().__init__(_name, _help, _labels)
+        self.base: dict[tuple, float] = {}
+
+    def dec(self, *_label_values: typing.Any, _amount: float = 1) -> None:
+        self.inc(*_label_values, _amount = -_amount)
+
+    def set(self, _value: float, *_label_values: typing.Any) -> None:
+        deltas: float = sum(shard.get(_label_values, 0) for shard in self.shards.snapshot())
+        self.base[_label_values] = _value - deltas
+
+    def collect(self) -> dict[tuple, float]:
+        totals: dict[tuple, float] = super().collect()
+
+        for key, value in self.base.copy().items():
+            totals[key] = totals.get(key, 0) + value
+
+        return totals
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values (e.g. durations in seconds) over fixed buckets.
+
+    Examples:
+    ```
+        >>> durations = Histogram("fetch_seconds", "Fetch duration.", ["provider"])
+
+        >>> with durations.time("spys.one"):
+        >>>     ...
+
+        >>> print(durations.count("spys.one"))
+        >>> 1 # Result of the print
+    ```
+    """
+
+    TYPE: str = "histogram"
+
+    DEFAULT_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(
+            self,
+            _name: str,
+            _help: str,
+            _labels: typing.Sequence[str] = (),
+            _buckets: typing.Sequence[float] = DEFAULT_BUCKETS
+        ) -> None:
+        super().__init__(_name, _help, _labels)
+        self.buckets: tuple[float, ...] = tuple(sorted(_buckets))
+
+    def observe(self, _value: float, *_label_values: typing.Any) -> None:
+        values: dict = self.shards.get()
+        state: typing.Optional[list] = values.get(_label_values)
+
+        if state is None:
+            # One counter per bucket, one for +Inf, then the sum of observed values
+            state = values[_label_values] = [0] * (len(self.buckets) + 2)
+
+        state[bisect.bisect_left(self.buckets, _value)] += 1
+        state[-1] += _value
+
+    @contextlib.contextmanager
+    def time(self, *_label_values: typing.Any) -> typing.Iterator[None]:
+        start: float = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.observe(time.perf_counter() - start, *_label_values)
+
+    def collect(self) -> dict[tuple, list]:
+        totals: dict[tuple, list] = {}
+
+        for shard in self.shards.snapshot():
+            for key, state in shard.items():
+                total: list = totals.setdefault(key, [0] * len(state))
+
+                for index, value in enumerate(list(state)):
+                    total[index] += value
+
+        return totals
+
+    def count(self, *_label_values: typing.Any) -> int:
+        state: typing.Optional[list] = self.collect().get(_label_values)
+        return sum(state[:-1]) if state else 0
+
+    def sum(self, *_label_values: typing.Any) -> float:
+        state: typing.Optional[list] = self.collect().get(_label_values)
+        return state[-1] if state else 0.0
+
+    def expose(self) -> list[str]:
+        lines: list[str] = super().expose()
+
+        for key, state in sorted(self.collect().items(), key = lambda item: tuple(map(str, item[0]))):
+            cumulative: int = 0
+
+            for bound, value in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += value
+                le: str = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{self.format_labels(key, ('le', le))} {cumulative}")
+
+            lines.append(f"{self.name}_sum{self.format_labels(key)} {state[-1]}")
+            lines.append(f"{self.name}_count{self.format_labels(key)} {cumulative}")
+
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics with a Prometheus text-format exposition.
+
+    Recording into a metric is lock-free: every thread records into its own shard, and shards
+    are only merged when the metrics are collected by `expose()`.
+
+    Methods:
+        counter(_name, _help, _labels):
+            Returns the counter registered under `_name`, creating it if needed.
+
+        gauge(_name, _help, _labels):
+            Returns the gauge registered under `_name`, creating it if needed.
+
+        histogram(_name, _help, _labels, _buckets):
+            Returns the histogram registered under `_name`, creating it if needed.
+
+        expose():
+            Returns all metrics in the Prometheus text exposition format.
+
+    Examples:
+    ```
+        >>> registry = MetricsRegistry()
+        >>> registry.counter("probes_total", "Probes sent.", ["scheme"]).inc("HTTP")
+        >>> print(registry.expose())
+        >>> # HELP probes_total Probes sent.
+        >>> # TYPE probes_total counter
+        >>> probes_total{scheme="HTTP"} 1
+    ```
+    """
+
+    def __init__(self) -> None:
+        self.metrics: dict[str, Metric] = {}
+        self.lock: threading.Lock = threading.Lock()
+
+    def register(self, _metric_class: type, _name: str, *_args: typing.Any, **_kwargs: typing.Any) -> typing.Any:
+        with self.lock:
+            metric: typing.Optional[Metric] = self.metrics.get(_name)
+
+            if metric is None:
+                metric = self.metrics[_name] = _metric_class(_name, *_args, **_kwargs)
+
+            elif type(metric) is not _metric_class:
+                raise ValueError(f"Metric {_name} is already registered as {metric.TYPE}.")
+
+            return metric
+
+    def counter(self, _name: str, _help: str, _labels: typing.Sequence[str] = ()) -> Counter:
+        return self.register(Counter, _name, _help, _labels)
+
+    def gauge(self, _name: str, _help: str, _labels: typing.Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge, _name, _help, _labels)
+
+    def histogram(
+            self,
+            _name: str,
+            _help: str,
+            _labels: typing.Sequence[str] = (),
+            _buckets: typing.Sequence[float] = Histogram.DEFAULT_BUCKETS
+        ) -> Histogram:
+        return self.register(Histogram, _name, _help, _labels, _buckets)
+
+    def expose(self) -> str:
+        with self.lock:
+            metrics: list[Metric] = list(self.metrics.values())
+
+        lines: list[str] = []
+
+        for metric in metrics:
+            lines.extend(metric.expose())
+
+        return "\n".join(lines) + "\n"
+
+
+# Default registry used by all ProxySea components
+REGISTRY: MetricsRegistry = MetricsRegistry()
+
+# Probing
+PROBES_TOTAL: Counter = REGISTRY.counter(
+    "proxysea_probes_total", "Scheme probes sent to proxies, by scheme and outcome (success, rejected or exception class).", ["scheme", "outcome"]
+)
+PROBE_DURATION: Histogram = REGISTRY.histogram(
+    "proxysea_probe_duration_seconds", "Duration of scheme probes, without the stagger delay.", ["scheme"]
+)
+PROXIES_TESTED_TOTAL: Counter = REGISTRY.counter(
+    "proxysea_proxies_tested_total", "Proxies tested, by result (active, inactive, blacklisted or untested when a deadline expired).", ["result"]
+)
+PROBE_CACHE_LOOKUPS_TOTAL: Counter = REGISTRY.counter(
+    "proxysea_probe_cache_lookups_total", "Probe result cache lookups, by result (hit or miss).", ["result"]
+)
+PROBE_CACHE_SIZE: Gauge = REGISTRY.gauge(
+    "proxysea_probe_cache_size", "Results held in the probe result cache."
+)
+DEAD_FILTER_SKIPS_TOTAL: Counter = REGISTRY.counter(
+    "proxysea_dead_filter_skips_total", "Proxies skipped because the dead-endpoint filter knows them, by stage (fetch, read or test).", ["stage"]
+)
+SCHEME_DETECTION_PROBES: Histogram = REGISTRY.histogram(
+    "proxysea_scheme_detection_probes", "Probes started per prior-ordered scheme detection, by result (detected or none).", ["result"], (1, 2, 3, 4)
+)
+
+# Providers
+PROVIDER_FETCHES_TOTAL: Counter = REGISTRY.counter(
+    "proxysea_provider_fetches_total", "Provider page downloads, by provider and outcome.", ["provider", "outcome"]
+)
+PROVIDER_FETCH_DURATION: Histogram = REGISTRY.histogram(
+    "proxysea_provider_fetch_duration_seconds", "Duration of provider page downloads.", ["provider"]
+)
+PROVIDER_PARSE_DURATION: Histogram = REGISTRY.histogram(
+    "proxysea_provider_parse_duration_seconds", "Duration of provider page parsing.", ["provider"]
+)
+PROVIDER_PROXIES_TOTAL: Counter = REGISTRY.counter(
+    "proxysea_provider_proxies_total", "Proxies parsed from provider pages.", ["provider"]
+)
+
+# Task runners
+TASKS_QUEUED: Gauge = REGISTRY.gauge(
+    "proxysea_tasks_queued", "Tasks waiting for a free concurrency slot, by runner.", ["runner"]
+)
+TASKS_IN_FLIGHT: Gauge = REGISTRY.gauge(
+    "proxysea_tasks_in_flight", "Tasks currently running, by runner.", ["runner"]
+)
+
+# Pool service
+POOL_SIZE: Gauge = REGISTRY.gauge(
+    "proxysea_pool_size", "Active proxies in the published pool snapshot."
+)
+POOL_PUBLISHES_TOTAL: Counter = REGISTRY.counter(
+    "proxysea_pool_publishes_total", "Pool snapshots published, by source (provider domain or retest).", ["source"]
+)
+
+# Distributed testing
+DISTRIBUTED_LEASES_TOTAL: Counter = REGISTRY.counter(
+    "proxysea_distributed_leases_total", "Batch leases of the distributed coordinator, by event (granted, completed, expired or released).", ["event"]
+)
+
+# Clients
+PROXY_REQUESTS_TOTAL: Counter = REGISTRY.counter(
+    "proxysea_proxy_requests_total", "Requests sent through rotated proxies, by client and outcome.", ["client", "outcome"]
+)
@@ -0,0 +1,440 @@
+from ..imports import asyncio, typing, time, copy
+
+from ..logger import Logger
+from ..metrics import POOL_SIZE, POOL_PUBLISHES_TOTAL
+from ..util import ProxyInfo, ProxyProvider, GeoIPIndex, ProxyScore
+from ..providers import ProvidersManager, ProvidersProxyTester
+from .hash_ring import ConsistentHashRing
+from .prefix_trie import SubnetTrie
+from .rotator import ProxyRotator
+
+
+class PoolSnapshot:
+    """
+    Immutable view of the proxy pool at one point in time.
+
+    Snapshots are never modified after they are published. The service builds a new snapshot
+    and swaps the reference, so a reader holding a snapshot always sees a consistent pool.
+    Proxies inside a published snapshot are never re-tested in place either, the service
+    re-tests copies of them. Only outcomes of real requests reported through a `ProxyRotator`
+    update the circuit breakers of published proxies.
+
+    Attributes:
+        proxies (tuple[ProxyInfo, ...]): Active proxies of the pool.
+        version (int): Increases by one with every published snapshot.
+        created_at (float): `time.time()` when the snapshot was published.
+
+    Examples:
+    ```
+        >>> snapshot = service.snapshot
+        >>> print(snapshot.version, len(snapshot))
+        >>> 3 120 # Result of the print
+
+        >>> socks5 = snapshot.get_proxies(_scheme = "SOCKS5")
+        >>> diverse = snapshot.get_diverse_proxies(_per_group = 2, _prefix_length = 24)
+    ```
+    """
+
+    __slots__ = ("proxies", "version", "created_at", "country_index", "subnet_trie")
+
+    def __init__(self, _proxies: typing.Iterable[ProxyInfo] = (), _version: int = 0, _created_at: typing.Optional[float] = None) -> None:
+        object.__setattr__(self, "proxies", tuple(_proxies))
+        object.__setattr__(self, "version", _version)
+        object.__setattr__(self, "created_at", _created_at if _created_at is not None else time.time())
+        object.__setattr__(self, "country_index", None)
+        object.__setattr__(self, "subnet_trie", None)
+
+    def __setattr__(self, _name: str, _value: typing.Any) -> None:
+        raise AttributeError("PoolSnapshot is immutable.")
+
+    def __len__(self) -> int:
+        return len(self.proxies)
+
+    def __iter__(self) -> typing.Iterator[ProxyInfo]:
+        return iter(self.proxies)
+
+    def get_country_index(self) -> dict[typing.Optional[str], tuple[ProxyInfo, ...]]:
+        # Built on first use, the snapshot never changes, so the index never goes stale
+        if self.country_index is None:
+            index: dict[typing.Optional[str], list[ProxyInfo]] = {}
+
+            for proxy in self.proxies:
+                index.setdefault(proxy.country, []).append(proxy)
+
+            object.__setattr__(self, "country_index", {country: tuple(proxies) for country, proxies in index.items()})
+
+        return self.country_index
+
+    def get_proxies(
+            self,
+            _scheme: typing.Literal["HTTPS", "HTTP", "SOCKS5", "SOCKS4", "ALL"] = "ALL",
+            _anonymity_level: typing.Literal["HIGH", "MEDIUM", "LOW", "ALL"] = "ALL",
+            _country: str | typing.Sequence[str] = "ALL"
+        ) -> list[ProxyInfo]:
+        _scheme = _scheme.upper()
+        _anonymity_level = _anonymity_level.upper()
+
+        proxies: typing.Iterable[ProxyInfo] = self.proxies
+
+        if _country != "ALL":
+            index: dict[typing.Optional[str], tuple[ProxyInfo, ...]] = self.get_country_index()
+            countries: list[str] = [_country] if isinstance(_country, str) else list(_country)
+
+            proxies = [proxy for country in countries for proxy in index.get(country.upper(), ())]
+
+        return [
+            proxy for proxy in proxies
+            if _scheme in [proxy.scheme, "ALL"] and _anonymity_level in [proxy.anonymity_level, "ALL"]
+        ]
+
+    def get_subnet_trie(self) -> SubnetTrie:
+        if self.subnet_trie is None:
+            object.__setattr__(self, "subnet_trie", SubnetTrie(self.proxies))
+
+        return self.subnet_trie
+
+    def get_diverse_proxies(
+            self,
+            _per_group: int = 1,
+            _prefix_length: int = 24,
+            _by: typing.Literal["subnet", "asn"] = "subnet",
+            _scheme: typing.Literal["HTTPS", "HTTP", "SOCKS5", "SOCKS4", "ALL"] = "ALL",
+            _anonymity_level: typing.Literal["HIGH", "MEDIUM", "LOW", "ALL"] = "ALL",
+            _limit: typing.Optional[int] = None
+        ) -> list[ProxyInfo]:
+        """
+        Returns at most `_per_group` proxies of every subnet (or ASN), see `SubnetTrie.select()`.
+        """
+
+        _scheme = _scheme.upper()
+        _anonymity_level = _anonymity_level.upper()
+
+        return self.get_subnet_trie().select(
+            _per_group = _per_group,
+            _prefix_length = _prefix_length,
+            _by = _by,
+            _limit = _limit,
+            _predicate = lambda proxy: _scheme in [proxy.scheme, "ALL"] and _anonymity_level in [proxy.anonymity_level, "ALL"]
+        )
+
+
+class ProxyPoolService:
+    """
+    Keeps a pool of working proxies fresh in the background.
+
+    Every provider is fetched on its own interval, new proxies are tested and the working ones
+    are added to the pool. All proxies of the pool are re-tested periodically, proxies that stopped
+    working are removed. Every change is published as a new immutable `PoolSnapshot` by swapping
+    a single reference, so readers (from any thread) never lock and never see a half-updated pool.
+
+    Resource use is bounded: test rounds run one at a time, each with at most `concurrent_tasks`
+    probes in flight, and the pool never grows beyond `max_pool_size`.
+
+    Proxies that stopped working are benched instead of forgotten. They keep their circuit breaker
+    state and are re-tested with the pool, which skips them until their backoff elapses, so proxies
+    that recover come back automatically.
+
+    Attributes:
+        snapshot (PoolSnapshot): The latest published snapshot.
+        providers (list[ProxyProvider]): Providers fetched by the service.
+        refresh_intervals (dict[str, float]): Refresh interval (in seconds) per provider domain.
+        default_refresh_interval (float): Refresh interval of providers missing in `refresh_intervals`.
+        retest_interval (float): Interval (in seconds) between re-tests of the whole pool.
+        concurrent_tasks (int): Maximum number of proxies tested at once.
+        max_pool_size (int | None): Maximum number of proxies in the pool, or None for no limit.
+        benched (dict[str, ProxyInfo]): Proxies that stopped working, waiting for their re-probe.
+        max_benched (int): Maximum number of benched proxies, the oldest are dropped first.
+        geo_index (GeoIPIndex | None): Tags new proxies with their country and ASN, or None.
+        test_deadline (float | None): Time budget (in seconds) of one test round. Proxies left untested
+            keep their place in the pool (or are benched, if new) until the next round.
+        test_priority (ProxyScore | None): Score function, proxies of a round are tested highest score
+            first, so a deadline cuts off the least promising ones.
+
+    Methods:
+        start():
+            Starts the provider and re-test loops.
+
+        stop():
+            Cancels the background loops.
+
+        wait_for_snapshot(_version, _timeout):
+            Waits until a snapshot newer than `_version` is published.
+
+        refresh_provider(_provider):
+            Fetches one provider, tests its new proxies and publishes the result.
+
+        retest():
+            Re-tests the whole pool and publishes the result.
+
+    Examples:
+    ```
+        >>> service = ProxyPoolService(_refresh_intervals = {"spys.one": 300}, _retest_interval = 60)
+
+        >>> async with service:
+        >>>     await service.wait_for_snapshot()
+        >>>     proxies = service.snapshot.get_proxies(_scheme = "HTTP")
+    ```
+    """
+
+    def __init__(
+            self,
+            _providers: typing.Optional[list[ProxyProvider]] = None,
+            _proxy_tester: typing.Optional[ProvidersProxyTester] = None,
+            _refresh_intervals: typing.Optional[dict[str, float]] = None,
+            _default_refresh_interval: float = 600.0,
+            _retest_interval: float = 120.0,
+            _concurrent_tasks: int = 200,
+            _max_pool_size: typing.Optional[int] = None,
+            _max_benched: int = 10_000,
+            _geo_index: typing.Optional[GeoIPIndex] = None,
+            _test_deadline: typing.Optional[float] = None,
+            _test_priority: typing.Optional[ProxyScore] = None,
+            _debug: bool = False
+        ) -> None:
+        """
+        Args:
+            _providers (list[ProxyProvider] | None): Providers to fetch. Defaults to the providers of `ProvidersManager`.
+            _proxy_tester (ProvidersProxyTester | None): Tester used for new and re-tested proxies.
+            _refresh_intervals (dict[str, float] | None): Refresh interval (in seconds) per provider domain.
+            _default_refresh_interval (float): Refresh interval of providers missing in `_refresh_intervals`.
+            _retest_interval (float): Interval (in seconds) between re-tests of the whole pool.
+            _concurrent_tasks (int): Maximum number of proxies tested at once.
+            _max_pool_size (int | None): Maximum number of proxies in the pool, or None for no limit.
+            _max_benched (int): Maximum number of benched proxies kept for re-probing.
+            _geo_index (GeoIPIndex | None): If set, new proxies are tagged with their country and ASN.
+            _test_deadline (float | None): Time budget (in seconds) of one test round, or None.
+            _test_priority (ProxyScore | None): Score function ordering the tests of a round, or None for input order.
+            _debug (bool): Enables debug logging.
+        """
+
+        if not _concurrent_tasks or _concurrent_tasks < 0:
+            raise ValueError("You have to provide _concurrent_tasks > 0.")
+
+        self.debug: bool = _debug
+
+        self.providers: list[ProxyProvider] = _providers if _providers is not None else ProvidersManager(_debug = _debug).PROVIDERS
+        self.proxy_tester: ProvidersProxyTester = _proxy_tester or ProvidersProxyTester(_debug = _debug)
+
+        self.refresh_intervals: dict[str, float] = _refresh_intervals or {}
+        self.default_refresh_interval: float = _default_refresh_interval
+        self.retest_interval: float = _retest_interval
+        self.concurrent_tasks: int = _concurrent_tasks
+        self.max_pool_size: typing.Optional[int] = _max_pool_size
+        self.max_benched: int = _max_benched
+        self.geo_index: typing.Optional[GeoIPIndex] = _geo_index
+        self.test_deadline: typing.Optional[float] = _test_deadline
+        self.test_priority: typing.Optional[ProxyScore] = _test_priority
+
+        self.benched: dict[str, ProxyInfo] = {}
+
+        self.snapshot: PoolSnapshot = PoolSnapshot()
+
+        self.tasks: list[asyncio.Task] = []
+        self.test_lock: typing.Optional[asyncio.Lock] = None
+        self.published: typing.Optional[asyncio.Condition] = None
+
+        # Pending notify_published() tasks, referenced until done so they can't be garbage collected
+        self.notify_tasks: set[asyncio.Task] = set()
+
+        self.logger: Logger = Logger(
+            _logger_name = "ProxyPoolService",
+            _debug = self.debug,
+            _background = True
+        )
+
+    async def __aenter__(self) -> "ProxyPoolService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info) -> None:
+        await self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self.tasks)
+
+    async def start(self) -> None:
+        if self.is_running:
+            return
+
+        # Created here, so they belong to the running event loop
+        self.test_lock = asyncio.Lock()
+        self.published = asyncio.Condition()
+
+        for provider in self.providers:
+            self.tasks.append(asyncio.create_task(self.provider_loop(provider)))
+
+        if self.retest_interval:
+            self.tasks.append(asyncio.create_task(self.retest_loop()))
+
+        self.logger.log("Started with {} providers.", len(self.providers), _level = "INFO")
+
+    async def stop(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+
+        for task in self.notify_tasks:
+            task.cancel()
+
+        await asyncio.gather(*self.tasks, *self.notify_tasks, return_exceptions = True)
+        self.tasks = []
+        self.notify_tasks.clear()
+
+        self.logger.log("Stopped at snapshot version {}.", self.snapshot.version, _level = "INFO")
+
+    def get_refresh_interval(self, _provider: ProxyProvider) -> float:
+        return self.refresh_intervals.get(_provider.domain, self.default_refresh_interval)
+
+    async def provider_loop(self, _provider: ProxyProvider) -> None:
+        while True:
+            try:
+                await self.refresh_provider(_provider)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                self.logger.log("Refreshing {} failed: {}", _provider.domain, e, _level = "WARNING")
+
+            await asyncio.sleep(self.get_refresh_interval(_provider))
+
+    async def retest_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.retest_interval)
+
+            try:
+                await self.retest()
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                self.logger.log("Re-testing the pool failed: {}", e, _level = "WARNING")
+
+    async def refresh_provider(self, _provider: ProxyProvider) -> PoolSnapshot:
+        proxies: list[ProxyInfo] = await _provider.fetch_proxies() or []
+
+        # Proxies already in the pool (or benched) are kept fresh by the re-test loop
+        known: set[str] = {proxy.id for proxy in self.snapshot.proxies} | self.benched.keys()
+        seen: set[str] = set()
+        candidates: list[ProxyInfo] = []
+
+        for proxy in proxies:
+            if proxy.id in known or proxy.id in seen:
+                continue
+
+            seen.add(proxy.id)
+            candidates.append(proxy)
+
+        self.logger.log("Fetched {} new proxies from {}.", len(candidates), _provider.domain)
+
+        if self.geo_index is not None:
+            self.geo_index.enrich(candidates)
+
+        tested: list[ProxyInfo] = await self.test(candidates)
+        return self.publish(tested, _source = _provider.domain)
+
+    async def retest(self) -> PoolSnapshot:
+        # Test copies, the proxies of the published snapshot must not change under its readers
+        candidates: list[ProxyInfo] = [copy.copy(proxy) for proxy in self.snapshot.proxies]
+
+        # Benched proxies are not published, they are tested in place (skipped while their circuit is open)
+        candidates.extend(self.benched.values())
+
+        # Re-tests always probe, cached results and the dead-endpoint filter would hide proxies that died or recovered
+        tested: list[ProxyInfo] = await self.test(candidates, _use_cache = False)
+        return self.publish(tested, _source = "retest")
+
+    async def test(self, _proxies: list[ProxyInfo], _use_cache: bool = True) -> list[ProxyInfo]:
+        if not _proxies:
+            return []
+
+        # One test round at a time, so at most `concurrent_tasks` probes run at once
+        async with self.test_lock:
+            return await self.proxy_tester.test_proxies(
+                _proxies,
+                _concurrent_tasks = self.concurrent_tasks,
+                _use_cache = _use_cache,
+                _deadline = self.test_deadline,
+                _priority = self.test_priority
+            )
+
+    def publish(self, _tested: list[ProxyInfo], _source: str) -> PoolSnapshot:
+        """
+        Merges tested proxies into the current pool and swaps in the new snapshot.
+
+        Working proxies are added (or replace their previous version), proxies that stopped
+        working are removed. The merge starts from the snapshot current at publish time, so
+        proxies published by another loop while this round was testing are kept.
+        """
+
+        pool: dict[str, ProxyInfo] = {proxy.id: proxy for proxy in self.snapshot.proxies}
+
+        for proxy in _tested:
+            if self.test_deadline is not None and not proxy.is_tested:
+                # Cut off by the deadline, pool members stay as they were, new proxies wait on the bench
+                if proxy.id not in pool:
+                    self.bench(proxy)
+
+                continue
+
+            if proxy.is_active and not proxy.is_blacklisted:
+                if proxy.id in pool or self.max_pool_size is None or len(pool) < self.max_pool_size:
+                    pool[proxy.id] = proxy
+                    self.benched.pop(proxy.id, None)
+
+            else:
+                pool.pop(proxy.id, None)
+                self.bench(proxy)
+
+        snapshot: PoolSnapshot = PoolSnapshot(
+            _proxies = pool.values(),
+            _version = self.snapshot.version + 1
+        )
+
+        # Single reference assignment, readers see either the old or the new snapshot
+        self.snapshot = snapshot
+
+        POOL_SIZE.set(len(snapshot))
+        POOL_PUBLISHES_TOTAL.inc(_source)
+
+        self.logger.log("Published snapshot version {} with {} proxies ({}).", snapshot.version, len(snapshot), _source)
+
+        if self.published is not None:
+            task: asyncio.Task = asyncio.create_task(self.notify_published())
+
+            self.notify_tasks.add(task)
+            task.add_done_callback(self.notify_tasks.discard)
+
+        return snapshot
+
+    def bench(self, _proxy: ProxyInfo) -> None:
+        self.benched.pop(_proxy.id, None)
+        self.benched[_proxy.id] = _proxy
+
+        while len(self.benched) > self.max_benched:
+            self.benched.pop(next(iter(self.benched)))
+
+    async def notify_published(self) -> None:
+        async with self.published:
+            self.published.notify_all()
+
+    async def wait_for_snapshot(self, _version: typing.Optional[int] = None, _timeout: typing.Optional[float] = None) -> PoolSnapshot:
+        """
+        Waits until a snapshot newer than `_version` (by default the current one) is published.
+
+        Raises:
+            TimeoutError: If no newer snapshot was published within `_timeout` seconds.
+        """
+
+        version: int = self.snapshot.version if _version is None else _version
+
+        if self.published is None:
+            raise RuntimeError("The service has to be started before waiting for snapshots.")
+
+        async def wait() -> None:
+            async with self.published:
+                await self.published.wait_for(lambda: self.snapshot.version > version)
+
+        await asyncio.wait_for(wait(), timeout = _timeout)
+        return self.snapshot
@@ -0,0 +1,124 @@
+from ..imports import hashlib, bisect, typing
+
+from ..util import ProxyInfo
+
+
+class ConsistentHashRing:
+    """
+    Consistent-hash ring mapping keys (e.g. target sessions or hosts) to proxies.
+
+    Every proxy is placed on the ring at `replicas` pseudo-random points (virtual nodes), a key is
+    owned by the first point after its hash. When a proxy leaves the ring only the keys it owned
+    move (spread evenly over the remaining proxies), keys of all other proxies keep their proxy.
+    Lookups are a binary search, O(log n).
+
+    The ring is copy-on-write: `update()` builds new point arrays and a new proxy map and swaps them
+    in as one tuple, so lookups from other threads never see a half-updated ring.
+
+    Attributes:
+        replicas (int): Number of virtual nodes per proxy.
+        state (tuple[list[int], list[str], dict[str, ProxyInfo]]): Sorted point hashes, the ids of the
+            proxies owning them and the proxies on the ring by id. Read it once, never field by field.
+        proxies (dict[str, ProxyInfo]): Proxies on the ring by id.
+
+    Methods:
+        update(_proxies):
+            Makes the ring hold exactly `_proxies`, moving only keys of proxies that left.
+
+        add(_proxy) / remove(_proxy_id):
+            Adds or removes a single proxy.
+
+        get(_key, _exclude):
+            Returns the proxy owning `_key`, skipping excluded and blacklisted proxies.
+
+    Examples:
+    ```
+        >>> ring = ConsistentHashRing(manager.get_proxies(tested_proxies))
+
+        >>> proxy = ring.get("session-42")
+        >>> print(proxy is ring.get("session-42"))
+        >>> True # Result of the print
+    ```
+    """
+
+    def __init__(self, _proxies: typing.Iterable[ProxyInfo] = (), _replicas: int = 100) -> None:
+        if _replicas <= 0:
+            raise ValueError("You have to provide _replicas > 0.")
+
+        self.replicas: int = _replicas
+
+        # Sorted point hashes, the ids of the proxies owning them and the proxies, swapped together
+        self.state: tuple[list[int], list[str], dict[str, ProxyInfo]] = ([], [], {})
+
+        self.update(_proxies)
+
+    @staticmethod
+    def hash(_key: str) -> int:
+        # Stable across processes, unlike hash()
+        return int.from_bytes(hashlib.blake2b(_key.encode(), digest_size = 8).digest(), "big")
+
+    def get_proxy_points(self, _proxy_id: str) -> list[tuple[int, str]]:
+        return [(self.hash(f"{_proxy_id}#{replica}"), _proxy_id) for replica in range(self.replicas)]
+
+    @property
+    def proxies(self) -> dict[str, ProxyInfo]:
+        return self.state[2]
+
+    def update(self, _proxies: typing.Iterable[ProxyInfo]) -> None:
+        hashes, owners, current = self.state
+        proxies: dict[str, ProxyInfo] = {proxy.id: proxy for proxy in _proxies}
+
+        removed: set[str] = current.keys() - proxies.keys()
+        added: list[str] = [proxy_id for proxy_id in proxies if proxy_id not in current]
+
+        if removed or added:
+            points: list[tuple[int, str]] = [point for point in zip(hashes, owners) if point[1] not in removed]
+
+            for proxy_id in added:
+                points.extend(self.get_proxy_points(proxy_id))
+
+            points.sort()
+            hashes, owners = [point[0] for point in points], [point[1] for point in points]
+
+        # Proxies that stayed may be new objects (e.g. from a newer snapshot), their points don't change
+        self.state = (hashes, owners, proxies)
+
+    def add(self, _proxy: ProxyInfo) -> None:
+        self.update([*self.proxies.values(), _proxy])
+
+    def remove(self, _proxy_id: str) -> None:
+        self.update(proxy for proxy_id, proxy in self.proxies.items() if proxy_id != _proxy_id)
+
+    def get(self, _key: str, _exclude: typing.Container[str] = ()) -> typing.Optional[ProxyInfo]:
+        hashes, owners, proxies = self.state
+
+        if not hashes:
+            return None
+
+        index: int = bisect.bisect_right(hashes, self.hash(_key))
+        checked: set[str] = set()
+
+        # Walk clockwise until a usable proxy, a skipped proxy's keys go to its successors
+        for offset in range(len(hashes)):
+            proxy_id: str = owners[(index + offset) % len(hashes)]
+
+            if proxy_id in checked:
+                continue
+
+            proxy: typing.Optional[ProxyInfo] = proxies.get(proxy_id)
+
+            if proxy is not None and proxy_id not in _exclude and not proxy.is_blacklisted:
+                return proxy
+
+            checked.add(proxy_id)
+
+            if len(checked) >= len(proxies):
+                break
+
+        return None
+
+    def __len__(self) -> int:
+        return len(self.proxies)
+
+    def __contains__(self, _proxy_id: str) -> bool:
+        return _proxy_id in self.proxies
@@ -0,0 +1,366 @@
+from ..imports import itertools, socket, typing
+
+from ..util import ProxyInfo
+
+
+class SubnetTrie:
+    """
+    Prefix trie over the IPv4 addresses of proxies, for subnet- and ASN-aware selection.
+
+    Public lists often carry dozens of proxies from one /24 or one hosting provider. The trie
+    groups proxies by any prefix length (or by ASN) and selects at most K proxies per group, so a
+    rotating client spreads its requests over networks instead of hitting the same upstream bans
+    in bursts. Selected proxies are interleaved, consecutive proxies come from different groups.
+
+    Every level of the trie is one octet and every node counts the proxies below it, so the size of
+    any prefix is known after at most three dict lookups. Nodes are plain `[count, children]` lists
+    and every /24 is a flat dict of its proxies, which keeps a trie of a million proxies small and
+    quick to build. Hosts that aren't IPv4 addresses (domains, IPv6) are kept
+    aside, each host is its own group.
+
+    Attributes:
+        root (list): Root node, `[count, children by first octet]`.
+        others (dict[str, dict[str, ProxyInfo]]): Proxies with non-IPv4 hosts, by host and id.
+
+    Methods:
+        insert(_proxy) / remove(_proxy):
+            Adds or removes a single proxy.
+
+        count(_prefix):
+            Returns the number of proxies in a CIDR prefix, e.g. "10.0.0.0/8".
+
+        iter_subnets(_prefix_length):
+            Yields the proxies of every subnet lazily.
+
+        get_groups(_prefix_length, _by):
+            Returns proxies grouped by prefix (e.g. "1.2.3.0/24") or by ASN ("AS13335").
+
+        get_group_counts(_prefix_length, _by):
+            Returns the number of proxies per group, largest groups first.
+
+        select(_per_group, _prefix_length, _by, _limit):
+            Returns at most `_per_group` proxies of every group, interleaved.
+
+    Examples:
+    ```
+        >>> trie = SubnetTrie(manager.get_proxies(tested_proxies))
+
+        >>> print(trie.get_group_counts(_prefix_length = 24)[:2])
+        >>> [('103.152.112.0/24', 31), ('45.77.56.0/24', 12)] # Result of the print
+
+        >>> proxies = trie.select(_per_group = 2, _prefix_length = 24)
+        >>> proxies = trie.select(_per_group = 5, _by = "asn")
+    ```
+    """
+
+    def __init__(self, _proxies: typing.Iterable[ProxyInfo] = ()) -> None:
+        self.root: list[typing.Any] = [0, {}]
+        self.others: dict[str, dict[str, ProxyInfo]] = {}
+
+        for proxy in _proxies:
+            self.insert(proxy)
+
+    def __len__(self) -> int:
+        return self.root[0] + sum(len(proxies) for proxies in self.others.values())
+
+    def __iter__(self) -> typing.Iterator[ProxyInfo]:
+        yield from self.iter_node(self.root, 0)
+
+        for proxies in self.others.values():
+            yield from proxies.values()
+
+    @staticmethod
+    def parse_host(_host: str) -> typing.Optional[bytes]:
+        try:
+            return socket.inet_aton(_host) if _host.count(".") == 3 else None
+
+        except (OSError, TypeError):
+            return None
+
+    @staticmethod
+    def parse_prefix(_prefix: str) -> tuple[bytes, int]:
+        address, _, length = _prefix.partition("/")
+        prefix_length: int = int(length) if length else 32
+
+        if not 0 <= prefix_length <= 32:
+            raise ValueError(f"Invalid prefix length: {_prefix}.")
+
+        return socket.inet_aton(address), prefix_length
+
+    def insert(self, _proxy: ProxyInfo) -> bool:
+        """
+        Adds the proxy, returns False if a proxy with the same id is already in the trie.
+        """
+
+        octets: typing.Optional[bytes] = self.parse_host(_proxy.host)
+
+        if octets is None:
+            proxies: dict[str, ProxyInfo] = self.others.setdefault(_proxy.host, {})
+
+        else:
+            first, second, third, _ = octets
+            level_1: list[typing.Any] = self.root[1].get(first) or self.root[1].setdefault(first, [0, {}])
+            level_2: list[typing.Any] = level_1[1].get(second) or level_1[1].setdefault(second, [0, {}])
+            proxies = level_2[1].get(third) or level_2[1].setdefault(third, {})
+
+        proxy_id: str = _proxy.id
+
+        if proxy_id in proxies:
+            return False
+
+        proxies[proxy_id] = _proxy
+
+        if octets is not None:
+            self.root[0] += 1
+            level_1[0] += 1
+            level_2[0] += 1
+
+        return True
+
+    def remove(self, _proxy: ProxyInfo) -> bool:
+        """
+        Removes the proxy, returns False if it isn't in the trie.
+        """
+
+        octets: typing.Optional[bytes] = self.parse_host(_proxy.host)
+
+        if octets is None:
+            proxies: typing.Optional[dict[str, ProxyInfo]] = self.others.get(_proxy.host)
+
+            if proxies is None or proxies.pop(_proxy.id, None) is None:
+                return False
+
+            if not proxies:
+                del self.others[_proxy.host]
+
+            return True
+
+        path: list[list[typing.Any]] = [self.root]
+
+        for octet in octets[:2]:
+            node: typing.Optional[list[typing.Any]] = path[-1][1].get(octet)
+
+            if node is None:
+                return False
+
+            path.append(node)
+
+        proxies = path[-1][1].get(octets[2])
+
+        if proxies is None or proxies.pop(_proxy.id, None) is None:
+            return False
+
+        if not proxies:
+            del path[-1][1][octets[2]]
+
+        # Drop emptied nodes on the way back up
+        for depth in range(2, -1, -1):
+            path[depth][0] -= 1
+
+            if depth and not path[depth][0]:
+                del path[depth - 1][1][octets[depth - 1]]
+
+        return True
+
+    def get_node(self, _octets: bytes, _depth: int) -> typing.Any:
+        node: typing.Any = self.root
+
+        for depth, octet in enumerate(_octets[:_depth]):
+            node = dict(self.get_children(node, depth)).get(octet) if depth == 3 else node[1].get(octet)
+
+            if node is None:
+                return None
+
+        return node
+
+    @staticmethod
+    def get_children(_node: typing.Any, _depth: int) -> typing.Iterable[tuple[int, typing.Any]]:
+        if _depth < 3:
+            return _node[1].items()
+
+        # A /24 holds its proxies directly, group them by their last octet
+        children: dict[int, dict[str, ProxyInfo]] = {}
+
+        for proxy_id, proxy in _node.items():
+            children.setdefault(socket.inet_aton(proxy.host)[3], {})[proxy_id] = proxy
+
+        return children.items()
+
+    @staticmethod
+    def get_node_count(_node: typing.Any) -> int:
+        # From the /24 level down nodes are dicts of proxies
+        return _node[0] if isinstance(_node, list) else len(_node)
+
+    def iter_node(self, _node: typing.Any, _depth: int) -> typing.Iterator[ProxyInfo]:
+        if _depth >= 3:
+            return iter(_node.values())
+
+        if _depth == 2:
+            return (proxy for proxies in _node[1].values() for proxy in proxies.values())
+
+        return (proxy for child in _node[1].values() for proxy in self.iter_node(child, _depth + 1))
+
+    def iter_prefix_nodes(self, _depth: int) -> typing.Iterator[tuple[bytes, typing.Any]]:
+        # Nodes on the given level with their address bytes
+        if _depth == 0:
+            yield b"", self.root
+            return
+
+        for octets, node in self.iter_prefix_nodes(_depth - 1):
+            for octet, child in self.get_children(node, _depth - 1):
+                yield octets + bytes((octet,)), child
+
+    def count(self, _prefix: str) -> int:
+        """
+        Returns the number of proxies inside a CIDR prefix (e.g. "10.0.0.0/8" or "1.2.3.4").
+        """
+
+        octets, prefix_length = self.parse_prefix(_prefix)
+        depth, remainder = divmod(prefix_length, 8)
+
+        node: typing.Any = self.get_node(octets, depth)
+
+        if node is None:
+            return 0
+
+        if not remainder:
+            return self.get_node_count(node)
+
+        shift: int = 8 - remainder
+
+        return sum(
+            self.get_node_count(child) for octet, child in self.get_children(node, depth)
+            if octet >> shift == octets[depth] >> shift
+        )
+
+    def iter_subnets(self, _prefix_length: int = 24) -> typing.Iterator[tuple[typing.Union[bytes, str], typing.Iterator[ProxyInfo]]]:
+        """
+        Yields (network address bytes, proxies) of every subnet, then (host, proxies) of every non-IPv4 host.
+        Proxies are yielded lazily, so reading only the first few proxies of every subnet stays cheap.
+        """
+
+        if not 0 <= _prefix_length <= 32:
+            raise ValueError(f"Invalid prefix length: {_prefix_length}.")
+
+        depth, remainder = divmod(_prefix_length, 8)
+        shift: int = 8 - remainder
+
+        for octets, node in self.iter_prefix_nodes(depth):
+            if not remainder:
+                yield octets, self.iter_node(node, depth)
+                continue
+
+            # The prefix ends inside the next octet, merge the node's children by their high bits
+            parts: dict[int, list[typing.Any]] = {}
+
+            for octet, child in self.get_children(node, depth):
+                parts.setdefault(octet >> shift << shift, []).append(child)
+
+            for octet, children in parts.items():
+                yield octets + bytes((octet,)), (proxy for child in children for proxy in self.iter_node(child, depth + 1))
+
+        for host, proxies in self.others.items():
+            yield host, iter(proxies.values())
+
+    def get_groups(
+            self,
+            _prefix_length: int = 24,
+            _by: typing.Literal["subnet", "asn"] = "subnet"
+        ) -> dict[str, list[ProxyInfo]]:
+        """
+        Groups proxies by subnet or ASN.
+
+        Args:
+            _prefix_length (int): Length of the subnet prefix, 0-32. With `_by = "asn"` it's used for
+                proxies with an unknown ASN.
+            _by (str): 'subnet' or 'asn'.
+
+        Returns:
+            dict[str, list[ProxyInfo]]: Proxies by group, e.g. "1.2.3.0/24" or "AS13335". Proxies
+                with non-IPv4 hosts are grouped by host.
+        """
+
+        if _by not in ["subnet", "asn"]:
+            raise ValueError(f"Unknown grouping: {_by}. Use one of them ['subnet', 'asn'].")
+
+        groups: dict[str, list[ProxyInfo]] = {}
+
+        for network, proxies in self.iter_subnets(_prefix_length):
+            subnet: str = network if isinstance(network, str) else f"{socket.inet_ntoa(network.ljust(4, bytes(1)))}/{_prefix_length}"
+
+            if _by == "subnet":
+                groups.setdefault(subnet, []).extend(proxies)
+                continue
+
+            for proxy in proxies:
+                groups.setdefault(f"AS{proxy.asn}" if proxy.asn else subnet, []).append(proxy)
+
+        return groups
+
+    def get_group_counts(
+            self,
+            _prefix_length: int = 24,
+            _by: typing.Literal["subnet", "asn"] = "subnet"
+        ) -> list[tuple[str, int]]:
+        """
+        Returns (group, number of proxies) of every group, largest groups first.
+        """
+
+        counts: list[tuple[str, int]] = [(group, len(proxies)) for group, proxies in self.get_groups(_prefix_length, _by).items()]
+        counts.sort(key = lambda item: item[1], reverse = True)
+
+        return counts
+
+    def select(
+            self,
+            _per_group: int = 1,
+            _prefix_length: int = 24,
+            _by: typing.Literal["subnet", "asn"] = "subnet",
+            _limit: typing.Optional[int] = None,
+            _predicate: typing.Optional[typing.Callable[[ProxyInfo], bool]] = None
+        ) -> list[ProxyInfo]:
+        """
+        Selects at most `_per_group` proxies of every subnet (or ASN).
+
+        Args:
+            _per_group (int): Maximum number of proxies taken from one group.
+            _prefix_length (int): Length of the subnet prefix, e.g. 24 or 16.
+            _by (str): 'subnet' or 'asn'.
+            _limit (int | None): Maximum number of proxies returned.
+            _predicate (Callable[[ProxyInfo], bool] | None): Only proxies passing it are selected,
+                e.g. `lambda proxy: proxy.scheme == "HTTP"`.
+
+        Returns:
+            list[ProxyInfo]: Selected proxies, interleaved so neighbours come from different groups.
+        """
+
+        if _per_group <= 0:
+            raise ValueError("You have to provide _per_group > 0.")
+
+        if _by not in ["subnet", "asn"]:
+            raise ValueError(f"Unknown grouping: {_by}. Use one of them ['subnet', 'asn'].")
+
+        groups: list[list[ProxyInfo]] = []
+
+        if _by == "subnet":
+            # Only the first `_per_group` matching proxies of every subnet are read
+            for _, proxies in self.iter_subnets(_prefix_length):
+                group: list[ProxyInfo] = list(itertools.islice(proxies if _predicate is None else filter(_predicate, proxies), _per_group))
+
+                if group:
+                    groups.append(group)
+
+        else:
+            for proxies in self.get_groups(_prefix_length, _by).values():
+                group = list(itertools.islice(proxies if _predicate is None else filter(_predicate, proxies), _per_group))
+
+                if group:
+                    groups.append(group)
+
+        # First proxy of every group, then the second one of every group, ...
+        selected: list[ProxyInfo] = []
+
+        for position in range(_per_group):
+            selected.extend(proxies[position] for proxies in groups if len(proxies) > position)
+
+        return selected if _limit is None else selected[:_limit]
@@ -0,0 +1,123 @@
+from ..imports import itertools, random, typing
+
+from ..metrics import PROXY_REQUESTS_TOTAL
+from ..util import ProxyInfo
+from .hash_ring import ConsistentHashRing
+
+
+class ProxyRotator:
+    """
+    Picks proxies for outgoing requests from a pool and records how they performed.
+
+    The rotator reads proxies from a `ProxyPoolService` (always its latest snapshot), a single
+    `PoolSnapshot` or a list of tested proxies. Proxies whose circuit breaker is open are skipped,
+    so failing proxies drop out of rotation and come back once their backoff elapses. Picking is
+    lock-free and safe to call from many threads or tasks at once.
+
+    Picking with a key (e.g. a target session id) is sticky: the key is mapped to a proxy through a
+    `ConsistentHashRing`, so it keeps its proxy (and the proxy's pooled connections) while the proxy
+    stays healthy, and only keys of proxies that left the pool move.
+
+    Attributes:
+        source: The `ProxyPoolService`, `PoolSnapshot` or list of proxies to pick from.
+        schemes (tuple[str, ...]): Schemes of the proxies that can be picked.
+        strategy (str): 'round_robin' or 'random'.
+
+    Methods:
+        choose(_exclude, _key):
+            Returns the next usable proxy (or the proxy owning `_key`), skipping proxies whose id
+            is in `_exclude`, or None.
+
+        report(_proxy, _success, _client):
+            Records the outcome of a request sent through the proxy in its circuit breaker.
+
+    Examples:
+    ```
+        >>> rotator = ProxyRotator(service, _schemes = ("HTTP",))
+
+        >>> proxy = rotator.choose()
+        >>> ...
+        >>> rotator.report(proxy, _success = True)
+
+        >>> print(rotator.choose(_key = "session-1") is rotator.choose(_key = "session-1"))
+        >>> True # Result of the print
+    ```
+    """
+
+    def __init__(
+            self,
+            _source: typing.Any,
+            _schemes: typing.Sequence[str] = ("HTTP",),
+            _strategy: typing.Literal["round_robin", "random"] = "round_robin",
+            _replicas: int = 100
+        ) -> None:
+        if _strategy not in ["round_robin", "random"]:
+            raise ValueError(f"Unknown strategy: {_strategy}. Use one of them ['round_robin', 'random'].")
+
+        # Plain lists are copied once, only their active proxies are used
+        if not hasattr(_source, "snapshot") and not hasattr(_source, "proxies"):
+            _source = tuple(proxy for proxy in _source if proxy.is_active)
+
+        self.source: typing.Any = _source
+        self.schemes: tuple[str, ...] = tuple(scheme.upper() for scheme in _schemes)
+        self.strategy: str = _strategy
+
+        self.counter: typing.Iterator[int] = itertools.count()
+
+        # Scheme-filtered proxies of the last seen snapshot, rebuilt only when the snapshot changes
+        self.cache: tuple[typing.Any, tuple[ProxyInfo, ...]] = (None, ())
+
+        # Built on the first keyed pick, kept in sync with the candidates
+        self.replicas: int = _replicas
+        self.ring: typing.Optional[ConsistentHashRing] = None
+
+    def get_candidates(self) -> tuple[ProxyInfo, ...]:
+        if hasattr(self.source, "snapshot"):
+            proxies: tuple[ProxyInfo, ...] = self.source.snapshot.proxies
+
+        elif hasattr(self.source, "proxies"):
+            proxies = self.source.proxies
+
+        else:
+            proxies = self.source
+
+        cached_proxies, candidates = self.cache
+
+        if cached_proxies is not proxies:
+            candidates = tuple(proxy for proxy in proxies if proxy.scheme in self.schemes)
+            self.cache = (proxies, candidates)
+
+            if self.ring is not None:
+                self.ring.update(candidates)
+
+        return candidates
+
+    def choose(self, _exclude: typing.Container[str] = (), _key: typing.Optional[str] = None) -> typing.Optional[ProxyInfo]:
+        candidates: tuple[ProxyInfo, ...] = self.get_candidates()
+
+        if _key is not None:
+            if self.ring is None:
+                self.ring = ConsistentHashRing(candidates, _replicas = self.replicas)
+
+            return self.ring.get(_key, _exclude = _exclude)
+
+        count: int = len(candidates)
+
+        if not count:
+            return None
+
+        start: int = next(self.counter) if self.strategy == "round_robin" else random.randrange(count)
+
+        for offset in range(count):
+            proxy: ProxyInfo = candidates[(start + offset) % count]
+
+            if proxy.id in _exclude or proxy.is_blacklisted:
+                continue
+
+            return proxy
+
+        return None
+
+    def report(self, _proxy: ProxyInfo, _success: bool, _client: str = "other") -> None:
+        _proxy.report_result(_success = _success)
+        PROXY_REQUESTS_TOTAL.inc(_client, "success" if _success else "failure")
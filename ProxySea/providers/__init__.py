@@ -1,33 +1,114 @@
-from ..imports import typing
+from ..imports import typing, asyncio, time, itertools, math
 
-from ..util import ProxyProvider, ProxyInfo, AIOBase, ProxyTester
+from ..util import ProxyProvider, ProxyInfo, AIOBase, ProxyTester, ProbeResultCache, DeadEndpointFilter, SocketProfile, SchemePriors, ProxyScore
 
 from ..logger import Logger
+from ..metrics import PROXIES_TESTED_TOTAL, TASKS_IN_FLIGHT, DEAD_FILTER_SKIPS_TOTAL
 from .free_proxy_list import FreeProxyList
 from .spys_one import SpysOne
 
 class ProvidersProxyTester:
-    def __init__(self, _debug: bool = False) -> None:
+    def __init__(
+            self,
+            _debug: bool = False,
+            _result_cache: typing.Optional[ProbeResultCache] = None,
+            _dead_filter: typing.Optional[DeadEndpointFilter] = None,
+            _socket_profile: typing.Optional[SocketProfile] = None,
+            _scheme_priors: typing.Optional[SchemePriors] = None
+        ) -> None:
         self.debug = _debug
 
+        # Recent results, reused instead of probing again (None disables caching)
+        self.result_cache: typing.Optional[ProbeResultCache] = _result_cache
+
+        # Endpoints found dead recently are skipped, and dead endpoints are added to it
+        self.dead_filter: typing.Optional[DeadEndpointFilter] = _dead_filter
+
         self.logger: Logger = Logger(
             _logger_name = "ProvidersProxyTester",
-            _debug = self.debug
+            _debug = self.debug,
+            _background = True
         )
 
         self.proxy_tester: ProxyTester = ProxyTester(
             _connection_timeout = 5,
-            _debug = self.debug
+            _debug = self.debug,
+            _socket_profile = _socket_profile,
+            _scheme_priors = _scheme_priors
         )
     
-    async def test_proxy(self, _proxy: ProxyInfo) -> ProxyInfo:
-        self.logger.log(f"Starting testing proxy: {_proxy}")
+    async def test_proxy(self, _proxy: ProxyInfo, _use_cache: bool = True) -> ProxyInfo:
+        self.logger.log("Starting testing proxy: {}", _proxy)
+
+        # Stays False if the test gets cancelled, e.g. by the deadline of test_proxies
+        _proxy.is_tested = False
 
         # If proxy is blacklisted, skip that proxy.
         if _proxy.is_blacklisted:
-            self.logger.log(f"This proxy is blacklisted: {_proxy}")
+            self.logger.log("This proxy is blacklisted: {}", _proxy)
+            PROXIES_TESTED_TOTAL.inc("blacklisted")
+            _proxy.is_tested = True
+            return _proxy
+
+        if _use_cache and self.dead_filter is not None and self.dead_filter.contains_proxy(_proxy):
+            self.logger.log("This proxy is known dead: {}", _proxy)
+            DEAD_FILTER_SKIPS_TOTAL.inc("test")
+            _proxy.set_is_active(_active = False)
+            _proxy.is_tested = True
+            return _proxy
+
+        cache: typing.Optional[ProbeResultCache] = self.result_cache if _use_cache else None
+
+        if cache is None:
+            return await self.probe_proxy(_proxy)
+
+        key: tuple = cache.get_key(_proxy)
+        cached: typing.Optional[tuple[bool, typing.Optional[str]]] = cache.get(key)
+
+        if cached is None and key in cache.in_flight:
+            # The same endpoint is being probed right now, e.g. it came from two providers
+            cached = await asyncio.shield(cache.in_flight[key])
+
+            if cached is None:
+                # Nothing was learned, the probe was cancelled or failed. Like a proxy cut off by a deadline,
+                # this one stays untested and keeps its previous `is_active` state.
+                self.logger.log("Shared probe of proxy was cancelled or failed: {}", _proxy)
+                return _proxy
+
+        if cached is not None:
+            cache.record(_hit = True)
+            active, scheme = cached
+
+            if active and scheme:
+                _proxy.set_proxy_scheme(_scheme = scheme)
+
+            _proxy.set_is_active(_active = active)
+            _proxy.is_tested = True
+            self.logger.log("Cached result of proxy: {}", _proxy)
+
             return _proxy
 
+        cache.record(_hit = False)
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        cache.in_flight[key] = future
+
+        # Published to the waiters only when the probe completes, None if it's cancelled or fails
+        outcome: typing.Optional[tuple[bool, typing.Optional[str]]] = None
+
+        try:
+            await self.probe_proxy(_proxy)
+
+            outcome = (_proxy.is_active, _proxy.scheme)
+            cache.put(key, _active = _proxy.is_active, _scheme = _proxy.scheme)
+
+        finally:
+            del cache.in_flight[key]
+            future.set_result(outcome)
+
+        return _proxy
+
+    async def probe_proxy(self, _proxy: ProxyInfo) -> ProxyInfo:
+
         # Check if provided proxy has defined valid proxy_scheme
         if not _proxy.scheme or _proxy.scheme not in ["HTTPS", "HTTP", "SOCKS5", "SOCKS4"]:
             # If the proxy doesn't have provided scheme of proxy, or is not in ["HTTPS", "HTTP", "SOCKS5", "SOCKS4"]
@@ -35,7 +116,8 @@ class ProvidersProxyTester:
             # We are trying to detect the scheme of the proxy
             proxy_host, proxy_port, proxy_scheme = await self.proxy_tester.detect_scheme(
                 _host = _proxy.host,
-                _port = _proxy.port
+                _port = _proxy.port,
+                _provider = _proxy.provider
             )
 
             # Checking if we got the proxy_scheme
@@ -51,6 +133,8 @@ class ProvidersProxyTester:
         else:
             # If the proxy_scheme was provided, we are just checking the connection for provided proxy_scheme
 
+            start: float = time.perf_counter()
+
             is_alive = await self.proxy_tester.check_connection(
                 _scheme = _proxy.scheme,
                 _host = _proxy.host,
@@ -59,37 +143,199 @@ class ProvidersProxyTester:
 
             _proxy.set_is_active(_active = is_alive)
 
+            if is_alive:
+                _proxy.latency = time.perf_counter() - start
+
         self.logger.log(_proxy)
+        PROXIES_TESTED_TOTAL.inc("active" if _proxy.is_active else "inactive")
+
+        if self.dead_filter is not None and not _proxy.is_active:
+            self.dead_filter.add_proxy(_proxy)
 
         # Call the method to update connection_retries variable
         # in _proxy class, to check if this proxy should be
         # blacklisted or not
         _proxy.update_connection_retries()
+        _proxy.is_tested = True
 
         return _proxy
 
-    async def test_proxies(self, _proxies: list[ProxyInfo], _concurrent_tasks: int = 500) -> list[ProxyInfo]:
+    async def test_proxies(
+            self,
+            _proxies: list[ProxyInfo],
+            _concurrent_tasks: int = 500,
+            _use_cache: bool = True,
+            _deadline: typing.Optional[float] = None,
+            _priority: typing.Optional[ProxyScore] = None
+        ) -> list[ProxyInfo]:
+        """
+        Tests proxies concurrently and returns them in input order.
+
+        With `_deadline` (in seconds), tests still running or queued when it expires are cancelled,
+        their sockets are closed, and the proxies are returned with `is_tested` set to False (their
+        `is_active` state is left as it was). Proxies tested in time have `is_tested` set to True.
+
+        With `_priority` (a score function, see `ProxySea.util.priority`), proxies are tested in
+        order of their score, highest first, instead of input order. Under a deadline, the best
+        proxies are the ones that get tested.
+        """
+
         if not _proxies:
             return []
         
         if not _concurrent_tasks or _concurrent_tasks < 0:
             raise ValueError("You have to provide _concurrent_tasks > 0.")
 
-        aio: AIOBase = AIOBase(_semaphore = _concurrent_tasks)
+        aio: AIOBase = AIOBase(_semaphore = _concurrent_tasks, _name = "test_proxies")
 
-        for proxy in _proxies:
-            aio.add_task(self.test_proxy, proxy)
+        # Tasks take the free slots in the order they were added, highest score first.
+        # sorted() is stable, proxies with the same score keep their input order.
+        ordered: list[ProxyInfo] = _proxies if _priority is None else sorted(_proxies, key = lambda proxy: -_priority(proxy))
+
+        for proxy in ordered:
+            # Proxies still queued when the deadline expires never reach test_proxy, which resets the flag.
+            # Reset it here, so they don't pass for tested because of an earlier round.
+            proxy.is_tested = False
+            aio.add_task(self.test_proxy, proxy, _use_cache)
         
-        # Run tasks returns lists of proxies
-        tested_proxies: list[ProxyInfo] = await aio.run_tasks()
+        if _deadline is None:
+            # Run tasks returns lists of proxies
+            tested_proxies: list[ProxyInfo] = await aio.run_tasks()
+
+            return tested_proxies if _priority is None else list(_proxies)
+
+        await aio.run_tasks(_timeout = _deadline)
+        untested: int = sum(not proxy.is_tested for proxy in _proxies)
 
-        return tested_proxies
+        if untested:
+            self.logger.log("Deadline of {} seconds expired, {} proxies left untested.", _deadline, untested, _level = "WARNING")
+            PROXIES_TESTED_TOTAL.inc("untested", _amount = untested)
+
+        return list(_proxies)
+
+    async def test_proxies_stream(
+            self,
+            _proxies: typing.Iterable[ProxyInfo] | typing.AsyncIterable[ProxyInfo],
+            _concurrent_tasks: int = 500,
+            _priority: typing.Optional[ProxyScore] = None,
+            _priority_window: typing.Optional[int] = None
+        ) -> typing.AsyncIterator[ProxyInfo]:
+        """
+        Tests proxies from a (possibly huge or endless) iterable and yields them as tests complete.
+
+        A fixed pool of `_concurrent_tasks` workers pulls proxies from a bounded queue, so only about
+        2 * `_concurrent_tasks` proxies are held in memory at once, however many the source yields.
+        Results are yielded in completion order, not in input order.
+
+        With `_priority` (a score function, see `ProxySea.util.priority`), the queue is a heap and
+        workers take the proxy with the highest score first, so the best proxies come out first.
+        Only queued proxies are ordered: `_priority_window` (default `_concurrent_tasks`) bounds the
+        queue, a larger window orders more of the source at the cost of memory.
+
+        Examples:
+        ```
+            >>> async for proxy in tester.test_proxies_stream(ProxyListReader("proxies.txt").aiter()):
+            >>>     print(proxy)
+        ```
+        """
+
+        if not _concurrent_tasks or _concurrent_tasks < 0:
+            raise ValueError("You have to provide _concurrent_tasks > 0.")
+
+        results: asyncio.Queue = asyncio.Queue(maxsize = _concurrent_tasks)
+
+        if _priority is None:
+            pending: asyncio.Queue = asyncio.Queue(maxsize = _concurrent_tasks)
+
+            put = pending.put
+            get = pending.get
+
+        else:
+            # Heap of (-score, arrival, proxy), the arrival number keeps equal scores in input order
+            pending = asyncio.PriorityQueue(maxsize = _priority_window or _concurrent_tasks)
+            arrivals: typing.Iterator[int] = itertools.count()
+
+            async def put(_proxy: typing.Optional[ProxyInfo]) -> None:
+                # Stop markers sort after every proxy
+                await pending.put((math.inf if _proxy is None else -_priority(_proxy), next(arrivals), _proxy))
+
+            async def get() -> typing.Optional[ProxyInfo]:
+                return (await pending.get())[2]
+
+        async def produce() -> None:
+            try:
+                if hasattr(_proxies, "__aiter__"):
+                    async for proxy in _proxies:
+                        await put(proxy)
+
+                else:
+                    for proxy in _proxies:
+                        await put(proxy)
+
+            except Exception as e:
+                # Raised to the consumer once the already queued proxies are tested
+                await results.put(e)
+
+            # One stop marker per worker
+            for _ in range(_concurrent_tasks):
+                await put(None)
+
+        async def work() -> None:
+            while (proxy := await get()) is not None:
+                TASKS_IN_FLIGHT.inc("test_proxies_stream")
+
+                try:
+                    result: ProxyInfo | Exception = await self.test_proxy(proxy)
+
+                except Exception as e:
+                    # Raised to the consumer like producer errors, the worker moves on to the next proxy,
+                    # so the producer never blocks on a queue nobody drains and the stop marker is still put
+                    result = e
+
+                finally:
+                    TASKS_IN_FLIGHT.dec("test_proxies_stream")
+
+                await results.put(result)
+
+            await results.put(None)
+
+        tasks: list[asyncio.Task] = [asyncio.create_task(produce())]
+        tasks.extend(asyncio.create_task(work()) for _ in range(_concurrent_tasks))
+
+        try:
+            running: int = _concurrent_tasks
+            error: typing.Optional[Exception] = None
+
+            while running:
+                result = await results.get()
+
+                if result is None:
+                    running -= 1
+
+                elif isinstance(result, Exception):
+                    error = result
+
+                else:
+                    yield result
+
+            if error is not None:
+                raise error
+
+        finally:
+            # Stops the workers when the consumer stops early
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions = True)
 
 
 class ProvidersManager:
-    def __init__(self, _debug: bool = False) -> None:
+    def __init__(self, _debug: bool = False, _dead_filter: typing.Optional[DeadEndpointFilter] = None) -> None:
         self.debug: bool = _debug
 
+        # Fetched proxies known dead by the filter are dropped with the duplicates
+        self.dead_filter: typing.Optional[DeadEndpointFilter] = _dead_filter
+
         self.PROVIDERS: list[ProxyProvider] = [
             FreeProxyList(
                 _debug = self.debug
@@ -101,12 +347,13 @@ class ProvidersManager:
 
         self.logger: Logger = Logger(
             _logger_name = "ProvidersManager",
-            _debug = self.debug
+            _debug = self.debug,
+            _background = True
         )
 
     
     async def fetch_proxies(self, _concurrent_tasks: int = 10) -> list[ProxyInfo]:
-        aio: AIOBase = AIOBase(_semaphore = _concurrent_tasks)
+        aio: AIOBase = AIOBase(_semaphore = _concurrent_tasks, _name = "fetch_proxies")
 
         # Fetch all proxies from each provider
         # --->
@@ -119,15 +366,22 @@ class ProvidersManager:
         # Append all fetched proxies to the proxies list and skip duplicates, and return it.
         # --->
         proxies: list[ProxyInfo] = []
-        proxy_ids: list[str] = []
+        proxy_ids: set[str] = set()
 
-        for prov_proxies in provider_proxies:
+        for provider, prov_proxies in zip(self.PROVIDERS, provider_proxies):
             for proxy in prov_proxies:
                 if proxy.id in proxy_ids:
                     continue
 
+                proxy.provider = provider.domain
+
+                proxy_ids.add(proxy.id)
+
+                if self.dead_filter is not None and self.dead_filter.contains_proxy(proxy):
+                    DEAD_FILTER_SKIPS_TOTAL.inc("fetch")
+                    continue
+
                 proxies.append(proxy)
-                proxy_ids.append(proxy.id)
         # <---
 
         return proxies
@@ -137,11 +391,18 @@ class ProvidersManager:
             _proxies: list[ProxyInfo],
             _active: bool = True,
             _scheme: typing.Literal["HTTPS", "HTTP", "SOCKS5", "SOCKS4", "ALL"] = "ALL",
-            _anonymity_level: typing.Literal["HIGH", "MEDIUM", "LOW", "ALL"] = "ALL"
+            _anonymity_level: typing.Literal["HIGH", "MEDIUM", "LOW", "ALL"] = "ALL",
+            _country: str | typing.Sequence[str] = "ALL"
         ) -> list[ProxyInfo]:
         _scheme = _scheme.upper()
         _anonymity_level = _anonymity_level.upper()
 
+        # Country codes set by GeoIPIndex.enrich()
+        countries: typing.Optional[set[str]] = None
+
+        if _country != "ALL":
+            countries = {_country.upper()} if isinstance(_country, str) else {country.upper() for country in _country}
+
         if not _proxies:
             return _proxies
 
@@ -157,6 +418,9 @@ class ProvidersManager:
             if _anonymity_level not in [proxy.anonymity_level, "ALL"]:
                 continue
 
+            if countries is not None and proxy.country not in countries:
+                continue
+
             proxies.append(proxy)
 
         return proxies
@@ -1,50 +1,98 @@
 from ..imports import bs4, lxml, typing
 
 from ..util import ProxyInfo, ProxyProvider
+from ..metrics import PROVIDER_PARSE_DURATION, PROVIDER_PROXIES_TOTAL
 
 class FreeProxyListScrapper:
-    def __init__(self, _html: str) -> None:
-        self.html = bs4.BeautifulSoup(_html, "lxml")
-        
+    # XPath equivalent of the "#list > div > div.table-responsive > div > table > tbody" CSS selector.
+    TABLE_ROWS_XPATH: str = (
+        "//*[@id='list']/div/div[contains(concat(' ', normalize-space(@class), ' '), ' table-responsive ')]"
+        "/div/table/tbody/tr"
+    )
+
+    def __init__(self, _html: str, _parser: typing.Literal["lxml", "bs4"] = "lxml") -> None:
+        if _parser not in ["lxml", "bs4"]:
+            raise ValueError(f"Unknown parser: {_parser}. Use one of them ['lxml', 'bs4'].")
+
+        self.parser: str = _parser
+        self.raw_html: str = _html
+
+        # The BeautifulSoup tree is only needed by the "bs4" parser,
+        # the "lxml" parser reads the rows straight from the lxml tree.
+        self.html = bs4.BeautifulSoup(_html, "lxml") if _parser == "bs4" else None
+
         self.ANONYMITY_LEVELS: dict[str] = {
             "elite proxy": "HIGH",
             "anonymous": "MEDIUM",
             "transparent": "LOW"
         }
 
-    def scrape_proxies(self) -> list[str]:
+    def scrape_proxies(self) -> list[ProxyInfo]:
+        if self.parser == "lxml":
+            return self.scrape_proxies_lxml()
+
+        return self.scrape_proxies_bs4()
+
+    def scrape_proxies_bs4(self) -> list[ProxyInfo]:
         table = self.html.select_one("#list > div > div.table-responsive > div > table > tbody")
-        proxies: list[str] = []
+        proxies: list[ProxyInfo] = []
 
         # Check for every <tr> element in <tbody>
         for tableRow in table:
             proxy_info: list = tableRow.select("td")
 
-            if not proxy_info:
+            if len(proxy_info) < 5:
                 continue
 
-            if not bool(proxy_info[0] and proxy_info[1]):
+            proxy: typing.Optional[ProxyInfo] = self.create_proxy(
+                proxy_info[0].get_text(), proxy_info[1].get_text(), proxy_info[4].get_text()
+            )
+
+            if proxy is not None:
+                proxies.append(proxy)
+
+        return proxies
+
+    def scrape_proxies_lxml(self) -> list[ProxyInfo]:
+        document = lxml.html.fromstring(self.raw_html)
+        proxies: list[ProxyInfo] = []
+
+        # Read (host, port, anonymity) straight from the <td> cells of every <tr> element
+        for tableRow in document.xpath(self.TABLE_ROWS_XPATH):
+            proxy_info: list = tableRow.findall("td")
+
+            if len(proxy_info) < 5:
                 continue
 
-            host: str = proxy_info[0].get_text()
-            port: str = proxy_info[1].get_text()
-            anonymity: str = proxy_info[4].get_text()
-
-            proxies.append(
-                ProxyInfo(
-                    _scheme = None,
-                    _host = host,
-                    _port = port,
-                    _anonymity_level = self.ANONYMITY_LEVELS[anonymity]
-                )
+            proxy: typing.Optional[ProxyInfo] = self.create_proxy(
+                proxy_info[0].text_content(), proxy_info[1].text_content(), proxy_info[4].text_content()
             )
 
+            if proxy is not None:
+                proxies.append(proxy)
+
         return proxies
 
+    def create_proxy(self, _host: str, _port: str, _anonymity: str) -> typing.Optional[ProxyInfo]:
+        # Shared by both parsers, so they agree on every row. Unknown anonymity labels become None.
+        host: str = _host.strip()
+        port: str = _port.strip()
+
+        if not host or not port:
+            return None
+
+        return ProxyInfo(
+            _scheme = None,
+            _host = host,
+            _port = port,
+            _anonymity_level = self.ANONYMITY_LEVELS.get(_anonymity.strip().lower())
+        )
+
 
 class FreeProxyList(ProxyProvider):
-    def __init__(self, _debug: bool = False) -> None:
+    def __init__(self, _debug: bool = False, _parser: typing.Literal["lxml", "bs4"] = "lxml") -> None:
         self.debug: bool = _debug
+        self.parser: str = _parser
 
         super().__init__(
             _provider_url = "https://free-proxy-list.net/",
@@ -57,8 +105,11 @@ class FreeProxyList(ProxyProvider):
         if not html:
             return []
 
-        free_proxy_list_scrapper: FreeProxyListScrapper = FreeProxyListScrapper(_html = html)
-        proxies: list[str] = free_proxy_list_scrapper.scrape_proxies()
+        with PROVIDER_PARSE_DURATION.time(self.domain):
+            free_proxy_list_scrapper: FreeProxyListScrapper = FreeProxyListScrapper(_html = html, _parser = self.parser)
+            proxies: list[str] = free_proxy_list_scrapper.scrape_proxies()
+
+        PROVIDER_PROXIES_TOTAL.inc(self.domain, _amount = len(proxies))
 
         if not proxies:
             return []
@@ -1,12 +1,15 @@
 from ..imports import bs4, lxml, typing
 
-from ..util import ProxyProvider, ProxyInfo, MiniJS
+from ..util import ProxyProvider, ProxyInfo, MiniJSPool
+from ..metrics import PROVIDER_PARSE_DURATION, PROVIDER_PROXIES_TOTAL
 
 class SpysOneScrapper:
-    def __init__(self, _html: str) -> None:
+    def __init__(self, _html: str, _mini_js_pool: typing.Optional[MiniJSPool] = None) -> None:
         self.html = bs4.BeautifulSoup(_html, "lxml")
         self.details = self.html.select("table")[1].select("tr")
-        self.mini_js = MiniJS()
+
+        # MiniJS instances are borrowed from the pool only while the ports are deobfuscated
+        self.mini_js_pool: MiniJSPool = _mini_js_pool or MiniJSPool.get_shared_pool()
 
         self.ANONYMITY_LEVELS: dict[str] = {
             "hia": "HIGH",
@@ -14,7 +17,7 @@ class SpysOneScrapper:
             "noa": "LOW"
         }
 
-    def find_obfuscated_script(self) -> bs4.PageElement:
+    def find_obfuscated_script(self) -> typing.Optional[str]:
         all_scripts: list[bs4.PageElement] = self.html.select("script")
 
         obfs_flag = "eval(function(p,"
@@ -24,13 +27,13 @@ class SpysOneScrapper:
 
         return None
 
-    def get_proxies(self) -> None:
-        # Find and deobfuscate javascript with values
+    def get_proxies(self) -> list[ProxyInfo]:
+        # Find javascript with values
         obfuscated_script: str = self.find_obfuscated_script()
-        deobfuscated_script: str = self.mini_js.deobfuscate_script(_script = obfuscated_script)
-        self.mini_js.set_temp_script(_new_script = deobfuscated_script)
 
-        proxy_list: list[str] = []
+        # Collect every row first, so all obfuscated ports can be evaluated in a single MiniJS call
+        rows: list[tuple[str, str]] = []
+        obfuscated_ports: list[str] = []
 
         for detail in self.details:
             if not "document.write(" in str(detail) or not "this.style" in str(detail) or "Proxy servers sorted by country" in str(detail):
@@ -39,11 +42,25 @@ class SpysOneScrapper:
             ip: str = detail.select_one("td:nth-child(1) > font").get_text().strip().replace(" ", "")
             # Find obfuscated script port
             obfuscated_port: str = detail.select_one("td:nth-child(1) > font > script").get_text()
-            # Deobfuscate script port
-            port = str(self.mini_js.get_value_from_temp_script(obfuscated_port.replace('document.write(":', '("'))).strip().replace(" ", "")
             # Proxy anonymity
             anonymity: str = detail.select_one("td:nth-child(3) > font").get_text().lower()
 
+            rows.append((ip, anonymity))
+            obfuscated_ports.append(obfuscated_port.strip().rstrip(";").replace('document.write(":', '("'))
+
+        with self.mini_js_pool.borrow() as mini_js:
+            # Deobfuscate javascript with values
+            deobfuscated_script: str = mini_js.deobfuscate_script(_script = obfuscated_script)
+            mini_js.set_temp_script(_new_script = deobfuscated_script)
+
+            # Deobfuscate all script ports at once
+            ports: list[str] = mini_js.get_values_from_temp_script(_values = obfuscated_ports)
+
+        proxy_list: list[ProxyInfo] = []
+
+        for (ip, anonymity), port in zip(rows, ports):
+            port = port.strip().replace(" ", "")
+
             if not ip or not port:
                 continue
 
@@ -74,8 +91,11 @@ class SpysOne(ProxyProvider):
         if not html:
             return []
 
-        spys_one_scrapper: SpysOneScrapper = SpysOneScrapper(_html = html)
-        proxies: list[str] = spys_one_scrapper.get_proxies()
+        with PROVIDER_PARSE_DURATION.time(self.domain):
+            spys_one_scrapper: SpysOneScrapper = SpysOneScrapper(_html = html)
+            proxies: list[str] = spys_one_scrapper.get_proxies()
+
+        PROVIDER_PROXIES_TOTAL.inc(self.domain, _amount = len(proxies))
 
         if not proxies:
             return []
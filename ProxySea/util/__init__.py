@@ -1,5 +1,15 @@
 from .aio import AIOBase
 from .http_client import HttpClient, HttpClientSettings
-from .mini_js import MiniJS
+from .mini_js import MiniJS, MiniJSPool
 from .proxy_provider import ProxyProvider
-from .proxy_tester import ProxyTester, ProxyInfo
\ No newline at end of file
+from .proxy_tester import ProxyTester, ProxyInfo
+from .probe_event import ProbeEvent
+from .proxy_io import ProxyListReader, ProxyListWriter
+from .geo_index import GeoIPIndex
+from .result_cache import ProbeResultCache
+from .dead_filter import DeadEndpointFilter
+from .loop_thread import EventLoopThread
+from .timer_wheel import TimerWheel
+from .socket_profile import SocketProfile
+from .scheme_priors import SchemePriors
+from .priority import ProxyScore, score_by_uptime, score_by_anonymity, score_by_latency, weighted_score, default_score
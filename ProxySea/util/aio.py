@@ -3,7 +3,9 @@
 # Licensed under the MIT License (see LICENSE file for details)
 
 import asyncio
-from typing import Coroutine, Callable, Awaitable, Any
+from typing import Coroutine, Callable, Awaitable, Any, Optional
+
+from ..metrics import TASKS_QUEUED, TASKS_IN_FLIGHT
 
 # Helper asyncio class
 class AIOBase:
@@ -16,6 +18,7 @@ class AIOBase:
     Attributes:
         semaphore (asyncio.Semaphore): Controls concurrency level of async tasks.
         tasks (list[Callable[[], Awaitable[Any]]]): List of task_wrappers scheduled for execution.
+        name (str | None): Runner name used to report queued and in-flight tasks as metrics, or None.
 
     Methods:
         set_semaphore(_semaphores):
@@ -49,12 +52,14 @@ class AIOBase:
     ```
     """
 
-    def __init__(self, _semaphore: int = 5) -> None:
+    def __init__(self, _semaphore: int = 5, _name: Optional[str] = None) -> None:
         """
         Initializes the AIOBase instance with a semaphore limit.
 
         Args:
             _semaphore (int): Maximum number of concurrent tasks allowed. Default is 5.
+            _name (str | None): If set, queued and in-flight tasks are reported to the
+                `proxysea_tasks_queued` and `proxysea_tasks_in_flight` gauges under this runner name.
         
         Examples:
         ```
@@ -66,6 +71,7 @@ class AIOBase:
 
         self.semaphore: asyncio.Semaphore = asyncio.Semaphore(_semaphore)
         self.tasks: list[Callable[[], Awaitable[Any]]] = []
+        self.name: Optional[str] = _name
     
 
     def set_semaphore(self, _semaphore: int = 5) -> None:
@@ -124,8 +130,27 @@ class AIOBase:
             async with self.semaphore:
                 return await _function(*_args, **_kwargs)
 
+        # Create a semaphore task reporting queue depth and concurrency in use
+        async def wrapped_task_with_metrics() -> Any:
+            TASKS_QUEUED.inc(self.name)
+
+            try:
+                await self.semaphore.acquire()
+
+            finally:
+                TASKS_QUEUED.dec(self.name)
+
+            TASKS_IN_FLIGHT.inc(self.name)
+
+            try:
+                return await _function(*_args, **_kwargs)
+
+            finally:
+                TASKS_IN_FLIGHT.dec(self.name)
+                self.semaphore.release()
+
         # Add semaphore task to self.tasks
-        task = wrapped_task
+        task = wrapped_task if self.name is None else wrapped_task_with_metrics
         self.tasks.append(task)
 
 
@@ -154,7 +179,7 @@ class AIOBase:
         self.tasks = []
 
 
-    async def run_tasks(self, return_exceptions: bool = False) -> list[Any]:
+    async def run_tasks(self, return_exceptions: bool = False, _timeout: Optional[float] = None) -> list[Any]:
         """
         Executes all added tasks concurrently, respecting the semaphore limit.
 
@@ -162,6 +187,10 @@ class AIOBase:
             return_exceptions (bool): 
                 If set to True, exceptions raised by tasks will be returned in the results list 
                 instead of being propagated. Defaults to False.
+            _timeout (float | None):
+                Time budget (in seconds) for all tasks. Tasks still queued or running when it
+                expires are cancelled (and awaited, so their cleanup runs), their results are None.
+                Defaults to no budget.
 
         Returns:
             list[Any]: A list containing the results of the completed tasks, or exception instances 
@@ -183,8 +212,45 @@ class AIOBase:
             >>> results = asyncio.run(aio.run_tasks())
             >>> print(results)
             >>> [5, 15]  # Result of the print
+
+            >>> aio.add_task(asyncio.sleep, 10, "late")
+            >>> results = asyncio.run(aio.run_tasks(_timeout = 1))
+            >>> print(results)
+            >>> [5, 15, None]  # Result of the print
         ```
         """
 
-        coros: list[Coroutine] = [task() for task in self.tasks]
-        return await asyncio.gather(*coros, return_exceptions = return_exceptions)
\ No newline at end of file
+        if _timeout is None:
+            coros: list[Coroutine] = [task() for task in self.tasks]
+            return await asyncio.gather(*coros, return_exceptions = return_exceptions)
+
+        tasks: list[asyncio.Task] = [asyncio.ensure_future(task()) for task in self.tasks]
+
+        try:
+            await asyncio.wait(tasks, timeout = _timeout)
+
+        finally:
+            # Also reached when the caller is cancelled, no task outlives the call
+            pending: set[asyncio.Task] = {task for task in tasks if not task.done()}
+
+            for task in pending:
+                task.cancel()
+
+            await asyncio.gather(*pending, return_exceptions = True)
+
+        results: list[Any] = []
+
+        for task in tasks:
+            if task in pending:
+                results.append(None)
+
+            elif task.exception() is not None:
+                if not return_exceptions:
+                    raise task.exception()
+
+                results.append(task.exception())
+
+            else:
+                results.append(task.result())
+
+        return results
@@ -0,0 +1,217 @@
+from ..imports import array, bisect, csv, mmap, os, socket, struct, typing
+
+from .proxy_tester import ProxyInfo
+
+
+class GeoIPIndex:
+    """
+    Offline IPv4 geolocation (country and ASN) from a local IP-range database.
+
+    Ranges are kept in sorted, typed arrays (range starts, range ends, country ids, ASNs), a lookup
+    is a single binary search. The index can be built from a CSV file (IP2Location LITE, iptoasn.com
+    and similar range dumps) and saved into a compact binary file. The binary file is memory-mapped
+    on load, so opening even a large database is instant and its pages are shared between processes.
+
+    CSV rows hold the first address, the last address, the country code and optionally the ASN,
+    addresses either dotted ("1.0.0.0") or as integers ("16777216"). Other layouts are read by passing
+    the column indexes with `_columns`. Rows must not overlap.
+
+    Attributes:
+        starts (Sequence[int]): First address of every range, sorted.
+        ends (Sequence[int]): Last address of every range.
+        country_ids (Sequence[int]): Index into `countries` for every range.
+        asns (Sequence[int]): ASN of every range, 0 if unknown.
+        countries (list[str | None]): Country codes.
+
+    Methods:
+        from_csv(_path, _columns, _delimiter):
+            Builds the index from a CSV file.
+
+        load(_path) / save(_path):
+            Loads (memory-mapped) or saves the compiled binary index.
+
+        lookup(_host):
+            Returns (country, asn) of an IPv4 address, or (None, None).
+
+        enrich(_proxies):
+            Sets `country` and `asn` of every proxy.
+
+    Examples:
+    ```
+        >>> index = GeoIPIndex.from_csv("IP2LOCATION-LITE-DB1.CSV")
+        >>> index.save("geoip.bin")
+
+        >>> index = GeoIPIndex.load("geoip.bin")
+        >>> print(index.lookup("1.1.1.1"))
+        >>> ('AU', 13335) # Result of the print
+    ```
+    """
+
+    MAGIC: bytes = b"PSGEO1\x00\x00"
+
+    # Magic, number of ranges, number of countries
+    HEADER: struct.Struct = struct.Struct("<8sII")
+
+    def __init__(
+            self,
+            _starts: typing.Sequence[int],
+            _ends: typing.Sequence[int],
+            _country_ids: typing.Sequence[int],
+            _asns: typing.Sequence[int],
+            _countries: list[typing.Optional[str]]
+        ) -> None:
+        self.starts: typing.Sequence[int] = _starts
+        self.ends: typing.Sequence[int] = _ends
+        self.country_ids: typing.Sequence[int] = _country_ids
+        self.asns: typing.Sequence[int] = _asns
+        self.countries: list[typing.Optional[str]] = _countries
+
+        self.mapped: typing.Optional[mmap.mmap] = None
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @staticmethod
+    def parse_address(_value: str) -> int:
+        _value = _value.strip().strip('"')
+
+        if _value.isdigit():
+            return int(_value)
+
+        return int.from_bytes(socket.inet_aton(_value), "big")
+
+    @classmethod
+    def from_csv(
+            cls,
+            _path: str,
+            _columns: tuple[int, int, int, typing.Optional[int]] = (0, 1, 2, 3),
+            _delimiter: str = ","
+        ) -> "GeoIPIndex":
+        """
+        Builds the index from a CSV (or TSV) file of IP ranges.
+
+        Args:
+            _path (str): Path of the file.
+            _columns (tuple): Indexes of the (first address, last address, country, ASN) columns,
+                the ASN index may be None.
+            _delimiter (str): Column delimiter, e.g. "\\t" for iptoasn.com dumps.
+        """
+
+        start_column, end_column, country_column, asn_column = _columns
+
+        rows: list[tuple[int, int, int, int]] = []
+        countries: list[typing.Optional[str]] = [None]
+        country_ids: dict[str, int] = {}
+
+        with open(_path, encoding = "utf-8", newline = "") as file:
+            for row in csv.reader(file, delimiter = _delimiter):
+                try:
+                    start: int = cls.parse_address(row[start_column])
+                    end: int = cls.parse_address(row[end_column])
+
+                except (IndexError, ValueError, OSError):
+                    # Header and malformed rows
+                    continue
+
+                country: str = row[country_column].strip().upper() if len(row) > country_column else ""
+
+                if country in ["", "-", "NONE", "UNKNOWN", "ZZ"]:
+                    country_id: int = 0
+
+                else:
+                    country_id = country_ids.get(country, 0)
+
+                    if not country_id:
+                        country_id = country_ids[country] = len(countries)
+                        countries.append(country)
+
+                asn: int = 0
+
+                if asn_column is not None and len(row) > asn_column:
+                    digits: str = row[asn_column].strip().upper().removeprefix("AS")
+                    asn = int(digits) if digits.isdigit() else 0
+
+                rows.append((start, end, country_id, asn))
+
+        rows.sort()
+
+        return cls(
+            _starts = array.array("I", [row[0] for row in rows]),
+            _ends = array.array("I", [row[1] for row in rows]),
+            _country_ids = array.array("H", [row[2] for row in rows]),
+            _asns = array.array("I", [row[3] for row in rows]),
+            _countries = countries
+        )
+
+    def save(self, _path: str) -> None:
+        countries: bytes = "\n".join(country or "" for country in self.countries).encode()
+
+        with open(_path, "wb") as file:
+            file.write(self.HEADER.pack(self.MAGIC, len(self), len(self.countries)))
+
+            for values, typecode in [(self.starts, "I"), (self.ends, "I"), (self.asns, "I"), (self.country_ids, "H")]:
+                file.write(array.array(typecode, values).tobytes())
+
+            file.write(countries)
+
+    @classmethod
+    def load(cls, _path: str) -> "GeoIPIndex":
+        with open(_path, "rb") as file:
+            mapped: mmap.mmap = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+
+        magic, count, _ = cls.HEADER.unpack_from(mapped)
+
+        if magic != cls.MAGIC:
+            mapped.close()
+            raise ValueError(f"{_path} is not a GeoIPIndex file.")
+
+        # Zero-copy views into the mapped file, laid out as written by save()
+        view: memoryview = memoryview(mapped)
+        offset: int = cls.HEADER.size
+
+        columns: list[memoryview] = []
+
+        for typecode, size in [("I", 4), ("I", 4), ("I", 4), ("H", 2)]:
+            columns.append(view[offset:offset + count * size].cast(typecode))
+            offset += count * size
+
+        countries: list[typing.Optional[str]] = [country or None for country in bytes(view[offset:]).decode().split("\n")]
+
+        index: GeoIPIndex = cls(
+            _starts = columns[0],
+            _ends = columns[1],
+            _country_ids = columns[3],
+            _asns = columns[2],
+            _countries = countries
+        )
+
+        index.mapped = mapped
+        return index
+
+    def lookup(self, _host: str) -> tuple[typing.Optional[str], typing.Optional[int]]:
+        try:
+            address: int = int.from_bytes(socket.inet_aton(_host), "big")
+
+        except (OSError, TypeError):
+            return None, None
+
+        position: int = bisect.bisect_right(self.starts, address) - 1
+
+        if position < 0 or address > self.ends[position]:
+            return None, None
+
+        return self.countries[self.country_ids[position]], self.asns[position] or None
+
+    def enrich(self, _proxies: typing.Iterable[ProxyInfo]) -> int:
+        """
+        Sets `country` and `asn` of every proxy. Returns the number of proxies found in the database.
+        """
+
+        found: int = 0
+        lookup = self.lookup
+
+        for proxy in _proxies:
+            proxy.country, proxy.asn = lookup(proxy.host)
+            found += proxy.country is not None or proxy.asn is not None
+
+        return found
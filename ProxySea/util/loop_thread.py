@@ -0,0 +1,134 @@
+from ..imports import asyncio, concurrent, threading, typing
+
+from ..logger import Logger
+
+
+class EventLoopThread:
+    """
+    One asyncio event loop running forever in a dedicated background thread.
+
+    Synchronous code (e.g. a pool of worker threads) submits coroutines to the loop and gets
+    thread-safe `concurrent.futures.Future` objects back, or blocks until they finish. Everything
+    created on the loop (tasks, services, pooled connections) survives between calls, unlike with
+    `asyncio.run()`, which builds and tears down a new loop every time.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): The loop run by the thread.
+        thread (threading.Thread): The daemon thread running the loop.
+
+    Methods:
+        start() / stop(_timeout):
+            Starts the thread, or stops the loop (cancelling its remaining tasks) and joins the thread.
+
+        submit(_coroutine):
+            Schedules a coroutine on the loop and returns a `concurrent.futures.Future`.
+
+        run(_coroutine, _timeout):
+            Runs a coroutine on the loop and blocks until it returns.
+
+        iterate(_async_iterable, _timeout):
+            Turns an async iterable into a blocking iterator, items are produced on the loop.
+
+    Examples:
+    ```
+        >>> loop_thread = EventLoopThread()
+        >>> loop_thread.start()
+
+        >>> print(loop_thread.run(asyncio.sleep(0.1, "done")))
+        >>> done # Result of the print
+
+        >>> future = loop_thread.submit(asyncio.sleep(1, "later"))
+        >>> print(future.result(timeout = 5))
+        >>> later # Result of the print
+
+        >>> loop_thread.stop()
+    ```
+    """
+
+    def __init__(self, _name: str = "ProxySeaLoop") -> None:
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.thread: threading.Thread = threading.Thread(target = self.run_forever, name = _name, daemon = True)
+        self.started: threading.Event = threading.Event()
+
+        self.logger: Logger = Logger(_logger_name = "EventLoopThread", _background = True)
+
+    @property
+    def is_running(self) -> bool:
+        return self.thread.is_alive() and self.loop.is_running()
+
+    def start(self) -> None:
+        if self.thread.is_alive():
+            return
+
+        self.thread.start()
+        self.started.wait()
+
+    def run_forever(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self.started.set)
+
+        try:
+            self.loop.run_forever()
+
+        finally:
+            # Tasks left behind (e.g. of a service that wasn't stopped) are cancelled, not destroyed pending
+            tasks: set[asyncio.Task] = asyncio.all_tasks(self.loop)
+
+            for task in tasks:
+                task.cancel()
+
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions = True))
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+            self.logger.log("Event loop thread {} stopped.", self.thread.name)
+
+    def submit(self, _coroutine: typing.Coroutine) -> concurrent.futures.Future:
+        if not self.is_running:
+            _coroutine.close()
+            raise RuntimeError("The event loop thread is not running, call start() first.")
+
+        return asyncio.run_coroutine_threadsafe(_coroutine, self.loop)
+
+    def run(self, _coroutine: typing.Coroutine, _timeout: typing.Optional[float] = None) -> typing.Any:
+        if threading.current_thread() is self.thread:
+            _coroutine.close()
+            raise RuntimeError("run() called from the loop thread would block the loop forever, await the coroutine instead.")
+
+        future: concurrent.futures.Future = self.submit(_coroutine)
+
+        try:
+            return future.result(timeout = _timeout)
+
+        except concurrent.futures.TimeoutError:
+            # Cancels the task on the loop too
+            future.cancel()
+            raise
+
+    def iterate(self, _async_iterable: typing.AsyncIterable, _timeout: typing.Optional[float] = None) -> typing.Iterator:
+        iterator: typing.AsyncIterator = _async_iterable.__aiter__()
+
+        async def next_item() -> typing.Any:
+            return await iterator.__anext__()
+
+        try:
+            while True:
+                try:
+                    item: typing.Any = self.run(next_item(), _timeout = _timeout)
+
+                except StopAsyncIteration:
+                    return
+
+                yield item
+
+        finally:
+            # The consumer stopped early, let the async generator clean up on its loop
+            if hasattr(iterator, "aclose") and self.is_running:
+                self.run(iterator.aclose())
+
+    def stop(self, _timeout: typing.Optional[float] = None) -> None:
+        if not self.thread.is_alive():
+            return
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout = _timeout)
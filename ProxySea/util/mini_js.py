@@ -1,4 +1,33 @@
-from ..imports import py_mini_racer
+from ..imports import py_mini_racer, json, threading, contextlib, typing
+
+# Defined once per isolate. Page scripts run through a direct eval inside a function, so their
+# var/let/const/function declarations are local to the call. Names a script assigns without
+# declaring them become globals, the reset function deletes those and restores overwritten ones.
+SCOPE_SCRIPT: str = """
+var __proxysea_reset = (function () {
+    var snapshot = new Map(Object.getOwnPropertyNames(globalThis).map(function (name) { return [name, globalThis[name]]; }));
+
+    return function () {
+        Object.getOwnPropertyNames(globalThis).forEach(function (name) {
+            if (name.indexOf("__proxysea_") === 0) {
+                return;
+            }
+
+            if (!snapshot.has(name)) {
+                delete globalThis[name];
+            }
+            else if (globalThis[name] !== snapshot.get(name)) {
+                globalThis[name] = snapshot.get(name);
+            }
+        });
+    };
+})();
+
+function __proxysea_eval(__proxysea_source) {
+    return eval(__proxysea_source);
+}
+"""
+
 
 class MiniJS:
     """
@@ -9,7 +38,7 @@ class MiniJS:
     temporary script assembly, and value extraction from evaluated scripts.
 
     Note:
-        - This class is synchronous and not thread-safe.
+        - This class is synchronous and not thread-safe. Use `MiniJSPool` to share instances across threads.
         - It is designed for basic JS execution, not for simulating full browser environments.
 
     Attributes:
@@ -31,6 +60,13 @@ class MiniJS:
 
         get_value_from_temp_script(_value):
             Evaluates the current temporary script and extracts the value of a specific variable or expression.
+
+        get_values_from_temp_script(_values):
+            Evaluates the current temporary script once and extracts the values of many expressions.
+
+        reset():
+            Clears the temporary script and the globals left by page scripts, so the instance can be
+            reused for another page.
     """
 
     def __init__(self) -> None:
@@ -44,8 +80,18 @@ class MiniJS:
         """
 
         self.mini_racer = py_mini_racer.py_mini_racer.MiniRacer()
+        self.mini_racer.eval(SCOPE_SCRIPT)
+
         self.temp_script: str = ""
 
+        # Set once a script ran, the globals it left behind live until reset()
+        self.is_dirty: bool = False
+
+    def eval_scoped(self, _script: str) -> typing.Any:
+        # Every page script goes through here, see SCOPE_SCRIPT
+        self.is_dirty = True
+        return self.mini_racer.eval(f"__proxysea_eval({json.dumps(_script)})")
+
     def print_temp_script(self) -> None:
         """
         Outputs the current temporary script content to the console.
@@ -87,7 +133,8 @@ class MiniJS:
         """
 
         script = str(_script).replace("eval", "")
-        return self.mini_racer.eval(script)
+
+        return self.eval_scoped(script)
 
     def set_temp_script(self, _new_script: str) -> None:
         """
@@ -150,4 +197,242 @@ class MiniJS:
         ```
         """
 
-        return self.mini_racer.eval(f"{self.temp_script};{_value};")
+        return self.eval_scoped(f"{self.temp_script};{_value};")
+
+    def get_values_from_temp_script(self, _values: list[str]) -> list[str]:
+        """
+        Evaluates the temporary script once, then returns the results of evaluating all provided value expressions.
+
+        All expressions are packed into a single JavaScript array, so the temporary script is executed
+        only once no matter how many expressions are requested. Every result is converted to a string.
+
+        Args:
+            _values (list[str]): JavaScript expressions or variable names to evaluate after script execution.
+
+        Returns:
+            list[str]: Results of evaluating the requested expressions, in the same order as `_values`.
+
+        Examples:
+        ```
+            >>> js = MiniJS()
+            >>> js.set_temp_script("var a = 3; var b = 7;")
+            >>> res = js.get_values_from_temp_script(["a * b", "a + b"])
+            >>> print(res)
+            >>> ['21', '10'] # Result of the print
+        ```
+        """
+
+        if not _values:
+            return []
+
+        expressions: str = ",".join(f"({value})" for value in _values)
+
+        return json.loads(self.eval_scoped(f"{self.temp_script};JSON.stringify([{expressions}].map(String));"))
+
+    def reset(self) -> None:
+        """
+        Clears the temporary script buffer and, if a script ran, the globals it left behind.
+
+        Globals of the previous page's scripts must not leak into the next one: a page that omits a
+        variable would silently read the old value. Declared variables never outlive their call,
+        globals created by undeclared assignments are deleted and overwritten ones restored. The
+        V8 isolate is kept. Changes to built-in prototypes (e.g. `String.prototype`) are not undone.
+
+        Returns:
+            None
+
+        Examples:
+        ```
+            >>> js = MiniJS()
+
+            >>> js.set_temp_script("var a = 1;")
+            >>> js.reset()
+            >>> print(repr(js.temp_script))
+            >>> '' # Result of the print
+        ```
+        """
+
+        self.temp_script = ""
+
+        if self.is_dirty:
+            self.mini_racer.eval("__proxysea_reset()")
+            self.is_dirty = False
+
+
+class MiniJSPool:
+    """
+    Thread-safe pool of reusable `MiniJS` instances.
+
+    Creating a `MiniJS` instance starts a new V8 isolate, which is a noticeable cost. The pool creates
+    instances lazily, up to `max_size`, and hands them out to one borrower at a time. Borrowed instances
+    are reset (see `MiniJS.reset()`) before they are returned to the pool, and replaced after `max_uses`
+    borrows to bound the memory their isolate accumulates.
+
+    Attributes:
+        max_size (int): Maximum number of `MiniJS` instances created by the pool.
+        max_uses (int | None): Number of borrows after which an instance is replaced by a new one, or None.
+        created (int): Number of `MiniJS` instances currently owned by the pool.
+
+    Methods:
+        get_shared_pool():
+            Returns the process-wide pool shared by all providers.
+
+        acquire(_timeout):
+            Takes an idle instance from the pool, creating one if the pool is not full yet.
+
+        release(_mini_js):
+            Resets the instance and gives it back to the pool.
+
+        borrow(_timeout):
+            Context manager wrapping `acquire()` and `release()`.
+
+    Examples:
+    ```
+        >>> pool = MiniJSPool(_max_size = 2)
+
+        >>> with pool.borrow() as js:
+        >>>     js.set_temp_script("var a = 3;")
+        >>>     print(js.get_value_from_temp_script("a * 2"))
+        >>> 6 # Result of the print
+    ```
+    """
+
+    _shared_pool: typing.Optional["MiniJSPool"] = None
+    _shared_pool_lock: threading.Lock = threading.Lock()
+
+    def __init__(self, _max_size: int = 4, _max_uses: typing.Optional[int] = 1000) -> None:
+        """
+        Initializes an empty pool. No `MiniJS` instance is created until the first borrow.
+
+        Args:
+            _max_size (int): Maximum number of `MiniJS` instances. Defaults to 4.
+            _max_uses (int | None): Borrows after which an instance is recycled, None to never recycle. Defaults to 1000.
+
+        Raises:
+            ValueError: If `_max_size` is lower than 1.
+
+        Examples:
+        ```
+            >>> pool = MiniJSPool(_max_size = 8)
+        ```
+        """
+
+        if _max_size < 1:
+            raise ValueError("The pool size must be at least 1.")
+
+        self.max_size: int = _max_size
+        self.max_uses: typing.Optional[int] = _max_uses
+        self.created: int = 0
+
+        self.idle: list[MiniJS] = []
+        self.uses: dict[int, int] = {}
+        self.condition: threading.Condition = threading.Condition()
+
+    @classmethod
+    def get_shared_pool(cls) -> "MiniJSPool":
+        """
+        Returns the process-wide pool, creating it on the first call.
+
+        Returns:
+            MiniJSPool: Pool shared by every provider that needs JavaScript evaluation.
+
+        Examples:
+        ```
+            >>> MiniJSPool.get_shared_pool() is MiniJSPool.get_shared_pool()
+            >>> True
+        ```
+        """
+
+        if cls._shared_pool is None:
+            with cls._shared_pool_lock:
+                if cls._shared_pool is None:
+                    cls._shared_pool = cls()
+
+        return cls._shared_pool
+
+    def acquire(self, _timeout: typing.Optional[float] = None) -> MiniJS:
+        """
+        Takes an idle `MiniJS` instance from the pool, or creates a new one if the pool is not full yet.
+
+        Blocks until an instance is released when all `max_size` instances are borrowed.
+
+        Args:
+            _timeout (float | None): Maximum number of seconds to wait, None to wait forever.
+
+        Returns:
+            MiniJS: Instance owned by the caller until `release()` is called.
+
+        Raises:
+            TimeoutError: If no instance became available within `_timeout`.
+        """
+
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.idle or self.created < self.max_size, timeout = _timeout):
+                raise TimeoutError("No MiniJS instance became available in time.")
+
+            if self.idle:
+                return self.idle.pop()
+
+            # Reserve the slot before leaving the lock, V8 isolate startup happens outside of it
+            self.created += 1
+
+        try:
+            mini_js: MiniJS = MiniJS()
+
+        except Exception:
+            with self.condition:
+                self.created -= 1
+                self.condition.notify()
+            raise
+
+        return mini_js
+
+    def release(self, _mini_js: MiniJS) -> None:
+        """
+        Resets the given instance and gives it back to the pool.
+
+        Instances that reached `max_uses` borrows are dropped, and a new one is created on demand.
+
+        Args:
+            _mini_js (MiniJS): Instance previously returned by `acquire()`.
+        """
+
+        _mini_js.reset()
+
+        with self.condition:
+            uses: int = self.uses.pop(id(_mini_js), 0) + 1
+
+            if self.max_uses is not None and uses >= self.max_uses:
+                self.created -= 1
+
+            else:
+                self.uses[id(_mini_js)] = uses
+                self.idle.append(_mini_js)
+
+            self.condition.notify()
+
+    @contextlib.contextmanager
+    def borrow(self, _timeout: typing.Optional[float] = None) -> typing.Iterator[MiniJS]:
+        """
+        Borrows a `MiniJS` instance for the duration of a `with` block.
+
+        Args:
+            _timeout (float | None): Maximum number of seconds to wait for an instance.
+
+        Yields:
+            MiniJS: Instance that is released back to the pool when the block exits.
+
+        Examples:
+        ```
+            >>> with MiniJSPool.get_shared_pool().borrow() as js:
+            >>>     js.deobfuscate_script("eval('2 + 2')")
+        ```
+        """
+
+        mini_js: MiniJS = self.acquire(_timeout = _timeout)
+
+        try:
+            yield mini_js
+
+        finally:
+            self.release(mini_js)
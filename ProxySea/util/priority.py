@@ -0,0 +1,56 @@
+from ..imports import typing
+
+from .proxy_tester import ProxyInfo
+
+
+# Higher scores are tested first
+ProxyScore = typing.Callable[[ProxyInfo], float]
+
+ANONYMITY_SCORES: dict[typing.Optional[str], float] = {"HIGH": 1.0, "MEDIUM": 0.5, "LOW": 0.0, None: 0.25}
+
+
+def score_by_uptime(_proxy: ProxyInfo) -> float:
+    """
+    Share of recorded results where the proxy worked (`ProxyInfo.uptime`), 0.5 without history.
+    """
+
+    return _proxy.uptime
+
+
+def score_by_anonymity(_proxy: ProxyInfo) -> float:
+    """
+    1 for HIGH anonymity, 0.5 for MEDIUM, 0 for LOW and 0.25 if it's unknown.
+    """
+
+    return ANONYMITY_SCORES.get(_proxy.anonymity_level, 0.25)
+
+
+def score_by_latency(_proxy: ProxyInfo) -> float:
+    """
+    1 / (1 + latency), from 1 for an instant proxy toward 0 for slow ones, 0 if it was never timed.
+    """
+
+    return 1.0 / (1.0 + _proxy.latency) if _proxy.latency is not None else 0.0
+
+
+def weighted_score(_weights: dict[ProxyScore, float]) -> ProxyScore:
+    """
+    Combines scores into one, as their weighted sum.
+
+    Examples:
+    ```
+        >>> score = weighted_score({score_by_uptime: 2.0, score_by_anonymity: 1.0, score_by_latency: 0.5})
+        >>> tested = await tester.test_proxies(proxies, _priority = score, _deadline = 30)
+    ```
+    """
+
+    weights: list[tuple[ProxyScore, float]] = list(_weights.items())
+
+    def score(_proxy: ProxyInfo) -> float:
+        return sum(function(_proxy) * weight for function, weight in weights)
+
+    return score
+
+
+# Past uptime first, anonymity and latency break ties between proxies with a similar history
+default_score: ProxyScore = weighted_score({score_by_uptime: 1.0, score_by_anonymity: 0.2, score_by_latency: 0.1})
@@ -0,0 +1,74 @@
+from ..imports import typing
+
+
+class ProbeEvent:
+    """
+    Structured record of a single scheme probe, passed to probe hooks.
+
+    A probe goes through the following phases, each timed separately (in seconds):
+        - "delay": stagger delay before the connection attempt.
+        - "connect": TCP connection (including the TLS handshake for HTTPS probes).
+        - "read": time from sending the handshake request until the response was read.
+        - "close": closing the connection.
+
+    Phases that were not reached are missing from `phases`. `failed_phase` tells which phase
+    raised the exception, so connect timeouts, refused connections, TLS failures and slow reads
+    can be told apart.
+
+    Attributes:
+        host (str): The hostname or IP address of the proxy.
+        port (int): The port number of the proxy.
+        scheme (str): The probed scheme ('HTTPS', 'HTTP', 'SOCKS5' or 'SOCKS4').
+        outcome (str): 'success', 'rejected' (invalid handshake response) or the exception class name.
+        exception (BaseException | None): The exception raised by the probe, or None.
+        failed_phase (str | None): The phase in which the exception was raised, or None.
+        phases (dict[str, float]): Duration of every reached phase.
+        started_at (float): `time.time()` at the beginning of the connection attempt.
+        duration (float): Total duration of the probe without the stagger delay.
+
+    Examples:
+    ```
+        >>> def on_probe(event: ProbeEvent) -> None:
+        >>>     print(event.scheme, event.outcome, event.failed_phase, event.phases)
+
+        >>> detector.add_probe_hook(on_probe)
+        >>> await detector.is_socks5("127.0.0.1", 1)
+        >>> SOCKS5 ConnectionRefusedError connect {'delay': 0.0, 'connect': 0.0003} # Result of the print
+    ```
+    """
+
+    __slots__ = ("host", "port", "scheme", "outcome", "exception", "failed_phase", "phases", "started_at", "duration")
+
+    def __init__(
+            self,
+            _host: str,
+            _port: int,
+            _scheme: str,
+            _outcome: str,
+            _exception: typing.Optional[BaseException],
+            _failed_phase: typing.Optional[str],
+            _phases: dict[str, float],
+            _started_at: float,
+            _duration: float
+        ) -> None:
+        self.host: str = _host
+        self.port: int = _port
+        self.scheme: str = _scheme
+        self.outcome: str = _outcome
+        self.exception: typing.Optional[BaseException] = _exception
+        self.failed_phase: typing.Optional[str] = _failed_phase
+        self.phases: dict[str, float] = _phases
+        self.started_at: float = _started_at
+        self.duration: float = _duration
+
+    @property
+    def is_success(self) -> bool:
+        return self.outcome == "success"
+
+    @property
+    def exception_class(self) -> typing.Optional[type]:
+        return type(self.exception) if self.exception is not None else None
+
+    def __str__(self) -> str:
+        phases: str = ", ".join(f"{phase}: {duration:.3f}s" for phase, duration in self.phases.items())
+        return f"[{self.scheme}] {self.host}:{self.port} {self.outcome} (Failed phase: {self.failed_phase}, {phases})"
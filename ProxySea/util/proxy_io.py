@@ -0,0 +1,282 @@
+from ..imports import mmap, csv, io, codecs, os, json, socket, asyncio, typing
+
+from ..metrics import DEAD_FILTER_SKIPS_TOTAL
+from .proxy_tester import ProxyInfo
+from .dead_filter import DeadEndpointFilter
+
+
+class ProxyListReader:
+    """
+    Lazily reads proxies from a text, NDJSON or CSV file.
+
+    The file is memory-mapped and decoded chunk by chunk, and proxies are yielded one at a time,
+    so reading a list with millions of lines never holds more than one `ProxyInfo` object (and one
+    chunk of the file) in memory. Duplicates are dropped on the fly: IPv4 proxies are remembered as
+    a single packed integer (address << 16 | port), other hosts by their id.
+
+    Supported formats:
+        - "text": one proxy per line, "scheme://host:port" or "host:port". Empty lines and
+          lines starting with "#" are skipped.
+        - "ndjson": one JSON object per line, with "host", "port" and optional "scheme" and
+          "anonymity_level" keys (the format written by `ProxyListWriter`).
+        - "csv": header row followed by one proxy per row, with the same columns as NDJSON.
+
+    Attributes:
+        path (str): Path of the file.
+        format (str): Format of the file ('text', 'ndjson' or 'csv').
+        dedup (bool): If True, duplicate proxies are skipped.
+        chunk_size (int): Number of bytes decoded at once.
+        dead_filter (DeadEndpointFilter | None): Proxies known dead by the filter are skipped.
+        skipped (int): Number of invalid lines skipped so far.
+        duplicates (int): Number of duplicate proxies skipped so far.
+        known_dead (int): Number of known-dead proxies skipped so far.
+
+    Examples:
+    ```
+        >>> for proxy in ProxyListReader("proxies.txt"):
+        >>>     print(proxy)
+
+        >>> async for proxy in ProxyListReader("proxies.ndjson").aiter():
+        >>>     ...
+    ```
+    """
+
+    FORMATS: dict[str, str] = {
+        ".txt": "text",
+        ".list": "text",
+        ".ndjson": "ndjson",
+        ".jsonl": "ndjson",
+        ".csv": "csv"
+    }
+
+    def __init__(
+            self,
+            _path: str,
+            _format: typing.Literal["auto", "text", "ndjson", "csv"] = "auto",
+            _dedup: bool = True,
+            _chunk_size: int = 1 << 20,
+            _dead_filter: typing.Optional[DeadEndpointFilter] = None
+        ) -> None:
+        if _format == "auto":
+            _format = self.FORMATS.get(os.path.splitext(_path)[1].lower(), "text")
+
+        if _format not in ["text", "ndjson", "csv"]:
+            raise ValueError(f"Unknown format: {_format}. Use one of them ['auto', 'text', 'ndjson', 'csv'].")
+
+        self.path: str = _path
+        self.format: str = _format
+        self.dedup: bool = _dedup
+        self.chunk_size: int = _chunk_size
+        self.dead_filter: typing.Optional[DeadEndpointFilter] = _dead_filter
+
+        self.skipped: int = 0
+        self.duplicates: int = 0
+        self.known_dead: int = 0
+
+        self.seen_packed: set[int] = set()
+        self.seen_ids: set[str] = set()
+
+    def iter_lines(self) -> typing.Iterator[str]:
+        with open(self.path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+
+            with mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ) as mapped:
+                # Multi-byte characters and "\r\n" pairs split between chunks are kept by the incremental decoder
+                decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("utf-8")(errors = "replace"), translate = True)
+                tail: str = ""
+
+                for offset in range(0, len(mapped), self.chunk_size):
+                    text: str = tail + decoder.decode(mapped[offset:offset + self.chunk_size])
+                    lines: list[str] = text.split("\n")
+                    tail = lines.pop()
+
+                    yield from lines
+
+                tail += decoder.decode(b"", final = True)
+
+                if tail:
+                    yield tail
+
+    def iter_records(self) -> typing.Iterator[dict]:
+        lines: typing.Iterator[str] = self.iter_lines()
+
+        if self.format == "csv":
+            yield from csv.DictReader(lines)
+            return
+
+        for line in lines:
+            line = line.strip()
+
+            if not line or line.startswith("#"):
+                continue
+
+            if self.format == "ndjson":
+                try:
+                    yield json.loads(line)
+
+                except ValueError:
+                    self.skipped += 1
+
+                continue
+
+            yield self.parse_text_line(line)
+
+    @staticmethod
+    def parse_text_line(_line: str) -> dict:
+        scheme: typing.Optional[str] = None
+
+        if "://" in _line:
+            scheme, _line = _line.split("://", 1)
+
+        host, _, port = _line.rpartition(":")
+        return {"scheme": scheme, "host": host, "port": port}
+
+    def is_duplicate(self, _host: str, _port: int) -> bool:
+        try:
+            key: int = int.from_bytes(socket.inet_aton(_host), "big") << 16 | _port
+            seen: set = self.seen_packed
+
+        except OSError:
+            key: str = f"{_host}|{_port}"
+            seen: set = self.seen_ids
+
+        if key in seen:
+            return True
+
+        seen.add(key)
+        return False
+
+    def __iter__(self) -> typing.Iterator[ProxyInfo]:
+        for record in self.iter_records():
+            try:
+                host: str = record["host"].strip()
+                port: int = int(record["port"])
+                scheme: typing.Optional[str] = record.get("scheme") or None
+                anonymity_level: typing.Optional[str] = record.get("anonymity_level") or None
+
+                if not host or not 0 < port < 65536:
+                    raise ValueError(f"Invalid address {host}:{port}")
+
+                if scheme and scheme.upper() not in ["HTTPS", "HTTP", "SOCKS5", "SOCKS4"]:
+                    raise ValueError(f"Invalid scheme {scheme}")
+
+            except (KeyError, TypeError, ValueError, AttributeError):
+                self.skipped += 1
+                continue
+
+            if self.dedup and self.is_duplicate(host, port):
+                self.duplicates += 1
+                continue
+
+            if self.dead_filter is not None and self.dead_filter.contains(host, port):
+                self.known_dead += 1
+                DEAD_FILTER_SKIPS_TOTAL.inc("read")
+                continue
+
+            yield ProxyInfo(
+                _scheme = scheme,
+                _host = host,
+                _port = port,
+                _anonymity_level = anonymity_level
+            )
+
+    async def aiter(self, _yield_every: int = 1000) -> typing.AsyncIterator[ProxyInfo]:
+        """
+        Yields proxies as an async iterator, e.g. for `ProvidersProxyTester.test_proxies_stream`.
+
+        Reading is synchronous, control is handed back to the event loop every `_yield_every` proxies.
+        """
+
+        for index, proxy in enumerate(self, 1):
+            yield proxy
+
+            if index % _yield_every == 0:
+                await asyncio.sleep(0)
+
+
+class ProxyListWriter:
+    """
+    Incrementally writes proxies to a text, NDJSON or CSV file.
+
+    Proxies are written as they are passed in (e.g. as tests complete), the file is flushed
+    every `flush_every` proxies and on close.
+
+    Attributes:
+        path (str): Path of the file.
+        format (str): Format of the file ('text', 'ndjson' or 'csv').
+        flush_every (int): Number of proxies written between flushes.
+        written (int): Number of proxies written so far.
+
+    Examples:
+    ```
+        >>> with ProxyListWriter("working.ndjson") as writer:
+        >>>     async for proxy in tester.test_proxies_stream(ProxyListReader("proxies.txt").aiter()):
+        >>>         if proxy.is_active:
+        >>>             writer.write(proxy)
+    ```
+    """
+
+    COLUMNS: list[str] = ["scheme", "host", "port", "anonymity_level", "is_active", "connection_retries"]
+
+    def __init__(
+            self,
+            _path: str,
+            _format: typing.Literal["auto", "text", "ndjson", "csv"] = "auto",
+            _flush_every: int = 1000,
+            _append: bool = False
+        ) -> None:
+        if _format == "auto":
+            _format = ProxyListReader.FORMATS.get(os.path.splitext(_path)[1].lower(), "text")
+
+        if _format not in ["text", "ndjson", "csv"]:
+            raise ValueError(f"Unknown format: {_format}. Use one of them ['auto', 'text', 'ndjson', 'csv'].")
+
+        self.path: str = _path
+        self.format: str = _format
+        self.flush_every: int = _flush_every
+        self.written: int = 0
+
+        self.file: typing.TextIO = open(_path, "a" if _append else "w", encoding = "utf-8", newline = "")
+        self.csv_writer = None
+
+        if self.format == "csv":
+            self.csv_writer = csv.writer(self.file, lineterminator = "\n")
+
+            if self.file.tell() == 0:
+                self.csv_writer.writerow(self.COLUMNS)
+
+    def __enter__(self) -> "ProxyListWriter":
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.close()
+
+    def write(self, _proxy: ProxyInfo) -> None:
+        if self.format == "text":
+            self.file.write((_proxy.url if _proxy.scheme else f"{_proxy.host}:{_proxy.port}") + "\n")
+
+        elif self.format == "ndjson":
+            self.file.write(json.dumps(self.to_record(_proxy), separators = (",", ":")) + "\n")
+
+        else:
+            self.csv_writer.writerow(self.to_record(_proxy).values())
+
+        self.written += 1
+
+        if self.written % self.flush_every == 0:
+            self.file.flush()
+
+    def write_many(self, _proxies: typing.Iterable[ProxyInfo]) -> None:
+        for proxy in _proxies:
+            self.write(proxy)
+
+    def to_record(self, _proxy: ProxyInfo) -> dict:
+        return {column: getattr(_proxy, column) for column in self.COLUMNS}
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.file.close()
@@ -4,6 +4,9 @@ from ..imports import typing
 # Logger imports
 from ..logger import Logger
 
+# Metrics imports
+from ..metrics import PROVIDER_FETCHES_TOTAL, PROVIDER_FETCH_DURATION
+
 # Util imports
 from .http_client import HttpClient
 
@@ -64,7 +67,8 @@ class ProxyProvider:
         # Create the Logger instance, for easier logging.
         self.logger: Logger = Logger(
             _logger_name = f"ProxyProvider [{self.domain}]",
-            _debug = self.debug
+            _debug = self.debug,
+            _background = True
         )
 
         # Create the HttpClient instance, for easier page downloading.
@@ -89,17 +93,22 @@ class ProxyProvider:
         """
         
         res: typing.Optional[str | dict] = None
+        outcome: str = "empty"
 
         try:
-            res = await self.http_client.get(_url = self.url)
+            with PROVIDER_FETCH_DURATION.time(self.domain):
+                res = await self.http_client.get(_url = self.url)
 
         except Exception as e:
-            self.logger.log(f"Exception during fetching page: {e}")
+            outcome = type(e).__name__
+            self.logger.log("Exception during fetching page: {}", e, _level = "WARNING")
+
+        PROVIDER_FETCHES_TOTAL.inc(self.domain, "success" if res else outcome)
 
         if res:
-            self.logger.log(f"Fetched page successfully.")
+            self.logger.log("Fetched page successfully.", url = self.url)
 
         else:
-            self.logger.log(f"Something went wrong while fetching page.")
+            self.logger.log("Something went wrong while fetching page.", url = self.url, _level = "WARNING")
 
         return res
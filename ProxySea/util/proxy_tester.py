@@ -1,7 +1,12 @@
 from ..imports import typing, asyncio, time, ssl
 
 from ..logger import Logger
+from ..metrics import PROBES_TOTAL, PROBE_DURATION, SCHEME_DETECTION_PROBES
 from .aio import AIOBase
+from .probe_event import ProbeEvent
+from .timer_wheel import TimerWheel
+from .socket_profile import SocketProfile
+from .scheme_priors import SchemePriors
 
 
 class ProxyInfo:
@@ -25,20 +30,49 @@ class ProxyInfo:
             Port number of the proxy.
         anonymity_level (str | None):
             Proxy anonymity classification ('HIGH', 'MEDIUM', 'LOW'), or None.
+        country (str | None):
+            ISO country code of the proxy's address, set by `GeoIPIndex.enrich`, or None.
+        asn (int | None):
+            Autonomous system number of the proxy's address, set by `GeoIPIndex.enrich`, or None.
+        provider (str | None):
+            Domain of the provider that listed the proxy, set by `ProvidersManager.fetch_proxies`, or None.
         is_active (bool):
             Whether the proxy is currently marked as active.
+        is_tested (bool):
+            Whether the last test round produced a result for the proxy. False while it's being
+            tested, and after a round whose deadline cancelled its test.
         connection_retries (int):
-            Number of failed connection attempts.
+            Number of consecutive failed connection attempts.
+        successes (int):
+            Recorded results (tests or real requests) where the proxy worked.
+        failures (int):
+            Recorded results where the proxy failed.
+        latency (float | None):
+            Seconds the last successful connection check took, or None. Only checks of a known
+            scheme are timed, detection runs staggered probes and would include their delays.
         blacklist_after (int):
-            Retry threshold after which the proxy is considered blacklisted.
+            Consecutive failures after which the circuit opens and the proxy is considered blacklisted.
+        backoff (float):
+            Seconds the circuit stays open after it opens for the first time.
+        max_backoff (float):
+            Upper bound of the open period, which doubles every time a re-probe fails.
+        circuit_trips (int):
+            Number of times the circuit opened since the proxy last worked.
+        open_until (float):
+            `time.monotonic()` until which the circuit stays open.
 
     Properties:
         id (str):
             Unique proxy identifier, formatted as "HOST|PORT".
         url (str):
             Full proxy address, formatted as "SCHEME://HOST:PORT".
+        circuit_state (str):
+            'CLOSED' (working or below the failure threshold), 'OPEN' (skipped until the backoff
+            elapses) or 'HALF_OPEN' (backoff elapsed, the next test decides).
         is_blacklisted (bool):
-            True if retry threshold exceeded.
+            True while the circuit is open.
+        uptime (float):
+            Share of recorded results where the proxy worked, smoothed toward 0.5 while there are few.
 
     Methods:
         set_proxy_scheme(_scheme):
@@ -48,8 +82,12 @@ class ProxyInfo:
             Sets the active status. Requires a boolean.
 
         update_connection_retries():
-            Increments retry count if inactive, resets if active.
-            No changes occur if proxy is blacklisted.
+            Records the result of the last test in the circuit breaker.
+            Resets it if active, counts the failure (and opens the circuit with
+            exponential backoff) if inactive. No changes occur while the circuit is open.
+
+        report_result(_success):
+            Sets the active state and records it, e.g. for results of real requests.
 
     Examples:
     ```
@@ -78,7 +116,10 @@ class ProxyInfo:
             _scheme: typing.Literal["HTTPS", "HTTP", "SOCKS5", "SOCKS4"] | None,
             _host: str,
             _port: int,
-            _anonymity_level: typing.Literal["HIGH", "MEDIUM", "LOW"] | None = None
+            _anonymity_level: typing.Literal["HIGH", "MEDIUM", "LOW"] | None = None,
+            _blacklist_after: int = 3,
+            _backoff: float = 60.0,
+            _max_backoff: float = 3600.0
         ) -> None:
         """
         Initializes a ProxyInfo instance with protocol, host, port, and anonymity level.
@@ -95,6 +136,12 @@ class ProxyInfo:
                 Port number of the proxy.
             _anonymity_level (Literal["HIGH", "MEDIUM", "LOW"] | None):
                 Level of anonymity provided by the proxy. Can be None if unknown.
+            _blacklist_after (int):
+                Consecutive failures after which the circuit opens. Defaults to 3.
+            _backoff (float):
+                Seconds the circuit stays open the first time it opens. Defaults to 60.
+            _max_backoff (float):
+                Upper bound (in seconds) of the exponentially growing open period. Defaults to 3600.
 
         Examples:
         ```
@@ -107,9 +154,28 @@ class ProxyInfo:
         self.port: int = int(_port)
         self.anonymity_level: typing.Optional[str] = _anonymity_level.upper() if _anonymity_level else _anonymity_level
 
+        # Geolocation metadata, filled in by GeoIPIndex.enrich()
+        self.country: typing.Optional[str] = None
+        self.asn: typing.Optional[int] = None
+
+        # Where the proxy was listed, scheme priors learn per provider
+        self.provider: typing.Optional[str] = None
+
         self.is_active: bool = False
+        self.is_tested: bool = False
         self.connection_retries: int = 0
-        self.blacklist_after: int = 3
+        self.blacklist_after: int = _blacklist_after
+
+        # History, used to score proxies (see ProxySea.util.priority)
+        self.successes: int = 0
+        self.failures: int = 0
+        self.latency: typing.Optional[float] = None
+
+        # Circuit breaker state
+        self.backoff: float = _backoff
+        self.max_backoff: float = _max_backoff
+        self.circuit_trips: int = 0
+        self.open_until: float = 0.0
 
 
     @property
@@ -154,25 +220,79 @@ class ProxyInfo:
 
         return f"{self.scheme}://{self.host}:{self.port}"
 
+    @property
+    def circuit_state(self) -> str:
+        """
+        Returns the state of the proxy's circuit breaker.
+
+        Returns:
+            str:
+                - 'CLOSED' if the proxy works or failed less than `blacklist_after` times in a row.
+                - 'OPEN' if the proxy failed too often and its backoff did not elapse yet.
+                - 'HALF_OPEN' if the backoff elapsed, the next test closes or re-opens the circuit.
+
+        Examples:
+        ```
+            >>> proxy = ProxyInfo("HTTP", "192.168.0.1", 8080, _blacklist_after = 1)
+            >>> proxy.report_result(False)
+            >>> print(proxy.circuit_state)
+            >>> OPEN # Result of the print
+        ```
+        """
+
+        if self.connection_retries < self.blacklist_after:
+            return "CLOSED"
+
+        if time.monotonic() < self.open_until:
+            return "OPEN"
+
+        return "HALF_OPEN"
+
+    @property
+    def uptime(self) -> float:
+        """
+        Returns the share of recorded results where the proxy worked.
+
+        Laplace-smoothed, a proxy without history has an uptime of 0.5, one that worked once 0.67.
+
+        Examples:
+        ```
+            >>> proxy = ProxyInfo("HTTP", "192.168.0.1", 8080)
+            >>> proxy.report_result(True)
+            >>> proxy.report_result(True)
+            >>> proxy.report_result(False)
+            >>> print(proxy.uptime)
+            >>> 0.6 # Result of the print
+        ```
+        """
+
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
     @property
     def is_blacklisted(self) -> bool:
         """
-        Indicates if the proxy is blacklisted based on connection retries.
+        Indicates if the proxy is blacklisted, i.e. its circuit is open.
+
+        A blacklisted proxy is skipped by the tester until its backoff elapses. It is then
+        re-probed once (half-open) and either comes back or stays blacklisted for twice as long.
 
         Returns:
             bool:
-                True if `connection_retries` exceeds `blacklist_after`, else False.
+                True if the circuit is open, else False.
 
         Examples:
         ```
             >>> proxy = ProxyInfo("HTTP", "192.168.0.1", 8080)
-            >>> proxy.connection_retries = 4
+
+            >>> for _ in range(3):
+            >>>     proxy.report_result(False)
+
             >>> print(proxy.is_blacklisted)
             >>> True # Result of the print
         ```
         """
 
-        return self.connection_retries >= self.blacklist_after
+        return self.circuit_state == "OPEN"
 
 
     def set_proxy_scheme(self, _scheme: typing.Literal["HTTPS", "HTTP", "SOCKS5", "SOCKS4"]) -> None:
@@ -228,12 +348,14 @@ class ProxyInfo:
 
     def update_connection_retries(self) -> None:
         """
-        Updates the retry counter based on the proxy's current activity state.
+        Updates the circuit breaker based on the proxy's current activity state.
 
         Logic:
-            - If the proxy is blacklisted (`is_blacklisted` is True), the method does nothing.
+            - If the proxy is blacklisted (the circuit is open), the method does nothing.
             - If the proxy is inactive (`is_active` is False), the retry counter is incremented.
-            - If the proxy is active, the retry counter is reset to 0.
+              Reaching `blacklist_after` (or failing a half-open re-probe) opens the circuit for
+              `backoff` * 2 ** (trips - 1) seconds, capped at `max_backoff`.
+            - If the proxy is active, the retry counter and the backoff are reset (circuit closed).
 
         This method is used to automatically track the reliability of a proxy during
         connection attempts.
@@ -249,15 +371,45 @@ class ProxyInfo:
         ```
         """
 
-        
+
         if self.is_blacklisted:
             return None
 
         if not self.is_active:
+            self.failures += 1
             self.connection_retries += 1
+
+            if self.connection_retries >= self.blacklist_after:
+                self.circuit_trips += 1
+                self.open_until = time.monotonic() + min(self.max_backoff, self.backoff * 2 ** (self.circuit_trips - 1))
+
             return None
 
+        self.successes += 1
         self.connection_retries = 0
+        self.circuit_trips = 0
+        self.open_until = 0.0
+
+
+    def report_result(self, _success: bool) -> None:
+        """
+        Records the outcome of a test or of a real request sent through the proxy.
+
+        Args:
+            _success (bool):
+                True if the proxy worked, False if the connection failed.
+
+        Examples:
+        ```
+            >>> proxy = ProxyInfo("HTTP", "10.0.0.5", 8080)
+            >>> proxy.report_result(False)
+            >>> print(proxy.connection_retries)
+            >>> 1 # Result of the print
+        ```
+        """
+
+        self.set_is_active(_active = _success)
+        self.update_connection_retries()
 
 
     def __str__(self) -> str:
@@ -275,8 +427,15 @@ class ProxySchemeDetector:
     Attributes:
         debug (bool): If True, enables debug-level logging for proxy detection steps.
         connection_timeout (int): Timeout (in seconds) for individual connection attempts.
+        connect_timeout (float): Timeout (in seconds) for the connect phase of a probe.
+        read_timeout (float): Timeout (in seconds) for reading the handshake response of a probe.
         PROXY_SCHEMES (list[str]): List of proxy schemes to test against.
         logger (Logger): Logger instance used for debug and status output.
+        probe_hooks (list[Callable[[ProbeEvent], None]]): Callbacks receiving a `ProbeEvent` after every probe.
+        timer_wheel (TimerWheel | None): Shared wheel expiring the connect and read timeouts of all probes.
+            If None (the default before Python 3.11), every operation gets its own `asyncio.wait_for()`.
+        socket_profile (SocketProfile | None): Socket options of probe connections, None uses asyncio's defaults.
+        probe_stagger (float): Seconds an ordered detection waits for a probe before starting the next one.
 
     Methods:
         is_socks4 (_host, _port, _delay):
@@ -293,6 +452,15 @@ class ProxySchemeDetector:
 
         detect_proxy_scheme_parallel(_host, _port):
             Attempt all scheme detections in parallel and return the first valid one.
+
+        detect_proxy_scheme_ordered(_host, _port, _order):
+            Probe schemes one after another in the given order, stopping at the first valid one.
+
+        add_probe_hook(_hook):
+            Register a callback receiving a structured `ProbeEvent` after every probe.
+
+        remove_probe_hook(_hook):
+            Unregister a probe hook.
     
     Examples:
     ```
@@ -305,10 +473,25 @@ class ProxySchemeDetector:
     """
 
 
+    # Minimal SOCKS4 CONNECT request to example.com:80 (SOCKS4a form)
+    SOCKS4_REQUEST: bytes = b"\x04\x01" + (80).to_bytes(2, 'big') + b"\x00\x00\x00\x01" + b"example.com\x00"
+
+    HTTP_REQUEST: bytes = (
+        "GET http://example.com/ HTTP/1.1\r\n"
+        "Host: example.com\r\n"
+        "User-Agent: ProxySea/1.0\r\n"
+        "Connection: close\r\n"
+        "\r\n"
+    ).encode("ascii")
+
+
     def __init__(
             self,
             _connection_timeout: int = 3,
-            _debug: bool = False
+            _debug: bool = False,
+            _connect_timeout: typing.Optional[float] = None,
+            _read_timeout: typing.Optional[float] = None,
+            _socket_profile: typing.Optional[SocketProfile] = None
         ) -> None:
         """
         Initializes the ProxySchemeDetector instance with connection and logging settings.
@@ -321,6 +504,12 @@ class ProxySchemeDetector:
                 Timeout value (in seconds) for each individual connection attempt.
             _debug (bool):
                 If True, enables debug logging output for internal events and detection status.
+            _connect_timeout (float | None):
+                Timeout (in seconds) for the connect phase. Defaults to `_connection_timeout`.
+            _read_timeout (float | None):
+                Timeout (in seconds) for reading the handshake response. Defaults to `_connection_timeout`.
+            _socket_profile (SocketProfile | None):
+                Socket options (linger, nodelay, buffers, source addresses) of probe connections.
 
         Returns:
             None
@@ -336,15 +525,37 @@ class ProxySchemeDetector:
 
         # Connection information
         self.connection_timeout: int = _connection_timeout
+        self.connect_timeout: float = _connect_timeout if _connect_timeout is not None else _connection_timeout
+        self.read_timeout: float = _read_timeout if _read_timeout is not None else _connection_timeout
 
         # Basic informations
         self.PROXY_SCHEMES: list[str] = ["HTTPS", "HTTP", "SOCKS5", "SOCKS4"]
 
+        # Callbacks receiving a ProbeEvent after every probe
+        self.probe_hooks: list[typing.Callable[[ProbeEvent], None]] = []
+
+        # Shared by all HTTPS probes. Certificates are not verified, so the CA store is never loaded,
+        # ssl.create_default_context() would load it (tens of milliseconds) on every probe.
+        self.ssl_context: ssl.SSLContext = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        self.ssl_context.check_hostname = False
+        self.ssl_context.verify_mode = ssl.CERT_NONE
+
+
+        # One loop timer for the timeouts of every probe, instead of one per operation (Python 3.11+)
+        self.timer_wheel: typing.Optional[TimerWheel] = TimerWheel() if TimerWheel.SUPPORTED else None
+
+        # Mass probing closes with a reset and spreads over source addresses, so it doesn't run out of ports
+        self.socket_profile: typing.Optional[SocketProfile] = _socket_profile
+
+        # Ordered detections start the next probe when the current one failed, or after this long
+        self.probe_stagger: float = 0.5
+
 
         # Create the logger instance
         self.logger: Logger = Logger(
             _logger_name = "ProxyScheme",
-            _debug = self.debug
+            _debug = self.debug,
+            _background = True
         )
 
 
@@ -353,7 +564,7 @@ class ProxySchemeDetector:
         Checks if the proxy server supports the SOCKS4 protocol.
 
         It sends a minimal SOCKS4 connection request and checks if the response
-        matches the expected success byte (0x5A), indicating a valid SOCKS4 server.
+        carries the expected success status (0x5A), indicating a valid SOCKS4 server.
 
         Args:
             _host (str):
@@ -376,40 +587,16 @@ class ProxySchemeDetector:
         ```
         """
         
-        is_alive: bool = False
-
-        self.logger.log(f"Delaying SOCKS4 request ({_host}:{_port}) for {_delay_before_request} seconds.")
-        await asyncio.sleep(delay = _delay_before_request)
-
-        try:
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(_host, _port),
-                timeout = self.connection_timeout
-            )
-
-            port_bytes = (80).to_bytes(2, 'big')
-            ip_bytes = b"\x00\x00\x00\x01"
-
-            user = b""
-            domain = b"example.com\x00"
-            request = b"\x04\x01" + port_bytes + ip_bytes + user + domain
-
-            writer.write(request)
-            resp = await asyncio.wait_for(
-                reader.read(8),
-                timeout = self.connection_timeout
-            )
-
-            writer.close()
-            await writer.wait_closed()
-
-            # is_alive = bool(resp and resp[0] == 0x00)
-            is_alive = bool(resp and resp[0] == 0x5A)
-
-        except Exception:
-            pass
-
-        return is_alive
+        return await self.probe(
+            _scheme = "SOCKS4",
+            _host = _host,
+            _port = _port,
+            _delay_before_request = _delay_before_request,
+            _request = self.SOCKS4_REQUEST,
+            _read_size = 8,
+            # The reply starts with a null version byte, followed by the status (0x5A = request granted)
+            _validator = lambda resp: bool(len(resp) >= 2 and resp[1] == 0x5A)
+        )
 
 
     async def is_socks5(self, _host: str, _port: int, _delay_before_request: float = 0.0) -> bool:
@@ -440,32 +627,15 @@ class ProxySchemeDetector:
         ```
         """
 
-        is_alive: bool = False
-
-        self.logger.log(f"Delaying SOCKS5 request ({_host}:{_port}) for {_delay_before_request} seconds.")
-        await asyncio.sleep(delay = _delay_before_request)
-
-        try:
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(_host, _port),
-                timeout = self.connection_timeout
-            )
-            
-            writer.write(b"\x05\x01\x00")
-            resp = await asyncio.wait_for(
-                reader.read(10),
-                timeout = self.connection_timeout
-            )
-            
-            writer.close()
-            await writer.wait_closed()
-
-            is_alive = bool(resp and resp[0] == 0x05)
-
-        except Exception:
-            pass
-
-        return is_alive
+        return await self.probe(
+            _scheme = "SOCKS5",
+            _host = _host,
+            _port = _port,
+            _delay_before_request = _delay_before_request,
+            _request = b"\x05\x01\x00",
+            _read_size = 10,
+            _validator = lambda resp: bool(resp and resp[0] == 0x05)
+        )
 
 
     # MAIN SOLUTION
@@ -499,7 +669,7 @@ class ProxySchemeDetector:
 
         is_alive: bool = False
 
-        self.logger.log(f"Delaying HTTP request ({_host}:{_port}) for {_delay_before_request} seconds.")
+        self.logger.log("Delaying HTTP request ({}:{}) for {} seconds.", _host, _port, _delay_before_request)
         await asyncio.sleep(delay = _delay_before_request)
 
         try:
@@ -544,66 +714,48 @@ class ProxySchemeDetector:
 
     # TESTING SOLUTION
     async def is_http(self, _host: str, _port: int, _delay_before_request: float = 0.0) -> bool:
-        is_alive = False
-        self.logger.log(f"Delaying HTTP request ({_host}:{_port}) for {_delay_before_request} seconds.")
-        await asyncio.sleep(delay=_delay_before_request)
-
-        try:
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(_host, _port),
-                timeout=self.connection_timeout
-            )
-
-            http_req = (
-                "GET http://example.com/ HTTP/1.1\r\n"
-                "Host: example.com\r\n"
-                "User-Agent: ProxySea/1.0\r\n"
-                "Connection: close\r\n"
-                "\r\n"
-            )
-            writer.write(http_req.encode("ascii"))
-
-            resp = await asyncio.wait_for(reader.read(2048), timeout=self.connection_timeout)
-
-            writer.close()
-            await writer.wait_closed()
-
-            if not resp or not resp.startswith(b"HTTP/"):
-                return False
-
-            try:
-                header_data = resp.decode("latin1", errors="ignore").split("\r\n\r\n")[0]
-            except Exception:
-                return False
+        return await self.probe(
+            _scheme = "HTTP",
+            _host = _host,
+            _port = _port,
+            _delay_before_request = _delay_before_request,
+            _request = self.HTTP_REQUEST,
+            _read_size = 2048,
+            _validator = self.is_valid_http_response
+        )
 
-            lines = header_data.split("\r\n")
-            status_line = lines[0]
-            headers = {k.lower(): v.strip() for k, v in [
-                line.split(":", 1) for line in lines[1:] if ":" in line
-            ]}
+    @staticmethod
+    def is_valid_http_response(_resp: bytes) -> bool:
+        if not _resp or not _resp.startswith(b"HTTP/"):
+            return False
 
-            parts = status_line.split(" ")
-            if len(parts) < 2 or not parts[1].isdigit():
-                return False
+        try:
+            header_data = _resp.decode("latin1", errors="ignore").split("\r\n\r\n")[0]
+        except Exception:
+            return False
 
-            status_code = int(parts[1])
+        lines = header_data.split("\r\n")
+        status_line = lines[0]
+        headers = {k.lower(): v.strip() for k, v in [
+            line.split(":", 1) for line in lines[1:] if ":" in line
+        ]}
 
-            # Accept only 2xx or 3xx responses
-            if status_code < 200 or status_code >= 400:
-                return False
+        parts = status_line.split(" ")
+        if len(parts) < 2 or not parts[1].isdigit():
+            return False
 
-            # Reject proxy auth and common failure codes
-            if "proxy-authenticate" in headers or status_code in {403, 407, 500, 502, 503}:
-                return False
+        status_code = int(parts[1])
 
-            # No assumptions based on missing "Via" or "X-Forwarded-For"
-            is_alive = True
+        # Accept only 2xx or 3xx responses
+        if status_code < 200 or status_code >= 400:
+            return False
 
-        except Exception as e:
-            if self.debug:
-                self.logger.log(f"HTTP proxy detection error on {_host}:{_port} → {type(e).__name__}: {e}")
+        # Reject proxy auth and common failure codes
+        if "proxy-authenticate" in headers or status_code in {403, 407, 500, 502, 503}:
+            return False
 
-        return is_alive
+        # No assumptions based on missing "Via" or "X-Forwarded-For"
+        return True
 
 
     # Detect whether the scheme of proxy is HTTPS
@@ -635,33 +787,206 @@ class ProxySchemeDetector:
         ```
         """
 
-        is_alive: bool = False
+        # A completed TLS handshake is enough, nothing is sent after connecting
+        return await self.probe(
+            _scheme = "HTTPS",
+            _host = _host,
+            _port = _port,
+            _delay_before_request = _delay_before_request,
+            _ssl = self.ssl_context
+        )
+
+    async def wait_for(self, _awaitable: typing.Awaitable, _timeout: typing.Optional[float]) -> typing.Any:
+        """
+        Awaits `_awaitable`, raising `asyncio.TimeoutError` after `_timeout` seconds.
+
+        Uses the shared timer wheel when there is one, `asyncio.wait_for()` otherwise.
+        """
+
+        if self.timer_wheel is None:
+            return await asyncio.wait_for(_awaitable, timeout = _timeout)
+
+        async with self.timer_wheel.timeout(_timeout):
+            return await _awaitable
+
+
+    def open_connection(
+            self,
+            _host: str,
+            _port: int,
+            _ssl: typing.Optional[ssl.SSLContext] = None
+        ) -> typing.Awaitable[tuple[asyncio.StreamReader, asyncio.StreamWriter]]:
+        if self.socket_profile is None:
+            return asyncio.open_connection(_host, _port, ssl = _ssl)
+
+        return self.socket_profile.open_connection(_host, _port, _ssl)
+
+
+    async def probe(
+            self,
+            _scheme: str,
+            _host: str,
+            _port: int,
+            _delay_before_request: float = 0.0,
+            _request: typing.Optional[bytes] = None,
+            _read_size: int = 0,
+            _validator: typing.Optional[typing.Callable[[bytes], bool]] = None,
+            _ssl: typing.Optional[ssl.SSLContext] = None
+        ) -> bool:
+        """
+        Runs a single scheme probe: connects, sends the handshake request and validates the response.
+
+        Every phase (delay, connect, read, close) is timed. The outcome and duration are recorded
+        as metrics, and a `ProbeEvent` is passed to every registered probe hook. When no hook is
+        registered, no event is created.
+
+        Args:
+            _scheme (str):
+                The probed scheme, used for logging, metrics and probe events.
+            _host (str):
+                The hostname or IP address of the proxy.
+            _port (int):
+                The port number on which the proxy is running.
+            _delay_before_request (float):
+                Optional delay (in seconds) before attempting the connection.
+            _request (bytes | None):
+                Handshake request sent after connecting. If None, a successful connection is enough.
+            _read_size (int):
+                Maximum number of bytes read as the handshake response.
+            _validator (Callable[[bytes], bool] | None):
+                Returns True if the handshake response is valid for the probed scheme.
+            _ssl (ssl.SSLContext | None):
+                SSL context used to wrap the connection, or None for plain TCP.
 
-        self.logger.log(f"Delaying HTTPS request ({_host}:{_port}) for {_delay_before_request} seconds.")
+        Returns:
+            bool:
+                - True if the proxy completed the handshake.
+                - False if something went wrong.
+        """
+
+        self.logger.log("Delaying {} request ({}:{}) for {} seconds.", _scheme, _host, _port, _delay_before_request)
+
+        mark: float = time.perf_counter()
         await asyncio.sleep(delay = _delay_before_request)
 
-        try:
+        start: float = time.perf_counter()
+        phases: dict[str, float] = {"delay": start - mark}
+        phase: str = "connect"
 
-            context = ssl.create_default_context()
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
+        is_alive: bool = False
+        exception: typing.Optional[BaseException] = None
+        writer: typing.Optional[asyncio.StreamWriter] = None
 
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(_host, _port, ssl=context),
-                timeout = self.connection_timeout
+        try:
+            reader, writer = await self.wait_for(
+                self.open_connection(_host, _port, _ssl),
+                self.connect_timeout
             )
 
+            mark = time.perf_counter()
+            phases["connect"] = mark - start
+
+            if _request is None:
+                is_alive = True
+
+            else:
+                phase = "read"
+
+                writer.write(_request)
+                resp = await self.wait_for(
+                    reader.read(_read_size),
+                    self.read_timeout
+                )
+
+                now: float = time.perf_counter()
+                phases["read"] = now - mark
+                mark = now
+
+                is_alive = bool(_validator(resp))
+
+            phase = "close"
+
             writer.close()
             await writer.wait_closed()
 
-            is_alive: bool = True
+            phases["close"] = time.perf_counter() - mark
 
-        except Exception:
-            pass
+        except Exception as e:
+            exception = e
+            self.logger.log("{} proxy detection error on {}:{} in {} phase → {}: {}", _scheme, _host, _port, phase, type(e).__name__, e)
+
+        finally:
+            # Make sure the socket is released when the probe failed or was cancelled before closing it
+            if writer is not None and phase != "close":
+                writer.close()
+
+        duration: float = time.perf_counter() - start
+        outcome: str = "success" if is_alive else (type(exception).__name__ if exception is not None else "rejected")
+
+        PROBES_TOTAL.inc(_scheme, outcome)
+        PROBE_DURATION.observe(duration, _scheme)
+
+        if self.probe_hooks:
+            self.emit_probe_event(
+                ProbeEvent(
+                    _host = _host,
+                    _port = _port,
+                    _scheme = _scheme,
+                    _outcome = outcome,
+                    _exception = exception,
+                    _failed_phase = phase if exception is not None else None,
+                    _phases = phases,
+                    _started_at = time.time() - duration,
+                    _duration = duration
+                )
+            )
 
         return is_alive
 
 
+    def add_probe_hook(self, _hook: typing.Callable[[ProbeEvent], None]) -> None:
+        """
+        Registers a callback that receives a `ProbeEvent` after every scheme probe.
+
+        Hooks are called synchronously on the event loop, so they should be fast (e.g. append
+        the event to a list or a queue). Exceptions raised by hooks are logged and ignored.
+
+        Args:
+            _hook (Callable[[ProbeEvent], None]):
+                Callback receiving the probe event.
+
+        Examples:
+        ```
+            >>> events: list[ProbeEvent] = []
+            >>> detector.add_probe_hook(events.append)
+        ```
+        """
+
+        self.probe_hooks.append(_hook)
+
+
+    def remove_probe_hook(self, _hook: typing.Callable[[ProbeEvent], None]) -> None:
+        """
+        Unregisters a callback previously registered with `add_probe_hook()`.
+
+        Args:
+            _hook (Callable[[ProbeEvent], None]):
+                Callback to remove.
+        """
+
+        if _hook in self.probe_hooks:
+            self.probe_hooks.remove(_hook)
+
+
+    def emit_probe_event(self, _event: ProbeEvent) -> None:
+        for hook in list(self.probe_hooks):
+            try:
+                hook(_event)
+
+            except Exception as e:
+                self.logger.log("Probe hook {} failed → {}: {}", hook, type(e).__name__, e, _level = "WARNING")
+
+
     # Detect proxy scheme in parallel
     async def detect_proxy_scheme_parallel(self, _host: str, _port: int) -> typing.Optional[str]:
         """
@@ -699,17 +1024,97 @@ class ProxySchemeDetector:
         results = await aio.run_tasks()
     
         for result, proxy_scheme in zip(results, self.PROXY_SCHEMES):
-            self.logger.log(f"{result}, {proxy_scheme}")
+            self.logger.log("{}, {}", result, proxy_scheme)
 
             if not result:
                 continue
 
-            self.logger.log(f"({_host}:{_port}) is scheme of {proxy_scheme} proxy.")
+            self.logger.log("({}:{}) is scheme of {} proxy.", _host, _port, proxy_scheme)
             return proxy_scheme
 
         return None
 
 
+    async def detect_proxy_scheme_ordered(
+            self,
+            _host: str,
+            _port: int,
+            _order: typing.Optional[list[str]] = None
+        ) -> tuple[typing.Optional[str], int]:
+        """
+        Attempts to detect the proxy's scheme by probing the schemes in order of likelihood.
+
+        The first scheme is probed right away. The next one starts as soon as the running probes
+        failed, or after `probe_stagger` seconds without an answer, so a slow proxy doesn't hold
+        the detection back. The first valid handshake wins and the other probes are cancelled.
+        With a good order (see `SchemePriors`), most proxies need a single probe.
+
+        If several probes succeed at once, the one earliest in `_order` wins.
+
+        Args:
+            _host (str):
+                The hostname or IP address of the proxy.
+            _port (int):
+                The port number on which the proxy is running.
+            _order (list[str] | None):
+                Schemes to probe, most likely first. Defaults to `PROXY_SCHEMES`.
+
+        Returns:
+            tuple[str | None, int]:
+                - The detected scheme, or None if none matched.
+                - The number of probes started.
+
+        Examples:
+        ```
+            >>> scheme, probes = await detector.detect_proxy_scheme_ordered("127.0.0.1", 1080, ["SOCKS5", "SOCKS4", "HTTP", "HTTPS"])
+            >>> print(scheme, probes)
+            >>> SOCKS5 1  # Result of the print
+        ```
+        """
+
+        order: list[str] = _order or self.PROXY_SCHEMES
+
+        detectors: dict[str, typing.Callable[[str, int], typing.Awaitable[bool]]] = {
+            "HTTPS": self.is_https,
+            "HTTP": self.is_http,
+            "SOCKS5": self.is_socks5,
+            "SOCKS4": self.is_socks4
+        }
+
+        schemes: dict[asyncio.Task, str] = {}
+        pending: set[asyncio.Task] = set()
+
+        try:
+            while len(schemes) < len(order) or pending:
+                if len(schemes) < len(order):
+                    scheme: str = order[len(schemes)]
+                    task: asyncio.Task = asyncio.create_task(detectors[scheme](_host, _port))
+
+                    schemes[task] = scheme
+                    pending.add(task)
+
+                # Once every probe runs, wait for them to finish
+                timeout: typing.Optional[float] = self.probe_stagger if len(schemes) < len(order) else None
+                done, pending = await asyncio.wait(pending, timeout = timeout, return_when = asyncio.FIRST_COMPLETED)
+
+                detected: list[str] = [schemes[task] for task in done if task.result()]
+
+                if detected:
+                    proxy_scheme: str = min(detected, key = order.index)
+                    self.logger.log("({}:{}) is scheme of {} proxy, after {} probes.", _host, _port, proxy_scheme, len(schemes))
+
+                    return proxy_scheme, len(schemes)
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+            # probe() closes the socket of a cancelled probe, wait for it
+            await asyncio.gather(*pending, return_exceptions = True)
+
+        return None, len(schemes)
+
+
 # Proxy tester class, used for testing a proxy.
 class ProxyTester:
     """
@@ -719,15 +1124,23 @@ class ProxyTester:
         debug (bool): Enables debug logging if set to True.
         connection_timeout (int): Timeout for connection attempts in seconds.
         proxy_scheme_detector (ProxySchemeDetector): Tool for detecting proxy schemes (SOCKS4/5, HTTP/HTTPS).
+        scheme_priors (SchemePriors | None): Learned scheme probabilities. If set, detection probes the
+            schemes in order of likelihood and stops at the first valid one, instead of probing all of them.
         logger (Logger): Logger instance for outputting debug/info messages.
 
     Methods:
         check_connection(_scheme, _host, _port):
             Asynchronously tests whether a connection can be made to a given proxy using the specified scheme.
 
-        detect_scheme(_host, _port):
+        detect_scheme(_host, _port, _strict, _provider):
             Asynchronously attempts to determine the correct proxy scheme by testing all supported types in parallel.
 
+        add_probe_hook(_hook):
+            Registers a callback receiving a structured `ProbeEvent` after every scheme probe.
+
+        remove_probe_hook(_hook):
+            Unregisters a probe hook.
+
     Examples:
     ```
         >>> tester = ProxyTester(_connection_timeout=10, _debug=True)
@@ -745,7 +1158,11 @@ class ProxyTester:
     def __init__(
             self,
             _connection_timeout: int = 5,
-            _debug: bool = False
+            _debug: bool = False,
+            _connect_timeout: typing.Optional[float] = None,
+            _read_timeout: typing.Optional[float] = None,
+            _socket_profile: typing.Optional[SocketProfile] = None,
+            _scheme_priors: typing.Optional[SchemePriors] = None
         ) -> None:
         """
         Initializes the ProxyTester instance with configuration for timeout and logging.
@@ -758,6 +1175,14 @@ class ProxyTester:
                 The timeout value (in seconds) to use for proxy connection attempts.
             _debug (bool):
                 If True, enables debug logging output for verbose feedback.
+            _connect_timeout (float | None):
+                Timeout (in seconds) for the connect phase of probes. Defaults to `_connection_timeout`.
+            _read_timeout (float | None):
+                Timeout (in seconds) for reading handshake responses. Defaults to `_connection_timeout`.
+            _socket_profile (SocketProfile | None):
+                Socket options of probe connections, None uses asyncio's defaults.
+            _scheme_priors (SchemePriors | None):
+                Learned scheme probabilities ordering detection probes, None probes all schemes in parallel.
 
         Examples:
         ```
@@ -776,17 +1201,24 @@ class ProxyTester:
         # Connection information
         self.connection_timeout: int = _connection_timeout
 
+        # Orders detection probes by likelihood, and learns from every detection
+        self.scheme_priors: typing.Optional[SchemePriors] = _scheme_priors
+
 
         # Create the ProxySchemeDetector instance, for detecting the proxy scheme
         self.proxy_scheme_detector: ProxySchemeDetector = ProxySchemeDetector(
             _connection_timeout = self.connection_timeout, # _connection_timeout is set by forwarding the parameter from ProxyTester
-            _debug = self.debug
+            _debug = self.debug,
+            _connect_timeout = _connect_timeout,
+            _read_timeout = _read_timeout,
+            _socket_profile = _socket_profile
         )
 
         # Create the logger instance
         self.logger: Logger = Logger(
             _logger_name = "ProxyTester",
-            _debug = self.debug
+            _debug = self.debug,
+            _background = True
         )
 
 
@@ -840,17 +1272,29 @@ class ProxyTester:
 
         result: bool = await detectors[_scheme](_host = _host, _port = _port)
 
-        self.logger.log(f"Connection for ({_scheme}://{_host}:{_port}) was established: ({self.logger.CLR.GREEN if bool(result) else self.logger.CLR.RED}{bool(result)}{self.logger.CLR.RESET}) in {(time.perf_counter() - start):.2f} seconds.")
+        if self.logger.is_enabled():
+            self.logger.log(
+                "Connection for ({}://{}:{}) was established: ({}{}{}) in {:.2f} seconds.",
+                _scheme, _host, _port, self.logger.CLR.GREEN if bool(result) else self.logger.CLR.RED, bool(result), self.logger.CLR.RESET, time.perf_counter() - start
+            )
 
         return result if result is not None else False
 
 
-    async def detect_scheme(self, _host: str, _port: int, _strict: bool = False) -> tuple[str, int, str | None]:
+    async def detect_scheme(
+            self,
+            _host: str,
+            _port: int,
+            _strict: bool = False,
+            _provider: typing.Optional[str] = None
+        ) -> tuple[str, int, str | None]:
         """
         Attempts to determine the correct scheme (protocol) of a proxy server.
 
         It launches parallel checks for all supported schemes (SOCKS4, SOCKS5, HTTP, HTTPS) and
-        returns the first one that succeeds.
+        returns the first one that succeeds. With `scheme_priors`, the schemes are probed in order
+        of likelihood for the port and provider instead, stopping at the first one that succeeds,
+        and the result is recorded in the priors.
 
         Args:
             _host (str):
@@ -859,6 +1303,8 @@ class ProxyTester:
                 The port number on which the proxy is operating.
             _strict (bool):
                 If set to True. This function will raiase an error.
+            _provider (str | None):
+                Provider that listed the proxy, used by `scheme_priors`.
 
         Returns:
                tuple[str, int, str | None]:
@@ -877,19 +1323,58 @@ class ProxyTester:
         """
         start: float = time.perf_counter()
 
-        proxy_scheme = await self.proxy_scheme_detector.detect_proxy_scheme_parallel(_host = _host, _port = _port)
+        if self.scheme_priors is None:
+            proxy_scheme = await self.proxy_scheme_detector.detect_proxy_scheme_parallel(_host = _host, _port = _port)
 
-        if not proxy_scheme:
-            self.logger.log(
-                f"Testing proxy connection {self.logger.CLR.RED}failed{self.logger.CLR.RESET} ({proxy_scheme}://{_host}:{_port}) in {(time.perf_counter() - start):.2f} seconds."
+        else:
+            proxy_scheme, probes = await self.proxy_scheme_detector.detect_proxy_scheme_ordered(
+                _host = _host,
+                _port = _port,
+                _order = self.scheme_priors.get_order(_port, _provider)
             )
 
-            if _strict:
-                raise ValueError(f"Could not detect proxy scheme for {_host}:{_port}.")
+            self.scheme_priors.record(_port, _provider, proxy_scheme, probes)
+            SCHEME_DETECTION_PROBES.observe(probes, "detected" if proxy_scheme else "none")
 
-        else:
+        # The color arguments are only resolved (and colorama imported) when the line is actually logged
+        if self.logger.is_enabled():
             self.logger.log(
-                f"Testing proxy connection {self.logger.CLR.GREEN}succeeded{self.logger.CLR.RESET} ({proxy_scheme}://{_host}:{_port}) in {(time.perf_counter() - start):.2f} seconds."
+                "Testing proxy connection {}{}{} ({}://{}:{}) in {:.2f} seconds.",
+                self.logger.CLR.GREEN if proxy_scheme else self.logger.CLR.RED, "succeeded" if proxy_scheme else "failed",
+                self.logger.CLR.RESET, proxy_scheme, _host, _port, time.perf_counter() - start
             )
 
+        if not proxy_scheme and _strict:
+            raise ValueError(f"Could not detect proxy scheme for {_host}:{_port}.")
+
         return _host, _port, proxy_scheme
+
+
+    def add_probe_hook(self, _hook: typing.Callable[[ProbeEvent], None]) -> None:
+        """
+        Registers a callback that receives a structured `ProbeEvent` after every scheme probe.
+
+        Args:
+            _hook (Callable[[ProbeEvent], None]):
+                Callback receiving the probe event.
+
+        Examples:
+        ```
+            >>> tester = ProxyTester()
+            >>> tester.add_probe_hook(lambda event: print(event))
+        ```
+        """
+
+        self.proxy_scheme_detector.add_probe_hook(_hook)
+
+
+    def remove_probe_hook(self, _hook: typing.Callable[[ProbeEvent], None]) -> None:
+        """
+        Unregisters a callback previously registered with `add_probe_hook()`.
+
+        Args:
+            _hook (Callable[[ProbeEvent], None]):
+                Callback to remove.
+        """
+
+        self.proxy_scheme_detector.remove_probe_hook(_hook)
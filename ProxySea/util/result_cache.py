@@ -0,0 +1,112 @@
+from ..imports import asyncio, collections, time, typing
+
+from ..metrics import PROBE_CACHE_LOOKUPS_TOTAL, PROBE_CACHE_SIZE
+from .proxy_tester import ProxyInfo
+
+
+class ProbeResultCache:
+    """
+    Bounded cache of recent proxy test results, checked before any network I/O.
+
+    Results are keyed by (host, port, scheme), proxies without a known scheme share the "AUTO" key
+    and get the detected scheme from the cache. Working proxies are kept for `positive_ttl` seconds,
+    dead ones for `negative_ttl` seconds. When the cache is full, the least recently used entries are
+    evicted first.
+
+    Tests of a key that is already being probed wait for that probe instead of starting another one,
+    so a proxy listed by several providers is probed once per batch.
+
+    Attributes:
+        positive_ttl (float): Seconds a working result is reused.
+        negative_ttl (float): Seconds a dead result is reused.
+        max_size (int): Maximum number of cached results.
+        entries (OrderedDict[tuple, tuple[float, bool, str | None]]): (expires at, active, scheme) by key,
+            least recently used first.
+        in_flight (dict[tuple, asyncio.Future]): Probes currently running, by key.
+        hits (int): Lookups answered from the cache (or by a probe in flight).
+        misses (int): Lookups that needed a probe.
+
+    Examples:
+    ```
+        >>> tester = ProvidersProxyTester(_result_cache = ProbeResultCache(_positive_ttl = 300, _negative_ttl = 900))
+
+        >>> await tester.test_proxies(proxies)
+        >>> await tester.test_proxies(proxies) # Served from the cache
+
+        >>> print(tester.result_cache.hits, tester.result_cache.misses)
+        >>> 1500 1500 # Result of the print
+    ```
+    """
+
+    def __init__(self, _positive_ttl: float = 300.0, _negative_ttl: float = 600.0, _max_size: int = 100_000) -> None:
+        if _max_size <= 0:
+            raise ValueError("You have to provide _max_size > 0.")
+
+        self.positive_ttl: float = _positive_ttl
+        self.negative_ttl: float = _negative_ttl
+        self.max_size: int = _max_size
+
+        self.entries: collections.OrderedDict[tuple, tuple[float, bool, typing.Optional[str]]] = collections.OrderedDict()
+        self.in_flight: dict[tuple, asyncio.Future] = {}
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def get_key(_proxy: ProxyInfo) -> tuple[str, int, str]:
+        scheme: str = _proxy.scheme if _proxy.scheme in ["HTTPS", "HTTP", "SOCKS5", "SOCKS4"] else "AUTO"
+        return _proxy.host, _proxy.port, scheme
+
+    def get(self, _key: tuple) -> typing.Optional[tuple[bool, typing.Optional[str]]]:
+        """
+        Returns the cached (active, scheme) of the key, or None if it's missing or expired.
+        """
+
+        entry: typing.Optional[tuple[float, bool, typing.Optional[str]]] = self.entries.get(_key)
+
+        if entry is None:
+            return None
+
+        expires_at, active, scheme = entry
+
+        if expires_at <= time.monotonic():
+            del self.entries[_key]
+            PROBE_CACHE_SIZE.set(len(self.entries))
+            return None
+
+        self.entries.move_to_end(_key)
+        return active, scheme
+
+    def put(self, _key: tuple, _active: bool, _scheme: typing.Optional[str]) -> None:
+        ttl: float = self.positive_ttl if _active else self.negative_ttl
+
+        if ttl <= 0:
+            return
+
+        self.entries[_key] = (time.monotonic() + ttl, _active, _scheme)
+        self.entries.move_to_end(_key)
+
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last = False)
+
+        PROBE_CACHE_SIZE.set(len(self.entries))
+
+    def record(self, _hit: bool) -> None:
+        if _hit:
+            self.hits += 1
+
+        else:
+            self.misses += 1
+
+        PROBE_CACHE_LOOKUPS_TOTAL.inc("hit" if _hit else "miss")
+
+    def invalidate(self, _proxy: ProxyInfo) -> None:
+        self.entries.pop(self.get_key(_proxy), None)
+        PROBE_CACHE_SIZE.set(len(self.entries))
+
+    def clear(self) -> None:
+        self.entries.clear()
+        PROBE_CACHE_SIZE.set(0)
@@ -0,0 +1,182 @@
+from ..imports import json, os, typing
+
+
+class SchemePriors:
+    """
+    Learned scheme probabilities by port and by provider, used to order detection probes.
+
+    Detection used to probe all four schemes of every proxy. Most of them are obvious from the
+    port (1080 is SOCKS, 3128 and 8080 are HTTP) or from the provider (every provider lists its
+    own mix). The priors count detected schemes per port, per provider and overall, and combine
+    them naive-Bayes style: P(scheme | port, provider) ∝ P(scheme | port) * P(scheme | provider) / P(scheme).
+    Per-key probabilities are smoothed toward the overall ones with `strength` pseudo-counts, so
+    a port seen once doesn't decide alone. Well-known ports start with `DEFAULT_PORT_COUNTS`.
+
+    Counts of a key are halved once they pass `max_count`, so the priors follow providers whose
+    mix changes over time.
+
+    Attributes:
+        strength (float): Pseudo-counts pulling per-port and per-provider probabilities toward the overall ones.
+        max_count (float): Count of a key after which its counts are halved.
+        overall (dict[str, float]): Detected schemes over all proxies.
+        ports (dict[int, dict[str, float]]): Detected schemes by port.
+        providers (dict[str, dict[str, float]]): Detected schemes by provider.
+        detections (int): Detections recorded.
+        probes (int): Probes started by the recorded detections.
+        path (str | None): File the priors are loaded from and saved to.
+
+    Methods:
+        get_order(_port, _provider):
+            Returns the schemes, most likely first.
+
+        record(_port, _provider, _scheme, _probes):
+            Learns from a detection result, `_scheme = None` if nothing was detected.
+
+        save(_path):
+            Writes the counts to a JSON file, atomically.
+
+    Examples:
+    ```
+        >>> priors = SchemePriors(_path = "priors.json")
+        >>> tester = ProvidersProxyTester(_scheme_priors = priors)
+
+        >>> print(priors.get_order(1080, None))
+        >>> ['SOCKS5', 'SOCKS4', 'HTTP', 'HTTPS'] # Result of the print
+
+        >>> await tester.test_proxies(proxies)
+        >>> print(priors.get_average_probes())
+        >>> 1.3 # Result of the print
+    ```
+    """
+
+    SCHEMES: list[str] = ["HTTP", "SOCKS5", "SOCKS4", "HTTPS"]
+
+    DEFAULT_PORT_COUNTS: dict[int, dict[str, float]] = {
+        80: {"HTTP": 8.0, "HTTPS": 1.0},
+        443: {"HTTPS": 4.0, "HTTP": 4.0},
+        1080: {"SOCKS5": 6.0, "SOCKS4": 3.0, "HTTP": 1.0},
+        1081: {"SOCKS5": 6.0, "SOCKS4": 3.0, "HTTP": 1.0},
+        3128: {"HTTP": 8.0, "HTTPS": 1.0},
+        3129: {"HTTP": 8.0, "HTTPS": 1.0},
+        4145: {"SOCKS4": 6.0, "SOCKS5": 3.0},
+        5678: {"SOCKS4": 6.0, "SOCKS5": 2.0},
+        8000: {"HTTP": 8.0, "HTTPS": 1.0},
+        8080: {"HTTP": 7.0, "HTTPS": 1.0, "SOCKS5": 1.0},
+        8118: {"HTTP": 8.0},
+        8443: {"HTTPS": 6.0, "HTTP": 2.0},
+        8888: {"HTTP": 8.0, "HTTPS": 1.0},
+        9050: {"SOCKS5": 8.0},
+        9150: {"SOCKS5": 8.0}
+    }
+
+    def __init__(self, _path: typing.Optional[str] = None, _strength: float = 2.0, _max_count: float = 1000.0) -> None:
+        """
+        Args:
+            _path (str | None): JSON file to load the counts from (if it exists) and to save them to.
+            _strength (float): Pseudo-counts pulling per-key probabilities toward the overall ones.
+            _max_count (float): Count of a key after which its counts are halved.
+        """
+
+        if _strength <= 0 or _max_count <= 0:
+            raise ValueError("You have to provide _strength > 0 and _max_count > 0.")
+
+        self.strength: float = _strength
+        self.max_count: float = _max_count
+        self.path: typing.Optional[str] = _path
+
+        self.overall: dict[str, float] = {}
+        self.ports: dict[int, dict[str, float]] = {port: dict(counts) for port, counts in self.DEFAULT_PORT_COUNTS.items()}
+        self.providers: dict[str, dict[str, float]] = {}
+
+        self.detections: int = 0
+        self.probes: int = 0
+
+        if _path is not None and os.path.exists(_path):
+            self.load(_path)
+
+    def get_overall_probabilities(self) -> dict[str, float]:
+        # Laplace smoothing, a scheme never seen keeps a small chance
+        total: float = sum(self.overall.values()) + len(self.SCHEMES)
+        return {scheme: (self.overall.get(scheme, 0.0) + 1.0) / total for scheme in self.SCHEMES}
+
+    def get_smoothed(self, _counts: typing.Optional[dict[str, float]], _overall: dict[str, float]) -> dict[str, float]:
+        if not _counts:
+            return _overall
+
+        total: float = sum(_counts.values()) + self.strength
+        return {scheme: (_counts.get(scheme, 0.0) + self.strength * _overall[scheme]) / total for scheme in self.SCHEMES}
+
+    def get_probabilities(self, _port: int, _provider: typing.Optional[str] = None) -> dict[str, float]:
+        """
+        Returns the probability of every scheme for a proxy on `_port`, listed by `_provider`.
+        """
+
+        overall: dict[str, float] = self.get_overall_probabilities()
+        by_port: dict[str, float] = self.get_smoothed(self.ports.get(_port), overall)
+
+        if _provider is None:
+            return by_port
+
+        by_provider: dict[str, float] = self.get_smoothed(self.providers.get(_provider), overall)
+        scores: dict[str, float] = {scheme: by_port[scheme] * by_provider[scheme] / overall[scheme] for scheme in self.SCHEMES}
+        total: float = sum(scores.values())
+
+        return {scheme: score / total for scheme, score in scores.items()}
+
+    def get_order(self, _port: int, _provider: typing.Optional[str] = None) -> list[str]:
+        probabilities: dict[str, float] = self.get_probabilities(_port, _provider)
+
+        # sorted() is stable, ties keep the order of SCHEMES
+        return sorted(self.SCHEMES, key = lambda scheme: -probabilities[scheme])
+
+    def count(self, _counts: dict[str, float], _scheme: str) -> None:
+        _counts[_scheme] = _counts.get(_scheme, 0.0) + 1.0
+
+        if sum(_counts.values()) > self.max_count:
+            for scheme in _counts:
+                _counts[scheme] /= 2
+
+    def record(self, _port: int, _provider: typing.Optional[str], _scheme: typing.Optional[str], _probes: int = 0) -> None:
+        self.detections += 1
+        self.probes += _probes
+
+        # A dead proxy says nothing about schemes
+        if _scheme is None:
+            return
+
+        self.count(self.overall, _scheme)
+        self.count(self.ports.setdefault(_port, {}), _scheme)
+
+        if _provider is not None:
+            self.count(self.providers.setdefault(_provider, {}), _scheme)
+
+    def get_average_probes(self) -> float:
+        return self.probes / self.detections if self.detections else 0.0
+
+    def save(self, _path: typing.Optional[str] = None) -> None:
+        path: typing.Optional[str] = _path or self.path
+
+        if path is None:
+            raise ValueError("You have to provide _path, the priors were created without one.")
+
+        temporary_path: str = f"{path}.tmp"
+
+        with open(temporary_path, "w", encoding = "utf-8") as file:
+            json.dump(
+                {
+                    "overall": self.overall,
+                    "ports": {str(port): counts for port, counts in self.ports.items()},
+                    "providers": self.providers
+                },
+                file
+            )
+
+        os.replace(temporary_path, path)
+
+    def load(self, _path: str) -> None:
+        with open(_path, encoding = "utf-8") as file:
+            data: dict = json.load(file)
+
+        self.overall = dict(data.get("overall", {}))
+        self.ports = {int(port): dict(counts) for port, counts in data.get("ports", {}).items()}
+        self.providers = {provider: dict(counts) for provider, counts in data.get("providers", {}).items()}
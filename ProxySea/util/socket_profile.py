@@ -0,0 +1,143 @@
+from ..imports import asyncio, itertools, socket, ssl, struct, sys, typing
+
+
+class SocketProfile:
+    """
+    Socket options for probe connections, tuned for probing hundreds of thousands of endpoints.
+
+    A normally closed TCP connection stays in TIME_WAIT for a minute on the side closing it, and
+    keeps its local port for that time. Mass probing runs out of ephemeral ports this way, and
+    connects failing with EADDRNOTAVAIL show up as dead proxies. The profile:
+
+    - closes with SO_LINGER 0: the connection is reset instead of closed, no TIME_WAIT is left.
+    - sets TCP_NODELAY: handshake requests are sent right away instead of waiting for an ACK.
+    - shrinks the receive buffer: a probe reads a few bytes, not megabytes per socket.
+    - binds round-robin across `source_addresses`: every local address has its own port range.
+      On Linux, IP_BIND_ADDRESS_NO_PORT defers the port choice to connect(), so ports are shared
+      across destinations as well.
+
+    Attributes:
+        linger (bool): Reset connections on close (SO_LINGER 0).
+        nodelay (bool): Set TCP_NODELAY.
+        receive_buffer (int | None): SO_RCVBUF in bytes, None keeps the system default.
+        source_addresses (list[str]): Local addresses connections are bound to, round-robin.
+            Empty means the system picks.
+
+    Methods:
+        open_connection(_host, _port, _ssl):
+            Same as `asyncio.open_connection()`, with the profile applied to the socket.
+
+    Examples:
+    ```
+        >>> profile = SocketProfile(_source_addresses = ["10.0.0.2", "10.0.0.3", "10.0.0.4"])
+        >>> tester = ProvidersProxyTester(_socket_profile = profile)
+
+        >>> tested = await tester.test_proxies(proxies)
+    ```
+    """
+
+    # Not exposed by the socket module before Python 3.12
+    IP_BIND_ADDRESS_NO_PORT: typing.Optional[int] = getattr(
+        socket, "IP_BIND_ADDRESS_NO_PORT", 24 if sys.platform.startswith("linux") else None
+    )
+
+    def __init__(
+            self,
+            _linger: bool = True,
+            _nodelay: bool = True,
+            _receive_buffer: typing.Optional[int] = 4096,
+            _source_addresses: typing.Optional[list[str]] = None
+        ) -> None:
+        """
+        Args:
+            _linger (bool): Reset connections on close (SO_LINGER 0), no TIME_WAIT is left behind.
+            _nodelay (bool): Set TCP_NODELAY.
+            _receive_buffer (int | None): SO_RCVBUF in bytes, None keeps the system default.
+            _source_addresses (list[str] | None): Local addresses to bind connections to, round-robin.
+        """
+
+        self.linger: bool = _linger
+        self.nodelay: bool = _nodelay
+        self.receive_buffer: typing.Optional[int] = _receive_buffer
+        self.source_addresses: list[str] = list(_source_addresses or [])
+
+        self.sources: dict[int, typing.Iterator[str]] = {
+            family: itertools.cycle(addresses)
+            for family, addresses in self.get_sources_by_family().items()
+        }
+
+    def get_sources_by_family(self) -> dict[int, list[str]]:
+        families: dict[int, list[str]] = {}
+
+        for address in self.source_addresses:
+            families.setdefault(self.get_family(address) or socket.AF_INET, []).append(address)
+
+        return families
+
+    @staticmethod
+    def get_family(_host: str) -> typing.Optional[int]:
+        # Numeric hosts skip the resolver, nearly every listed proxy is an IP address
+        for family in [socket.AF_INET, socket.AF_INET6]:
+            try:
+                socket.inet_pton(family, _host)
+                return family
+
+            except OSError:
+                continue
+
+        return None
+
+    def create_socket(self, _family: int) -> socket.socket:
+        sock: socket.socket = socket.socket(_family, socket.SOCK_STREAM)
+
+        try:
+            sock.setblocking(False)
+
+            if self.linger:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+
+            if self.nodelay:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            if self.receive_buffer is not None:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer)
+
+            sources: typing.Optional[typing.Iterator[str]] = self.sources.get(_family)
+
+            if sources is not None:
+                if self.IP_BIND_ADDRESS_NO_PORT is not None:
+                    sock.setsockopt(socket.IPPROTO_IP, self.IP_BIND_ADDRESS_NO_PORT, 1)
+
+                sock.bind((next(sources), 0))
+
+        except BaseException:
+            sock.close()
+            raise
+
+        return sock
+
+    async def open_connection(
+            self,
+            _host: str,
+            _port: int,
+            _ssl: typing.Optional[ssl.SSLContext] = None
+        ) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        family: typing.Optional[int] = self.get_family(_host)
+        address: tuple = (_host, _port)
+
+        if family is None:
+            infos: list = await loop.getaddrinfo(_host, _port, type = socket.SOCK_STREAM)
+
+            # Prefer a family there are source addresses for
+            family, _, _, _, address = next((info for info in infos if info[0] in self.sources), infos[0])
+
+        sock: socket.socket = self.create_socket(family)
+
+        try:
+            await loop.sock_connect(sock, address)
+            return await asyncio.open_connection(sock = sock, ssl = _ssl, server_hostname = _host if _ssl is not None else None)
+
+        except BaseException:
+            sock.close()
+            raise
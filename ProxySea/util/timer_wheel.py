@@ -0,0 +1,179 @@
+from ..imports import asyncio, typing
+
+
+class TimerWheelEntry:
+    __slots__ = ("task", "rounds", "active", "expired")
+
+    def __init__(self, _task: asyncio.Task, _rounds: int) -> None:
+        self.task: asyncio.Task = _task
+        self.rounds: int = _rounds
+        self.active: bool = True
+        self.expired: bool = False
+
+
+class TimerWheelTimeout:
+    """
+    Async context manager returned by `TimerWheel.timeout()`, raises `asyncio.TimeoutError` when the deadline passes.
+    """
+
+    __slots__ = ("wheel", "delay", "entry")
+
+    def __init__(self, _wheel: "TimerWheel", _delay: typing.Optional[float]) -> None:
+        self.wheel: TimerWheel = _wheel
+        self.delay: typing.Optional[float] = _delay
+        self.entry: typing.Optional[TimerWheelEntry] = None
+
+    async def __aenter__(self) -> "TimerWheelTimeout":
+        if self.delay is not None:
+            self.entry = self.wheel.schedule(asyncio.current_task(), self.delay)
+
+        return self
+
+    async def __aexit__(self, _exc_type, _exc, _traceback) -> typing.Optional[bool]:
+        entry: typing.Optional[TimerWheelEntry] = self.entry
+
+        if entry is None:
+            return None
+
+        # Lazy removal, the wheel drops inactive entries when their slot comes up
+        entry.active = False
+        self.wheel.active -= not entry.expired
+
+        if entry.expired:
+            # Withdraw our cancel() request, if another one is left it comes from somewhere else
+            # (e.g. a deadline in the same tick) and the CancelledError has to propagate
+            if not entry.task.uncancel() and _exc_type is asyncio.CancelledError:
+                raise asyncio.TimeoutError() from _exc
+
+        return None
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel expiring many timeouts per tick, with one loop timer for all of them.
+
+    `asyncio.wait_for()` (and `asyncio.timeout()`) schedule one timer handle per operation, and
+    every cancelled handle stays in the loop's heap until it's cleaned up. With hundreds of
+    thousands of probes, each with a connect and a read timeout, that is measurable. The wheel keeps
+    timeouts in `slots` buckets of `tick` seconds: scheduling and cancelling are O(1) list and flag
+    operations, and a single `call_at` handle (only while timeouts are pending) advances the wheel
+    and cancels the tasks whose deadline passed. Deadlines are rounded up to the next tick.
+
+    The wheel binds to the running loop on first use, and rebinds when used from a new loop.
+
+    It needs `Task.uncancel()` (Python 3.11+) to tell its own cancellations from external ones, check
+    `TimerWheel.SUPPORTED` and fall back to `asyncio.wait_for()` on older versions.
+
+    Attributes:
+        tick (float): Resolution of the wheel, in seconds.
+        slots (list[list[TimerWheelEntry]]): Buckets of pending timeouts.
+        active (int): Number of pending timeouts.
+
+    Methods:
+        timeout(_delay):
+            Async context manager cancelling the current task after `_delay` seconds and raising
+            `asyncio.TimeoutError` instead. `_delay = None` means no timeout.
+
+    Examples:
+    ```
+        >>> wheel = TimerWheel(_tick = 0.05)
+
+        >>> async with wheel.timeout(5):
+        >>>     reader, writer = await asyncio.open_connection(host, port)
+    ```
+    """
+
+    SUPPORTED: bool = hasattr(asyncio.Task, "uncancel")
+
+    def __init__(self, _tick: float = 0.05, _slots: int = 512) -> None:
+        if not self.SUPPORTED:
+            raise RuntimeError("TimerWheel needs Task.uncancel(), available since Python 3.11.")
+
+        if _tick <= 0 or _slots <= 0:
+            raise ValueError("You have to provide _tick > 0 and _slots > 0.")
+
+        self.tick: float = _tick
+        self.slots: list[list[TimerWheelEntry]] = [[] for _ in range(_slots)]
+        self.active: int = 0
+
+        self.loop: typing.Optional[asyncio.AbstractEventLoop] = None
+        self.handle: typing.Optional[asyncio.TimerHandle] = None
+
+        # Index of the next tick to process and the loop time it starts at
+        self.position: int = 0
+        self.started_at: float = 0.0
+
+    def timeout(self, _delay: typing.Optional[float]) -> TimerWheelTimeout:
+        return TimerWheelTimeout(self, _delay)
+
+    def bind(self) -> asyncio.AbstractEventLoop:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        if loop is not self.loop:
+            # Entries of a previous loop belong to tasks that can't run anymore
+            self.loop = loop
+            self.slots = [[] for _ in self.slots]
+            self.active = 0
+            self.handle = None
+            self.position = 0
+            self.started_at = loop.time()
+
+        return loop
+
+    def schedule(self, _task: asyncio.Task, _delay: float) -> TimerWheelEntry:
+        loop: asyncio.AbstractEventLoop = self.bind()
+
+        if self.handle is None:
+            # The wheel was idle, restart it at the current time
+            self.position = 0
+            self.started_at = loop.time()
+
+        # Ticks from the start of the wheel, rounded up so a timeout never fires early
+        due: int = max(self.position, -int(-(loop.time() + _delay - self.started_at) // self.tick))
+
+        entry: TimerWheelEntry = TimerWheelEntry(_task, (due - self.position) // len(self.slots))
+        self.slots[due % len(self.slots)].append(entry)
+        self.active += 1
+
+        if self.handle is None:
+            self.handle = loop.call_at(self.started_at + (self.position + 1) * self.tick, self.advance)
+
+        return entry
+
+    def advance(self) -> None:
+        loop: asyncio.AbstractEventLoop = self.loop
+        now: float = loop.time()
+
+        # Catch up on every tick that passed, the loop may have been busy
+        while self.started_at + self.position * self.tick <= now:
+            slot: list[TimerWheelEntry] = self.slots[self.position % len(self.slots)]
+            kept: list[TimerWheelEntry] = []
+
+            for entry in slot:
+                if not entry.active:
+                    continue
+
+                if entry.rounds > 0:
+                    entry.rounds -= 1
+                    kept.append(entry)
+                    continue
+
+                entry.expired = True
+                self.active -= 1
+                entry.task.cancel()
+
+            slot[:] = kept
+            self.position += 1
+
+            if not self.active:
+                break
+
+        if self.active:
+            self.handle = loop.call_at(self.started_at + self.position * self.tick, self.advance)
+
+        else:
+            # Nothing pending, the wheel stops ticking until the next timeout
+            self.handle = None
+
+            for slot in self.slots:
+                slot.clear()
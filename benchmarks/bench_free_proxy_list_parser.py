@@ -0,0 +1,40 @@
+# Compares rows per second of the FreeProxyListScrapper parsers
+# on the tests/fixtures/free_proxy_list.html fixture.
+#
+# Usage:
+#   python benchmarks/bench_free_proxy_list_parser.py [rounds]
+
+import os, sys, time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ProxySea.providers.free_proxy_list import FreeProxyListScrapper
+
+FIXTURE_PATH: str = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "free_proxy_list.html")
+
+
+def bench_parser(_html: str, _parser: str, _rounds: int) -> float:
+    rows: int = 0
+    start: float = time.perf_counter()
+
+    for _ in range(_rounds):
+        rows += len(FreeProxyListScrapper(_html = _html, _parser = _parser).scrape_proxies())
+
+    return rows / (time.perf_counter() - start)
+
+
+def main() -> None:
+    rounds: int = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    with open(FIXTURE_PATH, encoding = "utf-8") as file:
+        html: str = file.read()
+
+    results: dict[str, float] = {parser: bench_parser(html, parser, rounds) for parser in ["bs4", "lxml"]}
+
+    for parser, rows_per_second in results.items():
+        print(f"{parser:>5}: {rows_per_second:12.0f} rows/s")
+
+    print(f"speedup: {results['lxml'] / results['bs4']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
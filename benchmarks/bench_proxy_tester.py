@@ -0,0 +1,120 @@
+# End-to-end benchmark of ProvidersProxyTester.test_proxies against a local ProxyFarm.
+# Reports probes per second, p50/p99 time per proxy, peak memory and accuracy.
+#
+# Usage:
+#   python benchmarks/bench_proxy_tester.py [--http N] [--https N] [--socks4 N] [--socks5 N] [--closed N]
+#                                           [--latency S] [--jitter S] [--trickle RATIO] [--failures RATIO]
+#                                           [--concurrency N] [--known-schemes] [--separate-process] [--priors]
+
+import argparse, asyncio, os, resource, sys, time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ProxySea.providers import ProvidersProxyTester
+from ProxySea.metrics import PROBES_TOTAL
+from ProxySea.util import ProxyInfo, SchemePriors
+
+from benchmarks.proxy_farm import ProxyFarm, ProxyFarmProcess
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description = "Benchmark ProvidersProxyTester.test_proxies on a local fake-proxy farm.")
+
+    parser.add_argument("--http", type = int, default = 400)
+    parser.add_argument("--https", type = int, default = 400)
+    parser.add_argument("--socks4", type = int, default = 400)
+    parser.add_argument("--socks5", type = int, default = 400)
+    parser.add_argument("--closed", type = int, default = 400)
+    parser.add_argument("--latency", type = float, default = 0.0, help = "Base reply latency in seconds.")
+    parser.add_argument("--jitter", type = float, default = 0.0, help = "Random extra latency per endpoint in seconds.")
+    parser.add_argument("--trickle", type = float, default = 0.0, help = "Fraction of endpoints replying byte by byte.")
+    parser.add_argument("--failures", type = float, default = 0.0, help = "Fraction of endpoints closing connections without replying.")
+    parser.add_argument("--concurrency", type = int, default = 500)
+    parser.add_argument("--known-schemes", action = "store_true", help = "Pass real schemes, so only check_connection runs.")
+    parser.add_argument("--separate-process", action = "store_true", help = "Run the farm in its own process.")
+    parser.add_argument("--priors", action = "store_true", help = "Order detection probes with SchemePriors.")
+
+    return parser.parse_args()
+
+
+def percentile(_values: list[float], _percent: float) -> float:
+    if not _values:
+        return 0.0
+
+    values: list[float] = sorted(_values)
+    return values[min(len(values) - 1, int(len(values) * _percent / 100))]
+
+
+def raise_open_files_limit() -> None:
+    # Every detection opens four connections, and the farm holds the other end of each of them
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def bench(_proxies: list[ProxyInfo], _concurrency: int, _priors: bool = False) -> tuple[list[ProxyInfo], list[float], float, float]:
+    tester: ProvidersProxyTester = ProvidersProxyTester(_scheme_priors = SchemePriors() if _priors else None)
+    durations: list[float] = []
+
+    test_proxy = tester.test_proxy
+
+    async def timed_test_proxy(_proxy: ProxyInfo, _use_cache: bool = True) -> ProxyInfo:
+        start: float = time.perf_counter()
+
+        try:
+            return await test_proxy(_proxy, _use_cache)
+
+        finally:
+            durations.append(time.perf_counter() - start)
+
+    tester.test_proxy = timed_test_proxy
+
+    probes_before: float = sum(PROBES_TOTAL.collect().values())
+    start: float = time.perf_counter()
+
+    tested: list[ProxyInfo] = await tester.test_proxies(_proxies, _concurrent_tasks = _concurrency)
+
+    elapsed: float = time.perf_counter() - start
+    probes: float = sum(PROBES_TOTAL.collect().values()) - probes_before
+
+    return tested, durations, elapsed, probes
+
+
+def report(_farm, _tested: list[ProxyInfo], _durations: list[float], _elapsed: float, _probes: float) -> None:
+    peak_memory: float = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"proxies:      {len(_tested)}")
+    print(f"elapsed:      {_elapsed:.2f} s")
+    print(f"probes:       {_probes:.0f} ({_probes / _elapsed:.0f} probes/s)")
+    print(f"proxies/s:    {len(_tested) / _elapsed:.1f}")
+    print(f"p50 / proxy:  {percentile(_durations, 50) * 1000:.1f} ms")
+    print(f"p99 / proxy:  {percentile(_durations, 99) * 1000:.1f} ms")
+    print(f"peak memory:  {peak_memory:.1f} MiB")
+    print(f"accuracy:     {_farm.accuracy(_tested) * 100:.2f} %")
+
+
+def main() -> None:
+    args: argparse.Namespace = parse_args()
+    raise_open_files_limit()
+
+    counts: dict[str, int] = {"HTTP": args.http, "HTTPS": args.https, "SOCKS4": args.socks4, "SOCKS5": args.socks5, "CLOSED": args.closed}
+    options: dict = {
+        "_latency": args.latency,
+        "_latency_jitter": args.jitter,
+        "_trickle_ratio": args.trickle,
+        "_failure_ratio": args.failures
+    }
+
+    if args.separate_process:
+        with ProxyFarmProcess(counts, **options) as farm:
+            report(farm, *asyncio.run(bench(farm.proxies(_with_schemes = args.known_schemes), args.concurrency, args.priors)))
+
+        return
+
+    async def run() -> None:
+        async with ProxyFarm(counts, **options) as farm:
+            report(farm, *await bench(farm.proxies(_with_schemes = args.known_schemes), args.concurrency, args.priors))
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Micro-benchmark of per-operation asyncio.wait_for() against the shared TimerWheel.
+# Runs N concurrent operations, a share of them outliving their timeout, and reports
+# operations per second and the loop's scheduled-timer count at the peak (expiring operations
+# sleep, and each sleep is a loop timer of its own in both modes).
+#
+# Usage:
+#   python benchmarks/bench_timeouts.py [--operations N] [--expiring RATIO] [--timeout S] [--tick S]
+
+import argparse, asyncio, os, sys, time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ProxySea.util import TimerWheel
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description = "Benchmark asyncio.wait_for against TimerWheel timeouts.")
+
+    parser.add_argument("--operations", type = int, default = 100_000)
+    parser.add_argument("--expiring", type = float, default = 0.5, help = "Fraction of operations outliving their timeout.")
+    parser.add_argument("--timeout", type = float, default = 0.5, help = "Timeout of every operation in seconds.")
+    parser.add_argument("--tick", type = float, default = 0.05, help = "Resolution of the wheel in seconds.")
+
+    return parser.parse_args()
+
+
+async def bench(_mode: str, _operations: int, _expiring: float, _timeout: float, _tick: float) -> tuple[float, int, int]:
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    wheel: TimerWheel = TimerWheel(_tick = _tick)
+    release: asyncio.Event = asyncio.Event()
+
+    expiring: int = int(_operations * _expiring)
+    timeouts: int = 0
+
+    async def operation(_expires: bool) -> None:
+        nonlocal timeouts
+
+        # Completing operations wait for a shared event, like reads that all get their reply
+        awaitable = asyncio.sleep(_timeout * 10) if _expires else release.wait()
+
+        try:
+            if _mode == "wait_for":
+                await asyncio.wait_for(awaitable, timeout = _timeout)
+
+            else:
+                async with wheel.timeout(_timeout):
+                    await awaitable
+
+        except asyncio.TimeoutError:
+            timeouts += 1
+
+    start: float = time.perf_counter()
+    tasks: list[asyncio.Task] = [asyncio.create_task(operation(index < expiring)) for index in range(_operations)]
+
+    # Let every operation schedule its timeout, then complete the ones that don't expire
+    await asyncio.sleep(0)
+    timers: int = len(loop._scheduled)
+    release.set()
+
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - start, timers, timeouts
+
+
+def main() -> None:
+    args: argparse.Namespace = parse_args()
+
+    for mode in ["wait_for", "wheel"]:
+        elapsed, timers, timeouts = asyncio.run(bench(mode, args.operations, args.expiring, args.timeout, args.tick))
+
+        print(
+            f"{mode:>8}: {args.operations / elapsed:>10,.0f} operations/s "
+            f"({elapsed:.2f} s, {timers:,} loop timers at peak, {timeouts:,} timeouts)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+# ProxyFarm – Local fake-proxy simulator for tests and benchmarks
+# Copyright (c) 2025 0N3R0
+# Licensed under the MIT License (see LICENSE file for details)
+
+import asyncio, os, random, ssl, multiprocessing
+from typing import Callable, Optional
+
+from ProxySea.util import ProxyInfo
+
+FIXTURES_PATH: str = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+class FarmEndpoint:
+    """
+    Single fake proxy endpoint of a `ProxyFarm`.
+
+    Attributes:
+        host (str): Loopback address the endpoint listens on.
+        port (int): Port the endpoint listens on.
+        kind (str): 'HTTP', 'HTTPS', 'SOCKS4', 'SOCKS5' or 'CLOSED' (nothing listens on the port).
+        latency (float): Delay (in seconds) before the endpoint replies.
+        trickle (bool): If True, the reply is written one byte at a time.
+        broken (bool): If True, the endpoint accepts connections and closes them without replying.
+    """
+
+    __slots__ = ("host", "port", "kind", "latency", "trickle", "broken")
+
+    def __init__(self, _host: str, _port: int, _kind: str, _latency: float = 0.0, _trickle: bool = False, _broken: bool = False) -> None:
+        self.host: str = _host
+        self.port: int = _port
+        self.kind: str = _kind
+        self.latency: float = _latency
+        self.trickle: bool = _trickle
+        self.broken: bool = _broken
+
+    @property
+    def expected_scheme(self) -> Optional[str]:
+        # Scheme a correct tester should detect, None for endpoints that don't work as proxies
+        if self.kind == "CLOSED" or self.broken:
+            return None
+
+        return self.kind
+
+    def to_proxy_info(self, _with_scheme: bool = False) -> ProxyInfo:
+        return ProxyInfo(
+            _scheme = self.kind if _with_scheme and self.kind != "CLOSED" else None,
+            _host = self.host,
+            _port = self.port
+        )
+
+    def to_tuple(self) -> tuple:
+        return (self.host, self.port, self.kind, self.latency, self.trickle, self.broken)
+
+
+class ProxyFarm:
+    """
+    Spins up many fake HTTP/HTTPS/SOCKS4/SOCKS5 proxy endpoints (and closed ports) on loopback.
+
+    Every endpoint answers the handshakes used by `ProxySchemeDetector` the way a real proxy of
+    its kind would: HTTP endpoints answer requests with `200 OK` (and `400 Bad Request` to anything
+    that isn't HTTP), HTTPS endpoints do the same behind TLS, SOCKS endpoints grant the request.
+    Latency, slow-trickle replies and broken endpoints can be mixed in to make runs realistic.
+
+    Examples:
+    ```
+        >>> async with ProxyFarm({"HTTP": 100, "SOCKS5": 100, "CLOSED": 100}, _latency = 0.05) as farm:
+        >>>     proxies = farm.proxies()
+        >>>     tested = await ProvidersProxyTester().test_proxies(proxies)
+        >>>     print(farm.accuracy(tested))
+        >>> 1.0 # Result of the print
+    ```
+    """
+
+    KINDS: list[str] = ["HTTP", "HTTPS", "SOCKS4", "SOCKS5", "CLOSED"]
+
+    def __init__(
+            self,
+            _counts: dict[str, int],
+            _latency: float = 0.0,
+            _latency_jitter: float = 0.0,
+            _trickle_ratio: float = 0.0,
+            _trickle_delay: float = 0.05,
+            _failure_ratio: float = 0.0,
+            _hosts: Optional[list[str]] = None,
+            _seed: int = 0
+        ) -> None:
+        """
+        Args:
+            _counts (dict[str, int]): Number of endpoints per kind ('HTTP', 'HTTPS', 'SOCKS4', 'SOCKS5', 'CLOSED').
+            _latency (float): Base delay (in seconds) before every reply.
+            _latency_jitter (float): Random extra delay (in seconds) added per endpoint, uniformly from [0, jitter].
+            _trickle_ratio (float): Fraction of endpoints that write replies one byte at a time.
+            _trickle_delay (float): Delay (in seconds) between bytes of a trickled reply.
+            _failure_ratio (float): Fraction of endpoints that accept connections and close them without replying.
+            _hosts (list[str] | None): Loopback addresses to spread endpoints over. Defaults to ["127.0.0.1"].
+            _seed (int): Seed of the random generator choosing latencies, trickling and failures.
+        """
+
+        unknown: list[str] = [kind for kind in _counts if kind not in self.KINDS]
+
+        if unknown:
+            raise ValueError(f"Unknown endpoint kinds: {unknown}. Use some of them {self.KINDS}.")
+
+        self.counts: dict[str, int] = _counts
+        self.latency: float = _latency
+        self.latency_jitter: float = _latency_jitter
+        self.trickle_ratio: float = _trickle_ratio
+        self.trickle_delay: float = _trickle_delay
+        self.failure_ratio: float = _failure_ratio
+        self.hosts: list[str] = _hosts or ["127.0.0.1"]
+        self.random: random.Random = random.Random(_seed)
+
+        self.endpoints: list[FarmEndpoint] = []
+        self.servers: list[asyncio.AbstractServer] = []
+        self.handlers: set[asyncio.Task] = set()
+
+        # Exception handler of the loop before start(), put back by stop()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.previous_exception_handler: Optional[Callable] = None
+
+        # Source addresses of accepted connections, useful to check how probes were spread
+        self.peers: dict[str, int] = {}
+
+        self.ssl_context: ssl.SSLContext = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.ssl_context.load_cert_chain(
+            os.path.join(FIXTURES_PATH, "farm_cert.pem"),
+            os.path.join(FIXTURES_PATH, "farm_key.pem")
+        )
+
+    async def __aenter__(self) -> "ProxyFarm":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.previous_exception_handler = self.loop.get_exception_handler()
+        self.loop.set_exception_handler(self.ignore_handshake_errors)
+
+        index: int = 0
+
+        for kind in self.KINDS:
+            for _ in range(self.counts.get(kind, 0)):
+                host: str = self.hosts[index % len(self.hosts)]
+                index += 1
+
+                endpoint: FarmEndpoint = FarmEndpoint(
+                    _host = host,
+                    _port = 0,
+                    _kind = kind,
+                    _latency = self.latency + self.random.uniform(0, self.latency_jitter),
+                    _trickle = self.random.random() < self.trickle_ratio,
+                    _broken = kind != "CLOSED" and self.random.random() < self.failure_ratio
+                )
+
+                server: asyncio.AbstractServer = await asyncio.start_server(
+                    lambda reader, writer, endpoint = endpoint: self.handle(endpoint, reader, writer),
+                    host,
+                    0,
+                    ssl = self.ssl_context if kind == "HTTPS" else None,
+                    backlog = 128
+                )
+
+                endpoint.port = server.sockets[0].getsockname()[1]
+                self.endpoints.append(endpoint)
+
+                if kind == "CLOSED":
+                    # Keep the port number, but close the listener, so connections get refused
+                    server.close()
+                    await server.wait_closed()
+                    continue
+
+                self.servers.append(server)
+
+        self.random.shuffle(self.endpoints)
+
+    async def stop(self) -> None:
+        for server in self.servers:
+            server.close()
+
+        for server in self.servers:
+            await server.wait_closed()
+
+        self.servers = []
+
+        # Connections still being served (e.g. trickled replies) are dropped
+        for handler in list(self.handlers):
+            handler.cancel()
+
+        await asyncio.gather(*self.handlers, return_exceptions = True)
+
+        if self.loop is not None:
+            self.loop.set_exception_handler(self.previous_exception_handler)
+            self.loop = None
+
+    def ignore_handshake_errors(self, _loop: asyncio.AbstractEventLoop, _context: dict) -> None:
+        # Failed TLS handshakes are expected, every non-HTTPS probe sent to an HTTPS endpoint fails.
+        # Handlers cancelled when the farm stops are expected as well.
+        exception: Optional[BaseException] = _context.get("exception")
+
+        if isinstance(exception, (ssl.SSLError, ConnectionError, OSError, asyncio.CancelledError)):
+            return
+
+        if self.previous_exception_handler is not None:
+            self.previous_exception_handler(_loop, _context)
+
+        else:
+            _loop.default_exception_handler(_context)
+
+    async def handle(self, _endpoint: FarmEndpoint, _reader: asyncio.StreamReader, _writer: asyncio.StreamWriter) -> None:
+        handler: asyncio.Task = asyncio.current_task()
+        self.handlers.add(handler)
+
+        peer = _writer.get_extra_info("peername")
+
+        if peer:
+            self.peers[peer[0]] = self.peers.get(peer[0], 0) + 1
+
+        try:
+            if _endpoint.broken:
+                return
+
+            if _endpoint.kind in ["HTTP", "HTTPS"]:
+                await self.handle_http(_endpoint, _reader, _writer)
+
+            elif _endpoint.kind == "SOCKS4":
+                await self.handle_socks4(_endpoint, _reader, _writer)
+
+            elif _endpoint.kind == "SOCKS5":
+                await self.handle_socks5(_endpoint, _reader, _writer)
+
+        except (ConnectionError, OSError, asyncio.IncompleteReadError, ssl.SSLError):
+            pass
+
+        finally:
+            _writer.close()
+            self.handlers.discard(handler)
+
+    async def reply(self, _endpoint: FarmEndpoint, _writer: asyncio.StreamWriter, _data: bytes) -> None:
+        if _endpoint.latency:
+            await asyncio.sleep(_endpoint.latency)
+
+        if not _endpoint.trickle:
+            _writer.write(_data)
+            await _writer.drain()
+            return
+
+        for index in range(len(_data)):
+            _writer.write(_data[index:index + 1])
+            await _writer.drain()
+            await asyncio.sleep(self.trickle_delay)
+
+    async def handle_http(self, _endpoint: FarmEndpoint, _reader: asyncio.StreamReader, _writer: asyncio.StreamWriter) -> None:
+        # Serves requests on a keep-alive connection, until the client closes it or asks to close it
+        while True:
+            first: bytes = await _reader.read(1)
+
+            if not first:
+                return
+
+            if not first.isalpha():
+                await self.reply(_endpoint, _writer, b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                return
+
+            head: bytes = first + await _reader.readuntil(b"\r\n\r\n")
+            headers: bytes = head.lower()
+
+            # Consume the request body, if any
+            for line in headers.split(b"\r\n"):
+                if line.startswith(b"content-length:"):
+                    await _reader.readexactly(int(line.split(b":", 1)[1]))
+
+            body: bytes = b"OK"
+
+            await self.reply(
+                _endpoint,
+                _writer,
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\nContent-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+            )
+
+            if b"connection: close" in headers:
+                return
+
+    async def handle_socks4(self, _endpoint: FarmEndpoint, _reader: asyncio.StreamReader, _writer: asyncio.StreamWriter) -> None:
+        request: bytes = await _reader.read(512)
+
+        if not request or request[0] != 0x04:
+            return
+
+        await self.reply(_endpoint, _writer, b"\x00\x5A\x00\x00\x00\x00\x00\x00")
+
+    async def handle_socks5(self, _endpoint: FarmEndpoint, _reader: asyncio.StreamReader, _writer: asyncio.StreamWriter) -> None:
+        greeting: bytes = await _reader.read(512)
+
+        if not greeting or greeting[0] != 0x05:
+            return
+
+        await self.reply(_endpoint, _writer, b"\x05\x00")
+
+        # Keep the connection open until the client is done with it
+        await _reader.read(512)
+
+    def proxies(self, _with_schemes: bool = False) -> list[ProxyInfo]:
+        """
+        Returns a fresh `ProxyInfo` object for every endpoint.
+
+        Args:
+            _with_schemes (bool): If True, proxies carry their real scheme (check_connection path),
+                otherwise the scheme is None and has to be detected.
+        """
+
+        return [endpoint.to_proxy_info(_with_scheme = _with_schemes) for endpoint in self.endpoints]
+
+    def expected_schemes(self) -> dict[str, Optional[str]]:
+        return {f"{endpoint.host}|{endpoint.port}": endpoint.expected_scheme for endpoint in self.endpoints}
+
+    def accuracy(self, _tested: list[ProxyInfo]) -> float:
+        """
+        Returns the fraction of tested proxies whose result matches the endpoint behind them.
+
+        A proxy is counted as correct if it is active with the right scheme for a working endpoint,
+        or inactive for a closed or broken endpoint.
+        """
+
+        if not _tested:
+            return 0.0
+
+        expected: dict[str, Optional[str]] = self.expected_schemes()
+        correct: int = 0
+
+        for proxy in _tested:
+            scheme: Optional[str] = expected.get(proxy.id)
+
+            if scheme is None:
+                correct += not proxy.is_active
+
+            else:
+                correct += proxy.is_active and proxy.scheme == scheme
+
+        return correct / len(_tested)
+
+
+class ProxyFarmProcess:
+    """
+    Runs a `ProxyFarm` in a separate process, so the farm doesn't compete with the tester for the event loop.
+
+    Examples:
+    ```
+        >>> with ProxyFarmProcess({"HTTP": 1000, "CLOSED": 1000}) as farm:
+        >>>     proxies = farm.proxies()
+    ```
+    """
+
+    def __init__(self, *_args, **_kwargs) -> None:
+        self.args: tuple = _args
+        self.kwargs: dict = _kwargs
+
+        self.endpoints: list[FarmEndpoint] = []
+        self.process: Optional[multiprocessing.Process] = None
+        self.stop_event = multiprocessing.Event()
+
+    def __enter__(self) -> "ProxyFarmProcess":
+        parent, child = multiprocessing.Pipe()
+
+        self.process = multiprocessing.Process(target = self.run, args = (child, self.stop_event, self.args, self.kwargs), daemon = True)
+        self.process.start()
+
+        self.endpoints = [FarmEndpoint(*endpoint) for endpoint in parent.recv()]
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.stop_event.set()
+        self.process.join(timeout = 10)
+
+    @staticmethod
+    def run(_pipe, _stop_event, _args: tuple, _kwargs: dict) -> None:
+        async def main() -> None:
+            async with ProxyFarm(*_args, **_kwargs) as farm:
+                _pipe.send([endpoint.to_tuple() for endpoint in farm.endpoints])
+
+                while not _stop_event.is_set():
+                    await asyncio.sleep(0.1)
+
+        asyncio.run(main())
+
+    proxies = ProxyFarm.proxies
+    expected_schemes = ProxyFarm.expected_schemes
+    accuracy = ProxyFarm.accuracy
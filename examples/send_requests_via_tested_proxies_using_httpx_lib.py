@@ -1,51 +1,42 @@
-import asyncio, requests
+import asyncio, httpx
 from ProxySea import ProxySea
 from ProxySea.util import ProxyInfo
+from ProxySea.pool import ProxyRotator
+from ProxySea.clients import ProxyRotatingTransport
 
 PS: ProxySea = ProxySea(_debug = True)
 
-# Fetch proxies for testing
-fetched_proxies: list[ProxyInfo] = asyncio.run(PS.fetch_proxies())
 
-# Test fetched proxies before using them
-tested_proxies: list[ProxyInfo] = asyncio.run(
-    PS.test_proxies(_proxies = fetched_proxies)
-)
+async def main() -> None:
+    # Fetch proxies for testing
+    fetched_proxies: list[ProxyInfo] = await PS.fetch_proxies()
 
-# Filter only active HTTP proxies
-http_proxies: list[ProxyInfo] = [
-    proxy for proxy in tested_proxies
-    if proxy.is_active and proxy.scheme == "HTTP"
-]
+    # Test fetched proxies before using them
+    tested_proxies: list[ProxyInfo] = await PS.test_proxies(_proxies = fetched_proxies)
 
-if len(http_proxies) <= 0:
-    raise ValueError("There are no ACTIVE HTTP proxies in http_proxies list.")
+    # Rotate over the active HTTP proxies; failing proxies drop out of rotation automatically
+    rotator: ProxyRotator = ProxyRotator(tested_proxies, _schemes = ("HTTP",))
 
-print(f"Found {len(http_proxies)} HTTP and ACTIVE proxies.")
+    if rotator.choose() is None:
+        raise ValueError("There are no ACTIVE HTTP proxies in tested_proxies list.")
 
-# Iterate for each active http proxy
-for proxy in http_proxies:
-    # Get the first proxy from the list
-    requests_proxy = proxy
-
-    requests_proxies: dict[str, str] = {
-        "http":  f"{requests_proxy.host}:{requests_proxy.port}",
-        "https": f"{requests_proxy.host}:{requests_proxy.port}"
-    }
-
-    print(f"Sending request via |{requests_proxy}| proxy.")
+    # Every request goes through the next proxy, idempotent requests are retried on another proxy on failure
+    transport: ProxyRotatingTransport = ProxyRotatingTransport(rotator, _retries = 3, verify = False)
 
     # Set the base URL for requesting the resource
     BASE_URL: str = "https://ipinfo.io/json"
 
-    res = None
+    async with httpx.AsyncClient(transport = transport, timeout = 5) as client:
+        for _ in range(5):
+            try:
+                res = await client.get(BASE_URL)
+
+            except httpx.HTTPError as e:
+                print(f"Request failed: {e!r}")
+                continue
+
+            # Show the response
+            print(f"{res.text}\n")
 
-    try:
-        # Send request via the selected proxy
-        res = requests.get(url = BASE_URL, proxies = requests_proxies, timeout = 5, verify = False)
-    except Exception as e:
-        pass
 
-    if res:
-        # Show the response
-        print(f"{res.text}\n")
+asyncio.run(main())
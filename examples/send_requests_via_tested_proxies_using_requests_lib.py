@@ -1,51 +1,49 @@
-import asyncio, requests
-from ProxySea import ProxySea
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from ProxySea import SyncProxySea
 from ProxySea.util import ProxyInfo
+from ProxySea.pool import ProxyRotator
+from ProxySea.clients import ProxyRotatingAdapter
 
-PS: ProxySea = ProxySea(_debug = True)
+# One event loop runs in a background thread for the whole script, no asyncio.run() per call
+PS: SyncProxySea = SyncProxySea(_debug = True)
 
 # Fetch proxies for testing
-fetched_proxies: list[ProxyInfo] = asyncio.run(PS.fetch_proxies())
+fetched_proxies: list[ProxyInfo] = PS.fetch_proxies()
 
 # Test fetched proxies before using them
-tested_proxies: list[ProxyInfo] = asyncio.run(
-    PS.test_proxies(_proxies = fetched_proxies)
-)
+tested_proxies: list[ProxyInfo] = PS.test_proxies(_proxies = fetched_proxies)
 
-# Filter only active HTTP proxies
-http_proxies: list[ProxyInfo] = [
-    proxy for proxy in tested_proxies
-    if proxy.is_active and proxy.scheme == "HTTP"
-]
+# Rotate over the active HTTP proxies; failing proxies drop out of rotation automatically
+rotator: ProxyRotator = ProxyRotator(tested_proxies, _schemes = ("HTTP",))
 
-if len(http_proxies) <= 0:
-    raise ValueError("There are no ACTIVE HTTP proxies in http_proxies list.")
+if rotator.choose() is None:
+    raise ValueError("There are no ACTIVE HTTP proxies in tested_proxies list.")
 
-print(f"Found {len(http_proxies)} HTTP and ACTIVE proxies.")
+# Mount the adapter; connections to every proxy are pooled and reused between calls
+adapter: ProxyRotatingAdapter = ProxyRotatingAdapter(rotator, _retries = 3)
 
-for proxy in http_proxies:
-    # Get the first proxy from the list
-    requests_proxy = proxy
+session: requests.Session = requests.Session()
+session.mount("http://", adapter)
+session.mount("https://", adapter)
 
-    requests_proxies: dict[str, str] = {
-        "http":  f"{requests_proxy.host}:{requests_proxy.port}",
-        "https": f"{requests_proxy.host}:{requests_proxy.port}"
-    }
+# Set the base URL for requesting the resource
+BASE_URL: str = "https://ipinfo.io/json"
 
-    print(f"Sending request via |{requests_proxy}| proxy.")
 
-    # Set the base URL for requesting the resource
-    BASE_URL: str = "https://ipinfo.io/json"
+def fetch(_: int) -> str:
+    try:
+        # Send request via the next proxy, retried on another proxy if the connection fails
+        return session.get(url = BASE_URL, timeout = 5, verify = False).text
 
-    res = None
+    except requests.RequestException as e:
+        return f"Request failed: {e!r}"
 
-    try:
-        # Send request via the selected proxy
-        res = requests.get(url = BASE_URL, proxies = requests_proxies, timeout = 5, verify = False)
-    except Exception as e:
-        pass
-        # print(f"Got error {e}")
 
-    if res:
+# The session can be shared by a pool of worker threads
+with ThreadPoolExecutor(max_workers = 4) as executor:
+    for text in executor.map(fetch, range(8)):
         # Show the response
-        print(f"{res.text}\n")
+        print(f"{text}\n")
+
+PS.close()
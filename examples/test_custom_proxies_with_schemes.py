@@ -52,6 +52,6 @@ for proxy in tested_proxies:
     print(proxy)
     # Additional info available after testing:
     # - Is the proxy alive
-    # - Is the proxy blacklisted (if retries > 3)
+    # - Is the proxy blacklisted (skipped for a growing backoff after 3 failures in a row)
     # - Number of connection retries
     # - Proxy anonymity level
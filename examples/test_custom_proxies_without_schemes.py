@@ -52,6 +52,6 @@ for proxy in tested_proxies:
     # After testing, ProxySea provides additional information:
     # - Whether the proxy is alive
     # - Auto-detected scheme (if originally unknown)
-    # - Whether the proxy is blacklisted (if retries > 3)
+    # - Whether the proxy is blacklisted (skipped for a growing backoff after 3 failures in a row)
     # - Number of connection retries
     # - Proxy anonymity level
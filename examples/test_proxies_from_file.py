@@ -0,0 +1,24 @@
+import asyncio
+from ProxySea import ProxySea
+from ProxySea.util import ProxyListReader, ProxyListWriter  # Import the streaming reader and writer
+
+# Initialize the asynchronous ProxySea module
+PS: ProxySea = ProxySea(_debug = False)
+
+
+async def main() -> None:
+    # Read "scheme://host:port" or "host:port" lines lazily (.ndjson and .csv files work as well),
+    # duplicates are skipped on the fly
+    reader: ProxyListReader = ProxyListReader("proxies.txt")
+
+    # Write working proxies as soon as their test completes
+    with ProxyListWriter("working_proxies.ndjson") as writer:
+        async for proxy in PS.test_proxies_stream(_proxies = reader.aiter(), _concurrent_tasks = 500):
+            if proxy.is_active:
+                writer.write(proxy)
+                print(proxy)
+
+    print(f"\nSaved {writer.written} working proxies, skipped {reader.duplicates} duplicates and {reader.skipped} invalid lines.")
+
+
+asyncio.run(main())
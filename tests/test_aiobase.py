@@ -75,4 +75,26 @@ class TestAIOBase:
 
         assert len(results) == 2
         assert results[0] == 4
-        assert isinstance(results[1], RuntimeError)
\ No newline at end of file
+        assert isinstance(results[1], RuntimeError)
+
+    @pytest.mark.asyncio
+    async def test_run_tasks_with_timeout_cancels_late_tasks(self) -> None:
+        cancelled: list[int] = []
+
+        async def slow(x: int) -> int:
+            try:
+                await asyncio.sleep(x)
+
+            except asyncio.CancelledError:
+                cancelled.append(x)
+                raise
+
+            return x
+
+        for delay in [0, 5, 0, 5]:
+            self.aio.add_task(slow, delay)
+
+        results = await self.aio.run_tasks(_timeout = 0.2)
+
+        assert results == [0, None, 0, None]
+        assert cancelled == [5, 5]
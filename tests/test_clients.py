@@ -0,0 +1,229 @@
+import asyncio, io, httpx, requests, pytest
+from concurrent.futures import ThreadPoolExecutor
+from ProxySea.clients import ProxyRotatingTransport, ProxyRotatingAdapter, httpx_transport
+from ProxySea.pool import PoolSnapshot, ProxyRotator
+from ProxySea.util import ProxyInfo
+from benchmarks.proxy_farm import ProxyFarm, ProxyFarmProcess
+
+
+# Helper class for building pools out of farm endpoints
+class TestClientsHelper:
+    @staticmethod
+    def active_proxies(_farm: ProxyFarm | ProxyFarmProcess) -> list[ProxyInfo]:
+        proxies: list[ProxyInfo] = []
+
+        # Closed ports are passed as working HTTP proxies, the clients have to fail over
+        for endpoint in _farm.endpoints:
+            proxy = ProxyInfo("HTTP", endpoint.host, endpoint.port)
+            proxy.set_is_active(True)
+            proxies.append(proxy)
+
+        return proxies
+
+
+class TestProxyRotator:
+    def test_round_robin_skips_open_circuits(self) -> None:
+        proxies = [ProxyInfo("HTTP", "10.0.0.1", port) for port in [1, 2, 3]]
+
+        for proxy in proxies:
+            proxy.set_is_active(True)
+
+        rotator = ProxyRotator(proxies)
+        proxies[1].blacklist_after = 1
+        rotator.report(proxies[1], _success = False)
+
+        assert [rotator.choose().port for _ in range(4)] == [1, 3, 3, 1]
+
+    def test_filters_schemes_and_follows_snapshots(self) -> None:
+        class Service:
+            snapshot = PoolSnapshot([ProxyInfo("SOCKS4", "10.0.0.1", 1)])
+
+        rotator = ProxyRotator(Service, _schemes = ("HTTP",))
+        assert rotator.choose() is None
+
+        Service.snapshot = PoolSnapshot([ProxyInfo("HTTP", "10.0.0.1", 2)])
+        assert rotator.choose().port == 2
+
+
+class TestProxyRotatingTransport:
+    @pytest.mark.asyncio
+    async def test_fails_over_to_working_proxy(self) -> None:
+        async with ProxyFarm({"HTTP": 1, "CLOSED": 2}) as farm:
+            proxies = TestClientsHelper.active_proxies(farm)
+            transport = ProxyRotatingTransport(ProxyRotator(proxies), _retries = 2)
+
+            working_id: str = next(proxy.id for proxy, endpoint in zip(proxies, farm.endpoints) if endpoint.kind == "HTTP")
+
+            async with httpx.AsyncClient(transport = transport) as client:
+                responses = [await client.get("http://example.com/")]
+                upstream = transport.transports[working_id]
+
+                responses.extend([await client.get("http://example.com/") for _ in range(3)])
+
+                # The upstream transport of the working proxy is reused across requests
+                assert transport.transports[working_id] is upstream
+
+        assert [response.status_code for response in responses] == [200, 200, 200, 200]
+        assert [proxy.id for proxy in proxies if proxy.is_active] == [working_id]
+
+    @pytest.mark.asyncio
+    async def test_non_idempotent_requests_are_not_retried(self) -> None:
+        async with ProxyFarm({"CLOSED": 2}) as farm:
+            transport = ProxyRotatingTransport(ProxyRotator(TestClientsHelper.active_proxies(farm)))
+
+            async with httpx.AsyncClient(transport = transport) as client:
+                with pytest.raises(httpx.ConnectError):
+                    await client.post("http://example.com/", content = b"data")
+
+                assert len(transport.transports) == 1
+
+    @pytest.mark.asyncio
+    async def test_evicted_transport_is_closed_after_its_response(self) -> None:
+        async with ProxyFarm({"HTTP": 2}) as farm:
+            transport = ProxyRotatingTransport(ProxyRotator(TestClientsHelper.active_proxies(farm)), _max_transports = 1)
+
+            async with httpx.AsyncClient(transport = transport) as client:
+                async with client.stream("GET", "http://example.com/") as first:
+                    upstream = next(iter(transport.transports.values()))
+                    second = await client.get("http://example.com/")
+
+                    # Evicted by the second proxy, but still streaming the first response
+                    assert transport.evicted == {upstream}
+                    assert await first.aread() == b"OK"
+
+                await asyncio.gather(*transport.close_tasks)
+
+                assert transport.evicted == set()
+                assert transport.users == {}
+
+        assert second.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_streamed_bodies_are_not_retried(self) -> None:
+        async def body():
+            yield b"data"
+
+        async with ProxyFarm({"CLOSED": 2}) as farm:
+            transport = ProxyRotatingTransport(ProxyRotator(TestClientsHelper.active_proxies(farm)))
+
+            async with httpx.AsyncClient(transport = transport) as client:
+                with pytest.raises(httpx.ConnectError):
+                    await client.put("http://example.com/", content = body())
+
+                assert len(transport.transports) == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_pool(self) -> None:
+        transport = ProxyRotatingTransport(ProxyRotator([]))
+
+        async with httpx.AsyncClient(transport = transport) as client:
+            with pytest.raises(httpx.ProxyError):
+                await client.get("http://example.com/")
+
+    def test_rejects_socks4(self) -> None:
+        with pytest.raises(ValueError):
+            ProxyRotatingTransport(ProxyRotator([], _schemes = ("SOCKS4",)))
+
+    def test_socks5_needs_socksio(self, monkeypatch) -> None:
+        monkeypatch.setattr(httpx_transport.importlib.util, "find_spec", lambda _name: None)
+
+        with pytest.raises(ValueError, match = "socksio"):
+            ProxyRotatingTransport(ProxyRotator([], _schemes = ("HTTP", "SOCKS5")))
+
+        # HTTP only rotators don't need it
+        ProxyRotatingTransport(ProxyRotator([], _schemes = ("HTTP",)))
+
+
+class TestProxyRotatingAdapter:
+    def test_fails_over_and_reuses_connections(self) -> None:
+        with ProxyFarmProcess({"HTTP": 2, "CLOSED": 2}) as farm:
+            proxies = TestClientsHelper.active_proxies(farm)
+            adapter = ProxyRotatingAdapter(ProxyRotator(proxies), _retries = 3)
+
+            session = requests.Session()
+            session.mount("http://", adapter)
+
+            with ThreadPoolExecutor(max_workers = 4) as executor:
+                responses = list(executor.map(lambda _: session.get("http://example.com/", timeout = 5), range(20)))
+
+            managers = dict(adapter.proxy_manager)
+            session.close()
+
+        assert [response.status_code for response in responses] == [200] * 20
+        assert sum(proxy.is_active for proxy in proxies) == 2
+
+        # One connection pool per proxy, shared by all threads
+        assert len(managers) == 4
+
+    def test_non_idempotent_requests_are_not_retried(self) -> None:
+        with ProxyFarmProcess({"CLOSED": 2}) as farm:
+            adapter = ProxyRotatingAdapter(ProxyRotator(TestClientsHelper.active_proxies(farm)))
+
+            session = requests.Session()
+            session.mount("http://", adapter)
+
+            with pytest.raises(requests.exceptions.ConnectionError):
+                session.post("http://example.com/", data = b"data", timeout = 5)
+
+        assert len(adapter.proxy_manager) == 1
+
+    def test_streamed_bodies_are_not_retried(self) -> None:
+        def body():
+            yield b"data"
+
+        with ProxyFarmProcess({"CLOSED": 2}) as farm:
+            adapter = ProxyRotatingAdapter(ProxyRotator(TestClientsHelper.active_proxies(farm)))
+
+            session = requests.Session()
+            session.mount("http://", adapter)
+
+            with pytest.raises(requests.exceptions.ConnectionError):
+                session.put("http://example.com/", data = body(), timeout = 5)
+
+        assert len(adapter.proxy_manager) == 1
+
+    def test_file_bodies_are_rewound_before_a_retry(self, monkeypatch) -> None:
+        proxies = [ProxyInfo("HTTP", "10.0.0.1", port) for port in [1, 2]]
+
+        for proxy in proxies:
+            proxy.set_is_active(True)
+
+        sent: list[bytes] = []
+
+        # The first proxy reads the whole body and fails, the second one answers
+        def send(_adapter, _request, **_kwargs):
+            sent.append(_request.body.read())
+
+            if len(sent) == 1:
+                raise requests.exceptions.ConnectionError("reset")
+
+            response = requests.Response()
+            response.status_code = 200
+            return response
+
+        monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+
+        adapter = ProxyRotatingAdapter(ProxyRotator(proxies), _retries = 1)
+        session = requests.Session()
+        session.mount("http://", adapter)
+
+        body = io.BytesIO(b"header|data")
+        body.seek(7)
+
+        assert session.put("http://example.com/", data = body).status_code == 200
+        assert sent == [b"data", b"data"]
+
+    def test_evicts_least_recently_used_pools(self) -> None:
+        proxies = [ProxyInfo("HTTP", "10.0.0.1", port) for port in [1, 2, 3]]
+        adapter = ProxyRotatingAdapter(ProxyRotator([]), _max_proxy_managers = 2)
+
+        first = adapter.proxy_manager_for(adapter.get_proxy_url(proxies[0]))
+        first.connection_from_url("http://example.com/")
+
+        for proxy in proxies[1:]:
+            adapter.proxy_manager_for(adapter.get_proxy_url(proxy))
+
+        assert list(adapter.proxy_manager) == ["http://10.0.0.1:2", "http://10.0.0.1:3"]
+
+        # Another thread may still be using the evicted manager, its pools are left alone
+        assert len(first.pools) == 1
@@ -0,0 +1,136 @@
+import pytest
+from ProxySea.metrics import DEAD_FILTER_SKIPS_TOTAL
+from ProxySea.providers import ProvidersProxyTester
+from ProxySea.util import DeadEndpointFilter, ProxyListReader
+from ProxySea.util import dead_filter
+from benchmarks.proxy_farm import ProxyFarm
+
+
+class TestDeadEndpointFilter:
+    def test_sizing(self) -> None:
+        dead = DeadEndpointFilter(_capacity = 1_000_000, _error_rate = 0.01, _buckets = 1)
+
+        assert 1.1e6 < dead.bits / 8 < 1.3e6
+        assert dead.hashes == 7
+
+        # Every bucket of a lookup can be a false positive, each one gets a share of the error rate
+        dead = DeadEndpointFilter(_capacity = 1_000_000, _error_rate = 0.01, _buckets = 7)
+
+        assert dead.bucket_error_rate == pytest.approx(0.001435, rel = 1e-3)
+        assert 1.6e6 < dead.bits / 8 < 1.8e6
+
+    def test_false_positive_rate(self) -> None:
+        dead = DeadEndpointFilter(_capacity = 20_000, _error_rate = 0.01)
+
+        for index in range(20_000):
+            dead.add(f"10.0.{index >> 8}.{index & 255}", 8080)
+
+        assert all(dead.contains(f"10.0.{index >> 8}.{index & 255}", 8080) for index in range(20_000))
+
+        false_positives = sum(dead.contains(f"10.1.{index >> 8}.{index & 255}", 8080) for index in range(20_000))
+        assert false_positives / 20_000 < 0.02
+
+    def test_false_positive_rate_over_all_buckets(self, monkeypatch) -> None:
+        now = [86400.0 * 100]
+        monkeypatch.setattr(dead_filter.time, "time", lambda: now[0])
+
+        dead = DeadEndpointFilter(_capacity = 5_000, _error_rate = 0.01, _buckets = 7)
+
+        # Seven full buckets, the configured rate is what a lookup sees
+        for day in range(7):
+            for index in range(5_000):
+                dead.add(f"10.{day}.{index >> 8}.{index & 255}", 8080)
+
+            now[0] += 86400 if day < 6 else 0
+
+        assert len(dead) == 7
+
+        false_positives = sum(dead.contains(f"10.100.{index >> 8}.{index & 255}", 8080) for index in range(20_000))
+        assert false_positives / 20_000 < 0.015
+
+    def test_buckets_rotate_out(self, monkeypatch) -> None:
+        now = [86400.0 * 100]
+        monkeypatch.setattr(dead_filter.time, "time", lambda: now[0])
+
+        dead = DeadEndpointFilter(_capacity = 1000, _buckets = 3)
+        dead.add("1.1.1.1", 80)
+
+        now[0] += 86400 * 2
+        dead.add("2.2.2.2", 80)
+
+        assert dead.contains("1.1.1.1", 80) and dead.contains("2.2.2.2", 80)
+        assert len(dead) == 2
+
+        now[0] += 86400
+        assert not dead.contains("1.1.1.1", 80)
+        assert dead.contains("2.2.2.2", 80)
+        assert len(dead) == 1
+
+    def test_readmission_ratio(self) -> None:
+        dead = DeadEndpointFilter(_capacity = 1000, _readmit_ratio = 1.0)
+        dead.add("1.1.1.1", 80)
+
+        assert not dead.contains("1.1.1.1", 80)
+
+    def test_save_and_load(self, tmp_path) -> None:
+        path = str(tmp_path / "dead.bloom")
+
+        dead = DeadEndpointFilter(_path = path, _capacity = 1000, _error_rate = 0.05)
+        dead.add("1.1.1.1", 80)
+        dead.save()
+
+        loaded = DeadEndpointFilter(_path = path)
+
+        assert (loaded.bits, loaded.hashes) == (dead.bits, dead.hashes)
+        assert loaded.contains("1.1.1.1", 80)
+        assert not loaded.contains("1.1.1.1", 81)
+
+    def test_load_rejects_truncated_files(self, tmp_path) -> None:
+        path = tmp_path / "dead.bloom"
+
+        dead = DeadEndpointFilter(_path = str(path), _capacity = 1000)
+        dead.add("1.1.1.1", 80)
+        dead.save()
+
+        path.write_bytes(path.read_bytes()[:-10])
+
+        with pytest.raises(ValueError, match = "truncated"):
+            DeadEndpointFilter(_path = str(path))
+
+        path.write_bytes(b"PSDEAD1")
+
+        with pytest.raises(ValueError):
+            DeadEndpointFilter(_path = str(path))
+
+    def test_reader_skips_known_dead(self, tmp_path) -> None:
+        path = tmp_path / "proxies.txt"
+        path.write_text("1.1.1.1:80\n2.2.2.2:80\n")
+
+        dead = DeadEndpointFilter(_capacity = 1000)
+        dead.add("1.1.1.1", 80)
+
+        reader = ProxyListReader(str(path), _dead_filter = dead)
+
+        assert [proxy.host for proxy in reader] == ["2.2.2.2"]
+        assert reader.known_dead == 1
+
+    @pytest.mark.asyncio
+    async def test_tester_skips_known_dead(self) -> None:
+        dead = DeadEndpointFilter(_capacity = 1000)
+        tester = ProvidersProxyTester(_dead_filter = dead)
+        tester.proxy_tester.proxy_scheme_detector.read_timeout = 0.3
+
+        async with ProxyFarm({"HTTP": 2, "CLOSED": 2}) as farm:
+            await tester.test_proxies(farm.proxies())
+            connections = sum(farm.peers.values())
+
+            closed = [proxy for proxy in farm.proxies() if farm.expected_schemes()[proxy.id] is None]
+            assert all(dead.contains_proxy(proxy) for proxy in closed)
+
+            skipped = DEAD_FILTER_SKIPS_TOTAL.value("test")
+            tested = await tester.test_proxies(farm.proxies())
+
+            # Only the live endpoints were probed again
+            assert DEAD_FILTER_SKIPS_TOTAL.value("test") - skipped == 2
+            assert sum(farm.peers.values()) > connections
+            assert farm.accuracy(tested) == 1.0
@@ -0,0 +1,151 @@
+import asyncio, multiprocessing, pytest
+from ProxySea.distributed import DistributedCoordinator, DistributedWorker, run_worker
+from ProxySea.distributed.protocol import send_message, read_message
+from ProxySea.providers import ProvidersProxyTester
+from benchmarks.proxy_farm import ProxyFarm
+
+
+class TestDistributedHelper:
+    @staticmethod
+    def make_worker(_address: tuple[str, int]) -> DistributedWorker:
+        tester = ProvidersProxyTester()
+        tester.proxy_tester.proxy_scheme_detector.read_timeout = 0.3
+
+        return DistributedWorker(*_address, _tester = tester, _concurrent_tasks = 20)
+
+
+class TestDistributedTesting:
+    @pytest.mark.asyncio
+    async def test_worker_processes(self) -> None:
+        async with ProxyFarm({"HTTP": 10, "SOCKS5": 10, "CLOSED": 10}) as farm:
+            async with DistributedCoordinator(farm.proxies(_with_schemes = True), _batch_size = 4) as coordinator:
+                context = multiprocessing.get_context("spawn")
+                workers = [context.Process(target = run_worker, args = (*coordinator.address, 20)) for _ in range(3)]
+
+                for worker in workers:
+                    worker.start()
+
+                tested = await coordinator.wait(_timeout = 60)
+
+                for worker in workers:
+                    await asyncio.to_thread(worker.join, 10)
+
+        assert all(worker.exitcode == 0 for worker in workers)
+        assert all(proxy.is_tested for proxy in tested)
+        assert farm.accuracy(tested) == 1.0
+        assert len(coordinator.completed) == 8
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reassigned(self) -> None:
+        async with ProxyFarm({"HTTP": 4}) as farm:
+            async with DistributedCoordinator(farm.proxies(), _batch_size = 2, _lease_timeout = 0.3) as coordinator:
+                # A stuck worker takes a batch and never answers
+                reader, writer = await asyncio.open_connection(*coordinator.address)
+                await send_message(writer, {"type": "lease"})
+                stuck = await read_message(reader)
+
+                worker = TestDistributedHelper.make_worker(coordinator.address)
+                assert await worker.run() == 4
+
+                tested = await coordinator.wait(_timeout = 5)
+
+                # Late results of the expired lease are ignored
+                await send_message(writer, {"type": "results", "lease": stuck["lease"], "results": [[None, 0, 1], [None, 0, 1]]})
+                assert (await read_message(reader))["type"] == "ack"
+                writer.close()
+
+        assert farm.accuracy(tested) == 1.0
+
+    @pytest.mark.asyncio
+    async def test_late_results_of_expired_lease_are_accepted(self) -> None:
+        async with ProxyFarm({"HTTP": 2}) as farm:
+            async with DistributedCoordinator(farm.proxies(), _batch_size = 2, _lease_timeout = 0.1) as coordinator:
+                reader, writer = await asyncio.open_connection(*coordinator.address)
+                await send_message(writer, {"type": "lease"})
+                slow = await read_message(reader)
+
+                await asyncio.sleep(0.2)
+                coordinator.requeue_expired()
+
+                assert list(coordinator.pending) == [0]
+
+                # Nobody finished the batch yet, the slow worker's results complete it
+                await send_message(writer, {"type": "results", "lease": slow["lease"], "results": [["HTTP", 1, 1], [None, 0, 1]]})
+                assert (await read_message(reader))["type"] == "ack"
+                writer.close()
+
+                tested = await coordinator.wait(_timeout = 1)
+
+        assert [(proxy.scheme, proxy.is_active) for proxy in tested] == [("HTTP", True), (None, False)]
+        assert coordinator.expired == {}
+
+    @pytest.mark.asyncio
+    async def test_invalid_results_are_not_applied(self) -> None:
+        async with ProxyFarm({"HTTP": 2}) as farm:
+            async with DistributedCoordinator(farm.proxies(), _batch_size = 2) as coordinator:
+                reader, writer = await asyncio.open_connection(*coordinator.address)
+                await send_message(writer, {"type": "lease"})
+                lease = await read_message(reader)
+
+                # The first row is fine, the second one isn't, nothing may be applied
+                await send_message(writer, {"type": "results", "lease": lease["lease"], "results": [["HTTP", 1, 1], ["SOCKS6", 1, 1]]})
+                assert (await read_message(reader))["type"] == "ack"
+                writer.close()
+
+                assert list(coordinator.pending) == [0]
+                assert not any(proxy.is_tested or proxy.is_active for proxy in coordinator.proxies)
+
+    @pytest.mark.asyncio
+    async def test_skips_blacklisted_and_resets_tested_flags(self) -> None:
+        async with ProxyFarm({"HTTP": 3}) as farm:
+            proxies = farm.proxies(_with_schemes = True)
+
+            # Tested in an earlier round
+            for proxy in proxies:
+                proxy.is_tested = True
+
+            proxies[0].blacklist_after = 1
+            proxies[0].set_is_active(False)
+            proxies[0].update_connection_retries()
+
+            async with DistributedCoordinator(proxies, _batch_size = 2) as coordinator:
+                assert [proxy for batch in coordinator.batches for proxy in batch] == proxies[1:]
+                assert [proxy.is_tested for proxy in proxies] == [True, False, False]
+
+                reader, writer = await asyncio.open_connection(*coordinator.address)
+                await send_message(writer, {"type": "lease"})
+                lease = await read_message(reader)
+
+                # The worker was cut off by its deadline before testing the second proxy
+                await send_message(writer, {"type": "results", "lease": lease["lease"], "results": [["HTTP", 1, 1], [None, 0, 0]]})
+                assert (await read_message(reader))["type"] == "ack"
+                writer.close()
+
+                tested = await coordinator.wait(_timeout = 1)
+
+        assert [proxy.is_tested for proxy in tested] == [True, True, False]
+        assert proxies[0].is_blacklisted and not proxies[0].is_active
+
+    @pytest.mark.asyncio
+    async def test_disconnected_worker_releases_its_lease(self) -> None:
+        async with ProxyFarm({"SOCKS5": 2}) as farm:
+            async with DistributedCoordinator(farm.proxies(), _batch_size = 2, _lease_timeout = 3600) as coordinator:
+                reader, writer = await asyncio.open_connection(*coordinator.address)
+                await send_message(writer, {"type": "lease"})
+                await read_message(reader)
+
+                writer.close()
+                await asyncio.sleep(0.1)
+
+                assert not coordinator.leases and list(coordinator.pending) == [0]
+
+                await TestDistributedHelper.make_worker(coordinator.address).run()
+                tested = await coordinator.wait(_timeout = 5)
+
+        assert farm.accuracy(tested) == 1.0
+
+    @pytest.mark.asyncio
+    async def test_empty_list(self) -> None:
+        async with DistributedCoordinator([]) as coordinator:
+            assert await coordinator.wait(_timeout = 1) == []
+            assert await TestDistributedHelper.make_worker(coordinator.address).run() == 0
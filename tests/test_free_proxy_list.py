@@ -0,0 +1,39 @@
+import os, pytest
+from ProxySea.providers.free_proxy_list import FreeProxyListScrapper
+
+FIXTURE_PATH: str = os.path.join(os.path.dirname(__file__), "fixtures", "free_proxy_list.html")
+
+
+@pytest.fixture
+def free_proxy_list_html() -> str:
+    with open(FIXTURE_PATH, encoding = "utf-8") as file:
+        return file.read()
+
+
+class TestFreeProxyListScrapper:
+    def test_unknown_parser_raises(self, free_proxy_list_html) -> None:
+        with pytest.raises(ValueError):
+            FreeProxyListScrapper(_html = free_proxy_list_html, _parser = "html5lib")
+
+    def test_lxml_parser_scrapes_all_rows(self, free_proxy_list_html) -> None:
+        proxies = FreeProxyListScrapper(_html = free_proxy_list_html, _parser = "lxml").scrape_proxies()
+
+        assert len(proxies) == 300
+        assert all(proxy.scheme is None for proxy in proxies)
+        assert all(proxy.anonymity_level in ["HIGH", "MEDIUM", "LOW"] for proxy in proxies)
+
+    def test_lxml_parser_matches_bs4_parser(self, free_proxy_list_html) -> None:
+        lxml_proxies = FreeProxyListScrapper(_html = free_proxy_list_html, _parser = "lxml").scrape_proxies()
+        bs4_proxies = FreeProxyListScrapper(_html = free_proxy_list_html, _parser = "bs4").scrape_proxies()
+
+        assert [(p.host, p.port, p.anonymity_level) for p in lxml_proxies] == [(p.host, p.port, p.anonymity_level) for p in bs4_proxies]
+
+    def test_parsers_agree_on_unknown_labels_and_whitespace(self, free_proxy_list_html) -> None:
+        html = free_proxy_list_html.replace("<td>192.233.52.169</td>", "<td> 192.233.52.169\n</td>", 1)
+        html = html.replace("<td>transparent</td>", "<td>unknown label</td>", 1)
+
+        lxml_proxies = FreeProxyListScrapper(_html = html, _parser = "lxml").scrape_proxies()
+        bs4_proxies = FreeProxyListScrapper(_html = html, _parser = "bs4").scrape_proxies()
+
+        assert [(p.host, p.port, p.anonymity_level) for p in lxml_proxies] == [(p.host, p.port, p.anonymity_level) for p in bs4_proxies]
+        assert (lxml_proxies[0].host, lxml_proxies[0].anonymity_level) == ("192.233.52.169", None)
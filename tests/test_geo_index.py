@@ -0,0 +1,67 @@
+import os, random, socket
+from ProxySea.pool import PoolSnapshot
+from ProxySea.providers import ProvidersManager
+from ProxySea.util import GeoIPIndex, ProxyInfo
+
+FIXTURE_PATH: str = os.path.join(os.path.dirname(__file__), "fixtures", "geoip.csv")
+
+
+class TestGeoIPIndex:
+    def setup_method(self):
+        self.index = GeoIPIndex.from_csv(FIXTURE_PATH)
+
+    def test_lookup(self) -> None:
+        assert self.index.lookup("1.0.0.1") == ("AU", 13335)
+        assert self.index.lookup("1.0.1.255") == ("CN", None)
+        assert self.index.lookup("8.8.8.8") == ("US", 15169)
+        assert self.index.lookup("10.0.0.7") == ("PL", 5617)
+
+    def test_addresses_outside_ranges(self) -> None:
+        assert self.index.lookup("1.0.4.0") == (None, None)
+        assert self.index.lookup("0.0.0.1") == (None, None)
+        assert self.index.lookup("255.255.255.255") == (None, None)
+        assert self.index.lookup("192.168.1.1") == (None, None)
+        assert self.index.lookup("proxy.example.com") == (None, None)
+
+    def test_saved_index_is_memory_mapped(self, tmp_path) -> None:
+        path = str(tmp_path / "geoip.bin")
+        self.index.save(path)
+
+        loaded = GeoIPIndex.load(path)
+
+        assert loaded.mapped is not None
+        assert len(loaded) == len(self.index)
+
+        for address in ["1.0.0.1", "1.0.1.255", "8.8.8.8", "10.0.0.7", "9.9.9.9"]:
+            assert loaded.lookup(address) == self.index.lookup(address)
+
+    def test_matches_linear_scan(self, tmp_path) -> None:
+        path = tmp_path / "ranges.csv"
+        generator = random.Random(0)
+        bounds = sorted(generator.sample(range(1 << 32), 400))
+        ranges = [(bounds[index], bounds[index + 1] - 1) for index in range(0, 400, 2)]
+
+        path.write_text("\n".join(f"{start},{end},C{index % 7},{index}" for index, (start, end) in enumerate(ranges)))
+        index = GeoIPIndex.from_csv(str(path))
+
+        for _ in range(2000):
+            address = generator.randrange(1 << 32)
+            expected = next(((f"C{position % 7}", position or None) for position, (start, end) in enumerate(ranges) if start <= address <= end), (None, None))
+
+            assert index.lookup(socket.inet_ntoa(address.to_bytes(4, "big"))) == expected
+
+    def test_enrich_and_filter_by_country(self) -> None:
+        proxies = [ProxyInfo("HTTP", host, 80) for host in ["1.0.0.1", "8.8.8.8", "8.8.4.4", "10.0.0.1"]]
+
+        for proxy in proxies:
+            proxy.set_is_active(True)
+
+        assert self.index.enrich(proxies) == 3
+
+        manager = ProvidersManager()
+        assert [proxy.host for proxy in manager.get_proxies(proxies, _country = "us")] == ["8.8.8.8"]
+        assert [proxy.host for proxy in manager.get_proxies(proxies, _country = ["AU", "PL"])] == ["1.0.0.1", "10.0.0.1"]
+
+        snapshot = PoolSnapshot(proxies)
+        assert [proxy.host for proxy in snapshot.get_proxies(_country = "PL")] == ["10.0.0.1"]
+        assert snapshot.get_proxies(_country = "DE") == []
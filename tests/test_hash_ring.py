@@ -0,0 +1,101 @@
+from ProxySea.pool import ConsistentHashRing, PoolSnapshot, ProxyRotator
+from ProxySea.util import ProxyInfo
+
+
+# Helper class for building proxies
+class TestHashRingHelper:
+    @staticmethod
+    def proxies(_count: int) -> list[ProxyInfo]:
+        proxies: list[ProxyInfo] = []
+
+        for index in range(_count):
+            proxy = ProxyInfo("HTTP", f"10.0.{index // 256}.{index % 256}", 8080)
+            proxy.set_is_active(True)
+            proxies.append(proxy)
+
+        return proxies
+
+
+class TestConsistentHashRing:
+    def setup_method(self):
+        self.proxies = TestHashRingHelper.proxies(20)
+        self.ring = ConsistentHashRing(self.proxies)
+        self.keys = [f"session-{index}" for index in range(2000)]
+
+    def test_same_key_same_proxy(self) -> None:
+        assert all(self.ring.get(key) is self.ring.get(key) for key in self.keys[:100])
+
+    def test_keys_are_spread_over_all_proxies(self) -> None:
+        owners = [self.ring.get(key).id for key in self.keys]
+        counts = [owners.count(proxy.id) for proxy in self.proxies]
+
+        # 100 keys per proxy on average, virtual nodes keep every proxy close to it
+        assert min(counts) > 50 and max(counts) < 160
+
+    def test_only_keys_of_removed_proxy_move(self) -> None:
+        before = {key: self.ring.get(key).id for key in self.keys}
+        removed = self.proxies[3].id
+
+        self.ring.remove(removed)
+        after = {key: self.ring.get(key).id for key in self.keys}
+
+        moved = [key for key in self.keys if before[key] != after[key]]
+
+        assert moved
+        assert all(before[key] == removed for key in moved)
+        assert removed not in after.values()
+
+    def test_blacklisted_proxy_is_skipped_without_moving_other_keys(self) -> None:
+        before = {key: self.ring.get(key).id for key in self.keys}
+        failing = self.proxies[5]
+
+        failing.blacklist_after = 1
+        failing.report_result(False)
+
+        for key in self.keys:
+            proxy = self.ring.get(key)
+
+            assert proxy.id != failing.id
+            assert before[key] == failing.id or proxy.id == before[key]
+
+    def test_update_replaces_objects_in_place(self) -> None:
+        before = {key: self.ring.get(key).id for key in self.keys[:200]}
+        copies = TestHashRingHelper.proxies(20)
+
+        self.ring.update(copies)
+
+        assert {key: self.ring.get(key).id for key in self.keys[:200]} == before
+        assert self.ring.get(self.keys[0]) in copies
+
+    def test_state_is_swapped_as_one_tuple(self) -> None:
+        state = self.ring.state
+        self.ring.remove(self.proxies[0].id)
+
+        # A reader holding the old state still sees a complete ring
+        hashes, owners, proxies = state
+        assert len(hashes) == len(owners) == 20 * self.ring.replicas
+        assert set(owners) == set(proxies)
+
+        hashes, owners, proxies = self.ring.state
+        assert set(owners) == set(proxies) == {proxy.id for proxy in self.proxies[1:]}
+        assert self.ring.proxies is proxies
+
+    def test_empty_ring(self) -> None:
+        assert ConsistentHashRing().get("session") is None
+
+
+class TestRotatorSessionKeys:
+    def test_keyed_choice_follows_snapshots(self) -> None:
+        proxies = TestHashRingHelper.proxies(10)
+
+        class Service:
+            snapshot = PoolSnapshot(proxies)
+
+        rotator = ProxyRotator(Service)
+        owner = rotator.choose(_key = "session")
+
+        # The owner leaves the pool, the key moves to another proxy
+        Service.snapshot = PoolSnapshot(proxy for proxy in proxies if proxy is not owner)
+
+        assert rotator.choose(_key = "session").id != owner.id
+        assert rotator.choose(_key = "session", _exclude = {owner.id}) is not None
@@ -0,0 +1,82 @@
+import subprocess, sys, os, pytest
+from ProxySea.imports import LazyModule
+
+PROJECT_ROOT: str = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Modules that must never be imported by a plain `import ProxySea`.
+LAZY_MODULES: list[str] = ["httpx", "bs4", "lxml", "py_mini_racer", "colorama"]
+TOOLING_MODULES: list[str] = ["pytest", "pytest_asyncio", "unittest", "poetry"]
+
+# Generous upper bound for the cumulative import time of ProxySea, in microseconds.
+IMPORT_TIME_BUDGET_US: int = 250_000
+
+
+def import_times(_statement: str) -> dict[str, int]:
+    """
+    Runs `_statement` in a fresh interpreter with `-X importtime` and returns cumulative import times by module.
+    """
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _statement],
+        cwd = PROJECT_ROOT,
+        capture_output = True,
+        text = True,
+        check = True
+    )
+
+    times: dict[str, int] = {}
+
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative.strip())
+
+    return times
+
+
+def imported(_times: dict[str, int], _module: str) -> bool:
+    # -X importtime only times the C import path (`import` statements). LazyModule loads its module with
+    # importlib.import_module(), which runs the Python bootstrap instead, so e.g. `bs4` itself is never
+    # listed while `bs4.builder`, imported by a statement inside bs4, is. Match the submodules as well.
+    return any(name == _module or name.startswith(f"{_module}.") for name in _times)
+
+
+class TestImportTime:
+    def test_import_does_not_load_lazy_dependencies(self) -> None:
+        times = import_times("import ProxySea")
+
+        assert "ProxySea" in times
+        assert [module for module in LAZY_MODULES if imported(times, module)] == []
+
+    def test_import_does_not_load_test_and_build_tooling(self) -> None:
+        times = import_times("import ProxySea")
+
+        assert [module for module in TOOLING_MODULES if imported(times, module)] == []
+
+    def test_import_time_stays_within_budget(self) -> None:
+        # Take the best of a few runs, so a busy machine doesn't fail the test
+        best: int = min(import_times("import ProxySea")["ProxySea"] for _ in range(3))
+
+        assert best < IMPORT_TIME_BUDGET_US
+
+    def test_lazy_dependency_is_imported_on_first_use(self) -> None:
+        times = import_times("import ProxySea; from ProxySea.imports import bs4; bs4.BeautifulSoup")
+
+        assert imported(times, "bs4")
+
+    def test_missing_attribute_is_not_imported_as_submodule(self) -> None:
+        lxml = LazyModule("lxml")
+
+        # Submodule the package doesn't import itself
+        assert lxml.html.fromstring
+
+        with pytest.raises(AttributeError, match = "missing_attribute") as error:
+            lxml.missing_attribute
+
+        assert not isinstance(error.value, ModuleNotFoundError)
+
+        # Not a package at all
+        with pytest.raises(AttributeError, match = "missing_attribute"):
+            LazyModule("json").missing_attribute
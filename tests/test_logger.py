@@ -33,3 +33,75 @@ class TestLogger:
 
         assert False is logger.debug
         assert "" == out
+
+    def test_logger_formats_message_lazily(self, capfd) -> None:
+        class Expensive:
+            formatted: int = 0
+
+            def __str__(self) -> str:
+                Expensive.formatted += 1
+                return "expensive"
+
+        disabled: Logger = Logger(_logger_name = "Test_Logger", _debug = False)
+        disabled.log("Value: {}", Expensive())
+
+        assert Expensive.formatted == 0
+
+        self.logger.log("Value: {}", Expensive())
+
+        out, _ = capfd.readouterr()
+
+        assert Expensive.formatted == 1
+        assert "Value: expensive" in out
+
+    def test_logger_respects_level(self, capfd) -> None:
+        logger: Logger = Logger(_logger_name = "Test_Logger", _debug = True, _level = "WARNING")
+
+        assert False is logger.is_enabled("INFO")
+        assert True is logger.is_enabled("ERROR")
+
+        logger.info("Hidden message")
+        logger.warning("Shown message")
+
+        out, _ = capfd.readouterr()
+
+        assert "Hidden message" not in out
+        assert "Shown message" in out
+        assert "WARNING" in out
+
+    def test_logger_writes_structured_fields(self, capfd) -> None:
+        self.logger.log("Tested proxy", host = "127.0.0.1", port = 8080)
+
+        out, _ = capfd.readouterr()
+
+        assert "Tested proxy" in out
+        assert "host=" in out and "127.0.0.1" in out
+        assert "port=" in out and "8080" in out
+
+    def test_background_logger_writes_after_flush(self, capfd) -> None:
+        logger: Logger = Logger(_logger_name = "Test_Logger", _debug = True, _background = True)
+
+        for index in range(100):
+            logger.log("Background message {}", index)
+
+        logger.flush()
+
+        out, _ = capfd.readouterr()
+
+        assert "Background message 0" in out
+        assert "Background message 99" in out
+
+    def test_background_logger_snapshots_mutable_arguments(self, capfd) -> None:
+        logger: Logger = Logger(_logger_name = "Test_Logger", _debug = True, _background = True)
+        state: list[str] = ["queued"]
+
+        logger.log("State {} at {:.1f}", state, 1.25, proxy = state)
+        state[0] = "changed"
+
+        logger.flush()
+
+        out, _ = capfd.readouterr()
+
+        assert "State ['queued'] at 1.2" in out
+        assert "['queued']" in out.split("proxy=")[1]
+        assert "changed" not in out
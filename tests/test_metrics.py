@@ -0,0 +1,106 @@
+import asyncio, threading, pytest
+from ProxySea.metrics import MetricsRegistry, PROBES_TOTAL, TASKS_IN_FLIGHT
+from ProxySea.util import AIOBase
+from ProxySea.util.proxy_tester import ProxySchemeDetector
+
+
+class TestMetricsRegistry:
+    def setup_method(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_sums_increments_from_all_threads(self) -> None:
+        counter = self.registry.counter("probes_total", "Probes sent.", ["scheme"])
+
+        def worker() -> None:
+            for _ in range(1000):
+                counter.inc("HTTP")
+
+        threads = [threading.Thread(target = worker) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        assert counter.value("HTTP") == 4000
+
+    def test_gauge_goes_up_and_down(self) -> None:
+        gauge = self.registry.gauge("in_flight", "Tasks in flight.")
+
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        assert gauge.value() == 1
+
+        gauge.set(10)
+
+        assert gauge.value() == 10
+
+    def test_histogram_counts_observations_into_buckets(self) -> None:
+        histogram = self.registry.histogram("duration_seconds", "Durations.", ["provider"], _buckets = [0.1, 1.0])
+
+        histogram.observe(0.05, "spys.one")
+        histogram.observe(0.5, "spys.one")
+        histogram.observe(5.0, "spys.one")
+
+        assert histogram.count("spys.one") == 3
+        assert histogram.sum("spys.one") == pytest.approx(5.55)
+
+        exposition = self.registry.expose()
+
+        assert 'duration_seconds_bucket{provider="spys.one",le="0.1"} 1' in exposition
+        assert 'duration_seconds_bucket{provider="spys.one",le="1.0"} 2' in exposition
+        assert 'duration_seconds_bucket{provider="spys.one",le="+Inf"} 3' in exposition
+        assert 'duration_seconds_count{provider="spys.one"} 3' in exposition
+
+    def test_expose_uses_prometheus_text_format(self) -> None:
+        self.registry.counter("probes_total", "Probes sent.", ["scheme", "outcome"]).inc("HTTP", 'say "hi"')
+
+        exposition = self.registry.expose()
+
+        assert "# HELP probes_total Probes sent." in exposition
+        assert "# TYPE probes_total counter" in exposition
+        assert 'probes_total{scheme="HTTP",outcome="say \\"hi\\""} 1' in exposition
+
+    def test_registering_same_name_returns_same_metric(self) -> None:
+        first = self.registry.counter("probes_total", "Probes sent.")
+
+        assert first is self.registry.counter("probes_total", "Probes sent.")
+
+        with pytest.raises(ValueError):
+            self.registry.gauge("probes_total", "Probes sent.")
+
+
+class TestMetricsInstrumentation:
+    @pytest.mark.asyncio
+    async def test_refused_probe_is_recorded_with_exception_class(self) -> None:
+        # Reserve a free port, then close it, so the connection is refused
+        server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+        port: int = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+
+        before: float = PROBES_TOTAL.value("SOCKS5", "ConnectionRefusedError")
+
+        assert False is await ProxySchemeDetector(_connection_timeout = 1).is_socks5("127.0.0.1", port)
+        assert PROBES_TOTAL.value("SOCKS5", "ConnectionRefusedError") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_named_runner_reports_tasks_in_flight(self) -> None:
+        observed: list[float] = []
+
+        async def task() -> None:
+            observed.append(TASKS_IN_FLIGHT.value("test_runner"))
+            await asyncio.sleep(0.01)
+
+        aio = AIOBase(_semaphore = 2, _name = "test_runner")
+
+        for _ in range(4):
+            aio.add_task(task)
+
+        await aio.run_tasks()
+
+        assert max(observed) == 2
+        assert TASKS_IN_FLIGHT.value("test_runner") == 0
@@ -1,5 +1,12 @@
+import json, threading, pytest
 from unittest.mock import MagicMock
-from ProxySea.util import MiniJS
+from py_mini_racer import py_mini_racer
+from ProxySea.util import MiniJS, MiniJSPool
+
+def scoped(_script: str) -> str:
+    # Page scripts are evaluated through the scope helper of the isolate
+    return f"__proxysea_eval({json.dumps(_script)})"
+
 
 class TestMiniJS:
     def setup_method(self):
@@ -32,7 +39,7 @@ class TestMiniJS:
         self.js.mini_racer.eval.return_value = 4
 
         result = self.js.deobfuscate_script(raw_script)        
-        self.js.mini_racer.eval.assert_called_once_with(cleaned_script)
+        self.js.mini_racer.eval.assert_called_once_with(scoped(cleaned_script))
 
         assert result == 4
 
@@ -46,6 +53,107 @@ class TestMiniJS:
 
         result = self.js.get_value_from_temp_script(expression)
 
-        self.js.mini_racer.eval.assert_called_once_with(combined)
+        self.js.mini_racer.eval.assert_called_once_with(scoped(combined))
 
         assert result == 21
+
+    def test_get_values_from_temp_script_calls_eval_once(self):
+        self.js.temp_script = "var a = 3; var b = 7"
+        expressions = ["a * b", "a + b"]
+
+        combined = f"{self.js.temp_script};JSON.stringify([(a * b),(a + b)].map(String));"
+
+        self.js.mini_racer.eval.return_value = '["21", "10"]'
+
+        result = self.js.get_values_from_temp_script(expressions)
+
+        self.js.mini_racer.eval.assert_called_once_with(scoped(combined))
+
+        assert result == ["21", "10"]
+
+
+class TestMiniJSPool:
+    def setup_method(self):
+        self.pool = MiniJSPool(_max_size = 2, _max_uses = 3)
+
+    def test_pool_creates_instances_lazily(self):
+        assert self.pool.created == 0
+
+        with self.pool.borrow():
+            assert self.pool.created == 1
+
+        with self.pool.borrow():
+            assert self.pool.created == 1
+
+    def test_released_instance_is_reset(self):
+        with self.pool.borrow() as js:
+            js.set_temp_script("var a = 1;")
+
+        with self.pool.borrow() as js:
+            assert js.temp_script == ""
+
+    def test_acquire_times_out_when_pool_is_exhausted(self):
+        first = self.pool.acquire()
+        second = self.pool.acquire()
+
+        with pytest.raises(TimeoutError):
+            self.pool.acquire(_timeout = 0.01)
+
+        self.pool.release(first)
+        self.pool.release(second)
+
+    def test_instance_is_recycled_after_max_uses(self):
+        for _ in range(3):
+            with self.pool.borrow() as js:
+                used = js
+
+        assert self.pool.created == 0
+
+        with self.pool.borrow() as js:
+            assert js is not used
+
+    def test_pool_is_shared_across_threads(self):
+        results: list[str] = []
+
+        def worker(_value: int) -> None:
+            with self.pool.borrow() as js:
+                js.set_temp_script(f"var a = {_value};")
+                results.append(js.get_value_from_temp_script("a"))
+
+        threads = [threading.Thread(target = worker, args = (value,)) for value in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        assert sorted(results) == list(range(8))
+        assert self.pool.created <= 2
+
+    def test_globals_do_not_leak_between_borrows(self):
+        with self.pool.borrow() as js:
+            js.set_temp_script("var port = 8080; leaked = 3128; function f() { return 1; } Math = null;")
+            assert js.get_values_from_temp_script(["port", "leaked", "f()"]) == ["8080", "3128", "1"]
+
+        # The next page never defines port, it must not read the previous page's value
+        with self.pool.borrow() as js:
+            assert js.get_values_from_temp_script(["typeof port", "typeof leaked", "typeof f", "Math.max(1, 2)"]) == ["undefined", "undefined", "undefined", "2"]
+
+    def test_isolate_is_kept_across_borrows(self, monkeypatch):
+        constructed: list[object] = []
+        original = py_mini_racer.MiniRacer
+
+        def counting_mini_racer(*_args, **_kwargs):
+            constructed.append(None)
+            return original(*_args, **_kwargs)
+
+        monkeypatch.setattr(py_mini_racer, "MiniRacer", counting_mini_racer)
+        pool = MiniJSPool(_max_size = 1, _max_uses = None)
+
+        for value in range(5):
+            with pool.borrow() as js:
+                js.set_temp_script(f"var a = {value};")
+                assert js.get_value_from_temp_script("a") == value
+
+        assert len(constructed) == 1
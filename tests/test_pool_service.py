@@ -0,0 +1,113 @@
+import asyncio, pytest
+from ProxySea.pool import ProxyPoolService, PoolSnapshot
+from ProxySea.providers import ProvidersProxyTester
+from ProxySea.util import ProxyInfo
+from benchmarks.proxy_farm import ProxyFarm
+
+
+# Provider serving proxies of a local farm
+class FakeProvider:
+    def __init__(self, _domain: str, _proxies: list[ProxyInfo]) -> None:
+        self.domain: str = _domain
+        self.proxies: list[ProxyInfo] = _proxies
+        self.fetches: int = 0
+
+    async def fetch_proxies(self) -> list[ProxyInfo]:
+        self.fetches += 1
+        return [ProxyInfo(proxy.scheme, proxy.host, proxy.port) for proxy in self.proxies]
+
+
+class TestPoolSnapshot:
+    def test_is_immutable(self) -> None:
+        snapshot = PoolSnapshot([ProxyInfo("HTTP", "127.0.0.1", 8080)], _version = 1)
+
+        with pytest.raises(AttributeError):
+            snapshot.version = 2
+
+        assert isinstance(snapshot.proxies, tuple)
+        assert len(snapshot) == 1
+
+    def test_filters_by_scheme(self) -> None:
+        snapshot = PoolSnapshot([ProxyInfo("HTTP", "127.0.0.1", 1), ProxyInfo("SOCKS5", "127.0.0.1", 2)])
+
+        assert [proxy.port for proxy in snapshot.get_proxies(_scheme = "socks5")] == [2]
+
+
+class TestProxyPoolService:
+    def setup_method(self):
+        self.tester = ProvidersProxyTester()
+
+    def make_service(self, _providers: list[FakeProvider], **_kwargs) -> ProxyPoolService:
+        return ProxyPoolService(_providers = _providers, _proxy_tester = self.tester, _concurrent_tasks = 20, **_kwargs)
+
+    @pytest.mark.asyncio
+    async def test_publishes_only_working_proxies(self) -> None:
+        async with ProxyFarm({"HTTP": 3, "SOCKS5": 3, "CLOSED": 3}) as farm:
+            provider = FakeProvider("farm.local", farm.proxies(_with_schemes = True))
+
+            async with self.make_service([provider], _retest_interval = 0) as service:
+                snapshot = await service.wait_for_snapshot(_version = 0, _timeout = 10)
+
+        assert snapshot.version == 1
+        assert len(snapshot) == 6
+        assert all(proxy.is_active for proxy in snapshot)
+
+    @pytest.mark.asyncio
+    async def test_snapshot_held_by_reader_never_changes(self) -> None:
+        async with ProxyFarm({"HTTP": 4}) as farm:
+            provider = FakeProvider("farm.local", farm.proxies(_with_schemes = True))
+            service = self.make_service([provider], _retest_interval = 0)
+
+            await service.start()
+            first = await service.wait_for_snapshot(_version = 0, _timeout = 10)
+            proxies = list(first.proxies)
+
+            await farm.stop()
+            second = await service.retest()
+            await service.stop()
+
+        assert second.version == first.version + 1
+        assert len(second) == 0
+
+        # The reader's snapshot still holds the same, untouched proxies
+        assert list(first.proxies) == proxies
+        assert all(proxy.is_active for proxy in first)
+
+    @pytest.mark.asyncio
+    async def test_refresh_intervals_per_provider(self) -> None:
+        fast = FakeProvider("fast.local", [])
+        slow = FakeProvider("slow.local", [])
+
+        service = self.make_service([fast, slow], _refresh_intervals = {"fast.local": 0.05}, _default_refresh_interval = 60, _retest_interval = 0)
+
+        async with service:
+            await asyncio.sleep(0.3)
+
+        assert fast.fetches >= 4
+        assert slow.fetches == 1
+
+    @pytest.mark.asyncio
+    async def test_max_pool_size(self) -> None:
+        async with ProxyFarm({"SOCKS4": 5}) as farm:
+            provider = FakeProvider("farm.local", farm.proxies(_with_schemes = True))
+
+            async with self.make_service([provider], _retest_interval = 0, _max_pool_size = 2) as service:
+                snapshot = await service.wait_for_snapshot(_version = 0, _timeout = 10)
+
+        assert len(snapshot) == 2
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_pending_notifications(self) -> None:
+        service = self.make_service([], _retest_interval = 0)
+        await service.start()
+
+        # Hold the condition, so the notification stays pending
+        async with service.published:
+            service.publish([ProxyInfo("HTTP", "127.0.0.1", 8080)], "test")
+            assert len(service.notify_tasks) == 1
+
+            task = next(iter(service.notify_tasks))
+            await service.stop()
+
+        assert task.cancelled()
+        assert service.notify_tasks == set()
@@ -0,0 +1,94 @@
+import random
+from ProxySea.pool import PoolSnapshot, SubnetTrie
+from ProxySea.util import ProxyInfo
+
+
+class TestSubnetTrie:
+    def setup_method(self):
+        self.proxies = [
+            *[ProxyInfo("HTTP", f"103.152.112.{host}", 8080) for host in range(1, 11)],
+            ProxyInfo("SOCKS5", "103.152.112.1", 1080),
+            *[ProxyInfo("HTTP", f"103.152.113.{host}", 8080) for host in range(1, 4)],
+            ProxyInfo("HTTP", "45.77.56.7", 3128),
+            ProxyInfo("HTTP", "proxy.example.com", 8080)
+        ]
+
+        self.trie = SubnetTrie(self.proxies)
+
+    def test_counts(self) -> None:
+        assert len(self.trie) == len(self.proxies)
+        assert self.trie.count("103.152.112.0/24") == 11
+        assert self.trie.count("103.152.112.0/23") == 14
+        assert self.trie.count("103.152.112.1") == 2
+        assert self.trie.count("103.0.0.0/8") == 14
+        assert self.trie.count("0.0.0.0/0") == 15
+        assert self.trie.count("10.0.0.0/8") == 0
+
+        assert self.trie.get_group_counts(_prefix_length = 24) == [
+            ("103.152.112.0/24", 11),
+            ("103.152.113.0/24", 3),
+            ("45.77.56.0/24", 1),
+            ("proxy.example.com", 1)
+        ]
+
+        assert dict(self.trie.get_group_counts(_prefix_length = 23))["103.152.112.0/23"] == 14
+
+    def test_insert_and_remove(self) -> None:
+        assert not self.trie.insert(ProxyInfo("HTTP", "103.152.112.1", 8080))
+
+        assert self.trie.remove(self.proxies[-2])
+        assert not self.trie.remove(self.proxies[-2])
+        assert self.trie.remove(self.proxies[-1])
+
+        assert self.trie.count("45.0.0.0/8") == 0
+        assert 45 not in self.trie.root[1]
+        assert len(self.trie) == len(self.proxies) - 2
+
+    def test_select_at_most_k_per_subnet(self) -> None:
+        selected = self.trie.select(_per_group = 2, _prefix_length = 24)
+
+        assert len(selected) == 6
+        assert [proxy.host.rsplit(".", 1)[0] for proxy in selected[:4]] == ["103.152.112", "103.152.113", "45.77.56", "proxy.example"]
+
+        http = self.trie.select(_per_group = 100, _predicate = lambda proxy: proxy.scheme == "HTTP")
+        assert len(http) == len(self.proxies) - 1
+
+        assert len(self.trie.select(_per_group = 3, _limit = 5)) == 5
+
+    def test_select_by_asn(self) -> None:
+        for proxy in self.proxies:
+            proxy.asn = 13335 if proxy.host.startswith("103.") else None
+
+        groups = self.trie.get_groups(_by = "asn")
+
+        assert len(groups["AS13335"]) == 14
+        assert "45.77.56.0/24" in groups
+        assert len(self.trie.select(_per_group = 1, _by = "asn")) == 3
+
+    def test_matches_brute_force(self) -> None:
+        generator = random.Random(0)
+        proxies = [ProxyInfo("HTTP", f"10.{generator.randrange(4)}.{generator.randrange(8)}.{generator.randrange(256)}", 80) for _ in range(3000)]
+        trie = SubnetTrie(proxies)
+
+        unique = {proxy.id: proxy for proxy in proxies}
+        assert len(trie) == len(unique)
+
+        for prefix_length in [8, 12, 16, 21, 24]:
+            groups = trie.get_groups(_prefix_length = prefix_length)
+            mask = (0xFFFFFFFF << (32 - prefix_length)) & 0xFFFFFFFF
+
+            for group, members in groups.items():
+                network = int.from_bytes(bytes(int(octet) for octet in group.split("/")[0].split(".")), "big")
+
+                for proxy in members:
+                    address = int.from_bytes(bytes(int(octet) for octet in proxy.host.split(".")), "big")
+                    assert address & mask == network
+
+            assert sum(len(members) for members in groups.values()) == len(unique)
+
+    def test_snapshot_diverse_proxies(self) -> None:
+        snapshot = PoolSnapshot(self.proxies)
+
+        assert len(snapshot.get_diverse_proxies(_per_group = 1)) == 4
+        assert len(snapshot.get_diverse_proxies(_per_group = 1, _scheme = "SOCKS5")) == 1
+        assert snapshot.get_subnet_trie() is snapshot.get_subnet_trie()
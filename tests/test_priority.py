@@ -0,0 +1,103 @@
+import asyncio, pytest
+from ProxySea.providers import ProvidersProxyTester
+from ProxySea.util import ProxyInfo, score_by_uptime, score_by_anonymity, score_by_latency, weighted_score, default_score
+
+
+def create_proxies() -> list[ProxyInfo]:
+    proxies = [ProxyInfo("HTTP", f"10.0.0.{index}", 8080) for index in range(10)]
+
+    # Every proxy has a different history, 10.0.0.9 the best one
+    for index, proxy in enumerate(proxies):
+        for _ in range(index):
+            proxy.report_result(True)
+
+    return proxies
+
+
+class TestScores:
+    def test_uptime(self) -> None:
+        proxy = ProxyInfo("HTTP", "10.0.0.1", 8080)
+        assert score_by_uptime(proxy) == 0.5
+
+        proxy.report_result(True)
+        proxy.report_result(True)
+        proxy.report_result(False)
+
+        assert (proxy.successes, proxy.failures) == (2, 1)
+        assert score_by_uptime(proxy) == 0.6
+
+    def test_anonymity_and_latency(self) -> None:
+        high = ProxyInfo("HTTP", "10.0.0.1", 8080, "HIGH")
+        low = ProxyInfo("HTTP", "10.0.0.2", 8080, "LOW")
+
+        assert score_by_anonymity(high) > score_by_anonymity(ProxyInfo("HTTP", "10.0.0.3", 8080)) > score_by_anonymity(low)
+
+        assert score_by_latency(high) == 0.0
+        high.latency = 0.25
+        assert score_by_latency(high) == 0.8
+
+    def test_weighted_score(self) -> None:
+        proxy = ProxyInfo("HTTP", "10.0.0.1", 8080, "HIGH")
+        proxy.latency = 1.0
+
+        assert weighted_score({score_by_anonymity: 2.0, score_by_latency: 1.0})(proxy) == 2.5
+        assert default_score(proxy) == pytest.approx(0.5 + 0.2 + 0.05)
+
+
+class TestPriorityTesting:
+    def setup_method(self):
+        self.tester = ProvidersProxyTester()
+        self.order: list[ProxyInfo] = []
+
+        async def test_proxy(_proxy: ProxyInfo, _use_cache: bool = True) -> ProxyInfo:
+            self.order.append(_proxy)
+            await asyncio.sleep(0.1)
+
+            _proxy.is_tested = True
+            return _proxy
+
+        self.tester.test_proxy = test_proxy
+
+    @pytest.mark.asyncio
+    async def test_highest_score_first(self) -> None:
+        proxies = create_proxies()
+        tested = await self.tester.test_proxies(proxies, _concurrent_tasks = 2, _priority = score_by_uptime)
+
+        assert self.order == proxies[::-1]
+        assert tested == proxies
+
+    @pytest.mark.asyncio
+    async def test_deadline_cuts_off_the_worst(self) -> None:
+        proxies = create_proxies()
+        tested = await self.tester.test_proxies(proxies, _concurrent_tasks = 1, _deadline = 0.35, _priority = score_by_uptime)
+
+        # Returned in input order
+        assert tested == proxies
+        assert [proxy.host for proxy in tested if proxy.is_tested] == ["10.0.0.7", "10.0.0.8", "10.0.0.9"]
+
+    @pytest.mark.asyncio
+    async def test_queued_proxies_of_an_earlier_round_are_untested(self) -> None:
+        proxies = create_proxies()
+
+        for proxy in proxies:
+            proxy.is_tested = True
+
+        # Never started before the deadline, they must not keep the flag of the earlier round
+        tested = await self.tester.test_proxies(proxies, _concurrent_tasks = 1, _deadline = 0.35, _priority = score_by_uptime)
+
+        assert [proxy.host for proxy in tested if proxy.is_tested] == ["10.0.0.7", "10.0.0.8", "10.0.0.9"]
+
+    @pytest.mark.asyncio
+    async def test_stream(self) -> None:
+        proxies = create_proxies()
+        stream = self.tester.test_proxies_stream(proxies, _concurrent_tasks = 1, _priority = score_by_uptime, _priority_window = 20)
+
+        assert [proxy async for proxy in stream] == proxies[::-1]
+
+    @pytest.mark.asyncio
+    async def test_stream_window(self) -> None:
+        proxies = create_proxies()
+        stream = self.tester.test_proxies_stream(proxies, _concurrent_tasks = 1, _priority = score_by_uptime)
+
+        # The queue holds a single proxy, nothing to reorder
+        assert [proxy async for proxy in stream] == proxies
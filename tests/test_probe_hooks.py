@@ -0,0 +1,111 @@
+import asyncio, pytest
+from ProxySea.util import ProbeEvent
+from ProxySea.util.proxy_tester import ProxySchemeDetector
+
+
+# Helper class for starting local endpoints
+class TestProbeHooksHelper:
+    @staticmethod
+    async def start_server(_reply: bytes | None) -> tuple[asyncio.AbstractServer, int]:
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            await reader.read(64)
+
+            if _reply is None:
+                # Never reply, the probe has to time out in the read phase
+                await asyncio.sleep(10)
+
+            writer.write(_reply or b"")
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        return server, server.sockets[0].getsockname()[1]
+
+    @staticmethod
+    async def closed_port() -> int:
+        server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+        port: int = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+        return port
+
+
+class TestProbeHooks:
+    def setup_method(self):
+        self.detector = ProxySchemeDetector(_connection_timeout = 1, _read_timeout = 0.2)
+        self.events: list[ProbeEvent] = []
+        self.detector.add_probe_hook(self.events.append)
+
+    @pytest.mark.asyncio
+    async def test_successful_probe_reports_all_phases(self) -> None:
+        server, port = await TestProbeHooksHelper.start_server(b"\x05\x00")
+
+        async with server:
+            assert True is await self.detector.is_socks5("127.0.0.1", port)
+
+        assert len(self.events) == 1
+
+        event = self.events[0]
+
+        assert event.is_success
+        assert event.scheme == "SOCKS5"
+        assert event.port == port
+        assert event.exception_class is None
+        assert list(event.phases) == ["delay", "connect", "read", "close"]
+
+    @pytest.mark.asyncio
+    async def test_refused_connection_fails_in_connect_phase(self) -> None:
+        port = await TestProbeHooksHelper.closed_port()
+
+        assert False is await self.detector.is_socks4("127.0.0.1", port)
+
+        event = self.events[0]
+
+        assert event.outcome == "ConnectionRefusedError"
+        assert event.exception_class is ConnectionRefusedError
+        assert event.failed_phase == "connect"
+
+    @pytest.mark.asyncio
+    async def test_slow_reply_times_out_in_read_phase(self) -> None:
+        server, port = await TestProbeHooksHelper.start_server(None)
+
+        async with server:
+            assert False is await self.detector.is_http("127.0.0.1", port)
+
+        event = self.events[0]
+
+        assert event.failed_phase == "read"
+        assert issubclass(event.exception_class, asyncio.TimeoutError)
+        assert "connect" in event.phases and "read" not in event.phases
+
+    @pytest.mark.asyncio
+    async def test_invalid_reply_is_rejected(self) -> None:
+        server, port = await TestProbeHooksHelper.start_server(b"garbage")
+
+        async with server:
+            assert False is await self.detector.is_socks5("127.0.0.1", port)
+
+        assert self.events[0].outcome == "rejected"
+        assert self.events[0].failed_phase is None
+
+    @pytest.mark.asyncio
+    async def test_removed_hook_receives_no_events(self) -> None:
+        self.detector.remove_probe_hook(self.events.append)
+        port = await TestProbeHooksHelper.closed_port()
+
+        await self.detector.is_socks5("127.0.0.1", port)
+
+        assert self.events == []
+
+    @pytest.mark.asyncio
+    async def test_failing_hook_does_not_break_probe(self) -> None:
+        def failing_hook(_event: ProbeEvent) -> None:
+            raise RuntimeError("Oops!")
+
+        self.detector.add_probe_hook(failing_hook)
+        server, port = await TestProbeHooksHelper.start_server(b"\x05\x00")
+
+        async with server:
+            assert True is await self.detector.is_socks5("127.0.0.1", port)
+
+        assert len(self.events) == 1
@@ -0,0 +1,74 @@
+import asyncio, time, pytest
+from ProxySea.metrics import TASKS_IN_FLIGHT
+from ProxySea.providers import ProvidersProxyTester
+from benchmarks.proxy_farm import ProxyFarm
+
+
+class TestProxyFarm:
+    def setup_method(self):
+        self.tester = ProvidersProxyTester()
+
+        # Probes sent to endpoints of another kind wait for a reply that never comes
+        self.tester.proxy_tester.proxy_scheme_detector.read_timeout = 0.3
+
+    @pytest.mark.asyncio
+    async def test_detects_every_scheme(self) -> None:
+        async with ProxyFarm({"HTTP": 3, "HTTPS": 3, "SOCKS4": 3, "SOCKS5": 3, "CLOSED": 3}) as farm:
+            tested = await self.tester.test_proxies(farm.proxies())
+
+        assert len(tested) == 15
+        assert farm.accuracy(tested) == 1.0
+        assert sum(proxy.is_active for proxy in tested) == 12
+
+    @pytest.mark.asyncio
+    async def test_check_connection_with_known_schemes(self) -> None:
+        async with ProxyFarm({"HTTP": 2, "HTTPS": 2, "SOCKS4": 2, "SOCKS5": 2, "CLOSED": 2}, _latency = 0.05) as farm:
+            tested = await self.tester.test_proxies(farm.proxies(_with_schemes = True))
+
+        assert farm.accuracy(tested) == 1.0
+
+    @pytest.mark.asyncio
+    async def test_broken_endpoints_are_inactive(self) -> None:
+        async with ProxyFarm({"HTTP": 2, "SOCKS5": 2}, _failure_ratio = 1.0) as farm:
+            tested = await self.tester.test_proxies(farm.proxies(_with_schemes = True))
+
+        assert not any(proxy.is_active for proxy in tested)
+        assert farm.accuracy(tested) == 1.0
+
+    @pytest.mark.asyncio
+    async def test_deadline_returns_partial_results(self) -> None:
+        # Slow proxies keep replying within the read timeout, only the deadline stops them
+        self.tester.proxy_tester.proxy_scheme_detector.read_timeout = 30
+
+        async with ProxyFarm({"HTTP": 3}) as fast, ProxyFarm({"HTTP": 3}, _latency = 10) as slow:
+            proxies = fast.proxies(_with_schemes = True) + slow.proxies(_with_schemes = True)
+
+            start = time.perf_counter()
+            tested = await self.tester.test_proxies(proxies, _deadline = 1)
+
+            assert time.perf_counter() - start < 2
+            assert TASKS_IN_FLIGHT.value("test_proxies") == 0
+
+        assert [proxy.is_tested for proxy in tested] == [True] * 3 + [False] * 3
+        assert [proxy.is_active for proxy in tested] == [True] * 3 + [False] * 3
+
+    @pytest.mark.asyncio
+    async def test_restores_exception_handler(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        def handler(_loop, _context) -> None:
+            pass
+
+        loop.set_exception_handler(handler)
+
+        try:
+            async with ProxyFarm({"HTTP": 1}) as farm:
+                async with ProxyFarm({"HTTP": 1}) as nested:
+                    assert loop.get_exception_handler() == nested.ignore_handshake_errors
+
+                assert loop.get_exception_handler() == farm.ignore_handshake_errors
+
+            assert loop.get_exception_handler() is handler
+
+        finally:
+            loop.set_exception_handler(None)
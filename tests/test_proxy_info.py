@@ -0,0 +1,90 @@
+import time, pytest
+from ProxySea.providers import ProvidersProxyTester
+from ProxySea.util import ProxyInfo
+from benchmarks.proxy_farm import ProxyFarm
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self) -> None:
+        proxy = ProxyInfo("HTTP", "10.0.0.1", 8080)
+
+        proxy.report_result(False)
+        proxy.report_result(False)
+
+        assert proxy.circuit_state == "CLOSED"
+        assert not proxy.is_blacklisted
+
+        proxy.report_result(False)
+
+        assert proxy.circuit_state == "OPEN"
+        assert proxy.is_blacklisted
+
+    def test_success_resets_failures(self) -> None:
+        proxy = ProxyInfo("HTTP", "10.0.0.1", 8080)
+
+        proxy.report_result(False)
+        proxy.report_result(False)
+        proxy.report_result(True)
+        proxy.report_result(False)
+
+        assert proxy.connection_retries == 1
+        assert proxy.circuit_state == "CLOSED"
+
+    def test_half_open_after_backoff(self) -> None:
+        proxy = ProxyInfo("HTTP", "10.0.0.1", 8080, _blacklist_after = 1, _backoff = 0.05)
+        proxy.report_result(False)
+
+        # Results recorded while the circuit is open are ignored
+        proxy.report_result(False)
+        assert proxy.circuit_trips == 1
+
+        time.sleep(0.06)
+
+        assert proxy.circuit_state == "HALF_OPEN"
+        assert not proxy.is_blacklisted
+
+        proxy.report_result(True)
+
+        assert proxy.circuit_state == "CLOSED"
+        assert proxy.circuit_trips == 0
+
+    def test_backoff_doubles_up_to_the_limit(self) -> None:
+        proxy = ProxyInfo("HTTP", "10.0.0.1", 8080, _blacklist_after = 1, _backoff = 10, _max_backoff = 25)
+        backoffs: list[float] = []
+
+        for _ in range(4):
+            proxy.report_result(False)
+            backoffs.append(round(proxy.open_until - time.monotonic()))
+
+            # Let the backoff elapse, so the next failure is a failed half-open re-probe
+            proxy.open_until = 0.0
+
+        assert backoffs == [10, 20, 25, 25]
+
+
+class TestTesterSkipsOpenCircuits:
+    @pytest.mark.asyncio
+    async def test_recovered_proxy_comes_back(self) -> None:
+        tester = ProvidersProxyTester()
+
+        async with ProxyFarm({"SOCKS5": 1}) as farm:
+            proxy = farm.proxies(_with_schemes = True)[0]
+
+        # The farm is stopped, the proxy fails and its circuit opens
+        proxy.blacklist_after = 1
+        proxy.backoff = 0.05
+        await tester.test_proxy(proxy)
+        assert proxy.is_blacklisted
+
+        async with ProxyFarm({"SOCKS5": 1}) as farm:
+            proxy.port = farm.endpoints[0].port
+
+            # Skipped while open, re-probed once the backoff elapsed
+            await tester.test_proxy(proxy)
+            assert not proxy.is_active
+
+            time.sleep(0.06)
+            await tester.test_proxy(proxy)
+
+        assert proxy.is_active
+        assert proxy.circuit_state == "CLOSED"
@@ -0,0 +1,111 @@
+import pytest
+from ProxySea.providers import ProvidersProxyTester
+from ProxySea.util import ProxyInfo, ProxyListReader, ProxyListWriter
+from benchmarks.proxy_farm import ProxyFarm
+
+
+class TestProxyListReader:
+    def test_reads_text_lazily_and_deduplicates(self, tmp_path) -> None:
+        path = tmp_path / "proxies.txt"
+        path.write_bytes(
+            b"# comment\r\n"
+            b"http://10.0.0.1:8080\r\n"
+            b"10.0.0.2:1080\r\n"
+            b"\r\n"
+            b"10.0.0.1:8080\r\n"
+            b"not a proxy\r\n"
+            b"socks5://proxy.example.com:1080"
+        )
+
+        # A tiny chunk size splits lines (and "\r\n" pairs) between chunks
+        reader = ProxyListReader(str(path), _chunk_size = 3)
+        proxies = list(reader)
+
+        assert [proxy.id for proxy in proxies] == ["10.0.0.1|8080", "10.0.0.2|1080", "proxy.example.com|1080"]
+        assert [proxy.scheme for proxy in proxies] == ["HTTP", None, "SOCKS5"]
+        assert reader.duplicates == 1
+        assert reader.skipped == 1
+
+    def test_multibyte_characters_split_between_chunks(self, tmp_path) -> None:
+        path = tmp_path / "proxies.txt"
+        path.write_text("# źdźbło\n10.0.0.1:80\n", encoding = "utf-8")
+
+        assert [proxy.id for proxy in ProxyListReader(str(path), _chunk_size = 1)] == ["10.0.0.1|80"]
+
+    def test_empty_file(self, tmp_path) -> None:
+        path = tmp_path / "proxies.txt"
+        path.write_bytes(b"")
+
+        assert list(ProxyListReader(str(path))) == []
+
+    @pytest.mark.parametrize("extension", ["ndjson", "csv", "txt"])
+    def test_writer_output_reads_back(self, tmp_path, extension: str) -> None:
+        path = str(tmp_path / f"proxies.{extension}")
+        proxies = [ProxyInfo("SOCKS4", "10.0.0.1", 1080, "HIGH"), ProxyInfo(None, "10.0.0.2", 3128)]
+
+        with ProxyListWriter(path, _flush_every = 1) as writer:
+            writer.write_many(proxies)
+
+        read = list(ProxyListReader(path))
+
+        assert [proxy.id for proxy in read] == ["10.0.0.1|1080", "10.0.0.2|3128"]
+        assert [proxy.scheme for proxy in read] == ["SOCKS4", None]
+
+    def test_unknown_format(self) -> None:
+        with pytest.raises(ValueError):
+            ProxyListReader("proxies.txt", _format = "xml")
+
+
+class TestProxiesStream:
+    def setup_method(self):
+        self.tester = ProvidersProxyTester()
+
+    @pytest.mark.asyncio
+    async def test_streams_file_through_tester_into_writer(self, tmp_path) -> None:
+        source = str(tmp_path / "proxies.txt")
+        target = str(tmp_path / "working.ndjson")
+
+        async with ProxyFarm({"HTTP": 5, "SOCKS5": 5, "CLOSED": 5}) as farm:
+            with ProxyListWriter(source) as writer:
+                writer.write_many(farm.proxies(_with_schemes = True))
+
+            with ProxyListWriter(target, _flush_every = 1) as writer:
+                async for proxy in self.tester.test_proxies_stream(ProxyListReader(source).aiter(), _concurrent_tasks = 4):
+                    if proxy.is_active:
+                        writer.write(proxy)
+
+        working = list(ProxyListReader(target))
+
+        assert len(working) == 10
+        assert {proxy.scheme for proxy in working} == {"HTTP", "SOCKS5"}
+
+    @pytest.mark.asyncio
+    async def test_consumer_can_stop_early(self) -> None:
+        async with ProxyFarm({"SOCKS4": 10}) as farm:
+            stream = self.tester.test_proxies_stream(iter(farm.proxies(_with_schemes = True)), _concurrent_tasks = 2)
+
+            async for proxy in stream:
+                break
+
+            await stream.aclose()
+
+        assert proxy.is_active
+
+    @pytest.mark.asyncio
+    async def test_tester_error_is_raised_after_the_other_results(self) -> None:
+        async def test_proxy(_proxy: ProxyInfo, _use_cache: bool = True) -> ProxyInfo:
+            if _proxy.port == 2:
+                raise RuntimeError("probe failed")
+
+            return _proxy
+
+        self.tester.test_proxy = test_proxy
+        proxies = [ProxyInfo("HTTP", "10.0.0.1", port) for port in range(10)]
+        tested: list[ProxyInfo] = []
+
+        # A single worker, it must survive the error instead of leaving the consumer waiting forever
+        with pytest.raises(RuntimeError, match = "probe failed"):
+            async for proxy in self.tester.test_proxies_stream(proxies, _concurrent_tasks = 1):
+                tested.append(proxy)
+
+        assert [proxy.port for proxy in tested] == [0, 1, 3, 4, 5, 6, 7, 8, 9]
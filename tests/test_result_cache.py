@@ -0,0 +1,105 @@
+import asyncio, pytest
+from ProxySea.providers import ProvidersProxyTester
+from ProxySea.util import ProbeResultCache, ProxyInfo
+from ProxySea.util import result_cache
+from benchmarks.proxy_farm import ProxyFarm
+
+
+class TestProbeResultCache:
+    def setup_method(self):
+        self.cache = ProbeResultCache(_positive_ttl = 10, _negative_ttl = 5, _max_size = 3)
+
+    def test_ttls(self, monkeypatch) -> None:
+        now = [1000.0]
+        monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+
+        self.cache.put(("1.1.1.1", 80, "AUTO"), _active = True, _scheme = "HTTP")
+        self.cache.put(("2.2.2.2", 80, "AUTO"), _active = False, _scheme = None)
+
+        now[0] += 6
+        assert self.cache.get(("1.1.1.1", 80, "AUTO")) == (True, "HTTP")
+        assert self.cache.get(("2.2.2.2", 80, "AUTO")) is None
+
+        now[0] += 5
+        assert self.cache.get(("1.1.1.1", 80, "AUTO")) is None
+        assert len(self.cache) == 0
+
+    def test_evicts_least_recently_used(self) -> None:
+        for host in ["1.1.1.1", "2.2.2.2", "3.3.3.3"]:
+            self.cache.put((host, 80, "HTTP"), _active = True, _scheme = "HTTP")
+
+        self.cache.get(("1.1.1.1", 80, "HTTP"))
+        self.cache.put(("4.4.4.4", 80, "HTTP"), _active = True, _scheme = "HTTP")
+
+        assert self.cache.get(("2.2.2.2", 80, "HTTP")) is None
+        assert self.cache.get(("1.1.1.1", 80, "HTTP")) is not None
+        assert len(self.cache) == 3
+
+    def test_keys(self) -> None:
+        assert self.cache.get_key(ProxyInfo(None, "1.1.1.1", 80)) == ("1.1.1.1", 80, "AUTO")
+        assert self.cache.get_key(ProxyInfo("SOCKS5", "1.1.1.1", 80)) == ("1.1.1.1", 80, "SOCKS5")
+
+
+class TestCachedTesting:
+    def setup_method(self):
+        self.cache = ProbeResultCache()
+        self.tester = ProvidersProxyTester(_result_cache = self.cache)
+        self.tester.proxy_tester.proxy_scheme_detector.read_timeout = 0.3
+
+    @pytest.mark.asyncio
+    async def test_second_round_is_served_from_cache(self) -> None:
+        async with ProxyFarm({"HTTP": 2, "SOCKS5": 2, "CLOSED": 2}) as farm:
+            first = await self.tester.test_proxies(farm.proxies())
+            connections = sum(farm.peers.values())
+
+            second = await self.tester.test_proxies(farm.proxies())
+
+            assert sum(farm.peers.values()) == connections
+
+        assert (self.cache.hits, self.cache.misses) == (6, 6)
+        assert farm.accuracy(first) == farm.accuracy(second) == 1.0
+
+    @pytest.mark.asyncio
+    async def test_duplicates_in_one_batch_are_probed_once(self) -> None:
+        async with ProxyFarm({"HTTP": 2}) as farm:
+            tested = await self.tester.test_proxies(farm.proxies() * 3)
+
+        assert (self.cache.hits, self.cache.misses) == (4, 2)
+        assert all(proxy.is_active and proxy.scheme == "HTTP" for proxy in tested)
+
+    @pytest.mark.asyncio
+    async def test_bypassing_the_cache(self) -> None:
+        async with ProxyFarm({"HTTP": 2}) as farm:
+            await self.tester.test_proxies(farm.proxies())
+            await self.tester.test_proxies(farm.proxies(), _use_cache = False)
+
+        assert (self.cache.hits, self.cache.misses) == (0, 2)
+
+    @pytest.mark.asyncio
+    async def test_waiters_of_a_cancelled_probe_stay_untested(self) -> None:
+        started = asyncio.Event()
+
+        async def probe_proxy(_proxy: ProxyInfo) -> ProxyInfo:
+            started.set()
+            await asyncio.sleep(10)
+
+        self.tester.probe_proxy = probe_proxy
+
+        leader = ProxyInfo("HTTP", "10.0.0.1", 8080)
+        waiter = ProxyInfo("HTTP", "10.0.0.1", 8080)
+
+        # State left over from an earlier round must not be taken for the result of this one
+        waiter.set_is_active(True)
+
+        leading = asyncio.create_task(self.tester.test_proxy(leader))
+        await started.wait()
+
+        waiting = asyncio.create_task(self.tester.test_proxy(waiter))
+        await asyncio.sleep(0)
+
+        leading.cancel()
+
+        assert await waiting is waiter
+        assert not waiter.is_tested
+        assert self.cache.get(self.cache.get_key(waiter)) is None
+        assert self.cache.in_flight == {}
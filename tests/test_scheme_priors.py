@@ -0,0 +1,97 @@
+import pytest
+from ProxySea.providers import ProvidersProxyTester
+from ProxySea.util import SchemePriors
+from benchmarks.proxy_farm import ProxyFarm
+
+
+class TestSchemePriors:
+    def setup_method(self):
+        self.priors = SchemePriors()
+
+    def test_well_known_ports(self) -> None:
+        assert self.priors.get_order(1080) == ["SOCKS5", "SOCKS4", "HTTP", "HTTPS"]
+        assert self.priors.get_order(3128)[0] == "HTTP"
+        assert self.priors.get_order(4145)[0] == "SOCKS4"
+
+        # Nothing known, the default order
+        assert self.priors.get_order(12345) == SchemePriors.SCHEMES
+
+    def test_learns_by_port_and_provider(self) -> None:
+        for port in range(20000, 20020):
+            self.priors.record(port, "socks.example", "SOCKS4", 4)
+            self.priors.record(port + 100, "http.example", "HTTP", 1)
+
+        # Unknown port, the provider decides
+        assert self.priors.get_order(30000, "socks.example")[0] == "SOCKS4"
+        assert self.priors.get_order(30000, "http.example")[0] == "HTTP"
+
+        # Unknown provider, the port decides
+        assert self.priors.get_order(9050, "new.example")[0] == "SOCKS5"
+
+        probabilities = self.priors.get_probabilities(30000, "socks.example")
+        assert sum(probabilities.values()) == pytest.approx(1.0)
+
+        assert self.priors.get_average_probes() == 2.5
+
+    def test_dead_proxies_only_count_probes(self) -> None:
+        self.priors.record(30000, "a", None, 4)
+
+        assert self.priors.overall == {}
+        assert 30000 not in self.priors.ports
+        assert (self.priors.detections, self.priors.probes) == (1, 4)
+
+    def test_counts_are_halved(self) -> None:
+        priors = SchemePriors(_max_count = 10)
+
+        for _ in range(11):
+            priors.record(30000, None, "HTTP")
+
+        assert priors.ports[30000] == {"HTTP": 5.5}
+
+    def test_save_and_load(self, tmp_path) -> None:
+        path = str(tmp_path / "priors.json")
+        priors = SchemePriors(_path = path)
+
+        priors.record(30000, "a", "SOCKS4")
+        priors.save()
+
+        loaded = SchemePriors(_path = path)
+
+        assert loaded.ports[30000] == {"SOCKS4": 1.0}
+        assert loaded.providers == {"a": {"SOCKS4": 1.0}}
+        assert loaded.get_order(30000, "a") == priors.get_order(30000, "a")
+
+    def test_invalid_arguments(self) -> None:
+        with pytest.raises(ValueError):
+            SchemePriors(_strength = 0)
+
+
+class TestOrderedDetection:
+    @pytest.mark.asyncio
+    async def test_priors_cut_probes(self) -> None:
+        priors = SchemePriors()
+        tester = ProvidersProxyTester(_scheme_priors = priors)
+        tester.proxy_tester.proxy_scheme_detector.read_timeout = 0.3
+
+        async with ProxyFarm({"HTTP": 10, "HTTPS": 10, "SOCKS4": 10, "SOCKS5": 10}) as farm:
+            expected = farm.expected_schemes()
+
+            def proxies() -> list:
+                # Every provider lists a single scheme
+                listed = farm.proxies()
+
+                for proxy in listed:
+                    proxy.provider = f"{expected[proxy.id]}.example".lower()
+
+                return listed
+
+            first = await tester.test_proxies(proxies())
+            probes = priors.probes
+
+            second = await tester.test_proxies(proxies())
+
+        assert farm.accuracy(first) == farm.accuracy(second) == 1.0
+
+        # Learned from the first round, every proxy of the second one needs a single probe
+        assert priors.probes - probes == 40
+        assert priors.get_order(1, "socks4.example")[0] == "SOCKS4"
@@ -0,0 +1,119 @@
+import asyncio, os, socket, struct, pytest
+from ProxySea.providers import ProvidersProxyTester
+from ProxySea.util import SocketProfile
+from benchmarks.proxy_farm import ProxyFarm
+
+
+def count_time_wait(_port: int) -> int:
+    # /proc/net/tcp rows: sl local_address rem_address st ..., addresses as HEXIP:HEXPORT, TIME_WAIT is 06
+    count: int = 0
+
+    with open("/proc/net/tcp") as file:
+        for line in list(file)[1:]:
+            fields = line.split()
+            ports = [int(fields[1].split(":")[1], 16), int(fields[2].split(":")[1], 16)]
+
+            if fields[3] == "06" and _port in ports:
+                count += 1
+
+    return count
+
+
+async def connect_and_close(_port: int, _connections: int, _profile: SocketProfile | None) -> None:
+    async def connect() -> None:
+        if _profile is None:
+            reader, writer = await asyncio.open_connection("127.0.0.1", _port)
+
+        else:
+            reader, writer = await _profile.open_connection("127.0.0.1", _port)
+
+        writer.write(b"ping")
+        await reader.readexactly(4)
+
+        writer.close()
+        await writer.wait_closed()
+
+    await asyncio.gather(*[connect() for _ in range(_connections)])
+
+
+class TestSocketProfile:
+    def test_socket_options(self) -> None:
+        profile = SocketProfile(_receive_buffer = 4096, _source_addresses = ["127.0.0.2"])
+        sock = profile.create_socket(socket.AF_INET)
+
+        try:
+            assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_LINGER, 8) == struct.pack("ii", 1, 0)
+            assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY) == 1
+            assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) <= 4096 * 2
+            assert sock.getsockname()[0] == "127.0.0.2"
+
+        finally:
+            sock.close()
+
+    def test_families(self) -> None:
+        assert SocketProfile.get_family("10.0.0.1") == socket.AF_INET
+        assert SocketProfile.get_family("::1") == socket.AF_INET6
+        assert SocketProfile.get_family("localhost") is None
+
+    @pytest.mark.asyncio
+    async def test_hostname_is_resolved(self) -> None:
+        async def echo(_reader: asyncio.StreamReader, _writer: asyncio.StreamWriter) -> None:
+            _writer.close()
+
+        server = await asyncio.start_server(echo, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server:
+            reader, writer = await SocketProfile().open_connection("localhost", port)
+            writer.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not os.path.exists("/proc/net/tcp"), reason = "Needs /proc/net/tcp")
+    async def test_stress_no_time_wait_across_loopback_aliases(self) -> None:
+        peers: dict[str, int] = {}
+
+        async def echo(_reader: asyncio.StreamReader, _writer: asyncio.StreamWriter) -> None:
+            peer = _writer.get_extra_info("peername")[0]
+            peers[peer] = peers.get(peer, 0) + 1
+
+            try:
+                _writer.write(await _reader.readexactly(4))
+                await _writer.drain()
+                await _reader.read()
+
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass
+
+            finally:
+                _writer.close()
+
+        server = await asyncio.start_server(echo, "0.0.0.0", 0, backlog = 4096)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server:
+            # Every address of 127.0.0.0/8 routes to the loopback interface, no setup needed
+            profile = SocketProfile(_source_addresses = ["127.0.0.1", "127.0.0.2", "127.0.0.3", "127.0.0.4"])
+            await connect_and_close(port, 2000, profile)
+
+            assert peers == {f"127.0.0.{index}": 500 for index in range(1, 5)}
+            assert count_time_wait(port) == 0
+
+            # Closing normally leaves the connections in TIME_WAIT
+            await connect_and_close(port, 200, None)
+            await asyncio.sleep(0.1)
+
+            assert count_time_wait(port) > 0
+
+
+class TestProfiledTesting:
+    @pytest.mark.asyncio
+    async def test_accuracy_with_profile(self) -> None:
+        profile = SocketProfile(_source_addresses = ["127.0.0.2", "127.0.0.3"])
+        tester = ProvidersProxyTester(_socket_profile = profile)
+        tester.proxy_tester.proxy_scheme_detector.read_timeout = 0.3
+
+        async with ProxyFarm({"HTTP": 5, "HTTPS": 5, "SOCKS4": 5, "SOCKS5": 5, "CLOSED": 5}) as farm:
+            tested = await tester.test_proxies(farm.proxies())
+
+        assert farm.accuracy(tested) == 1.0
+        assert set(farm.peers) == {"127.0.0.2", "127.0.0.3"}
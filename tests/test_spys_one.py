@@ -0,0 +1,80 @@
+import pytest
+from ProxySea.providers.spys_one import SpysOneScrapper
+from ProxySea.util import MiniJSPool
+
+# Packed variable script, in the same "eval(function(p,..." form that spys.one serves.
+PACKED_SCRIPT: str = "eval(function(p,a,c,k,e,d){return p}('a1b2=1111;c3d4=2222^a1b2;e5f6=3333;g7h8=4444^e5f6;',0,0,'',0,{}))"
+
+# (ip, port, anonymity) tuples rendered into the fixture table.
+ROWS: list[tuple[str, int, str]] = [
+    ("10.0.0.1", 8080, "HIA"),
+    ("10.0.0.2", 3128, "ANM"),
+    ("10.0.0.3", 1080, "NOA"),
+    ("10.0.0.4", 80, "HIA")
+]
+
+
+def obfuscate_port(_port: int) -> str:
+    # Every digit is written as (x ^ y), where x ^ y == digit and y is one of the packed variables.
+    variables: dict[str, int] = {"a1b2": 1111, "c3d4": 2222 ^ 1111, "e5f6": 3333, "g7h8": 4444 ^ 3333}
+    digits: list[str] = []
+
+    for index, digit in enumerate(str(_port)):
+        name: str = list(variables)[index % len(variables)]
+        digits.append(f"({int(digit) ^ variables[name]}^{name})")
+
+    return 'document.write(":"+' + "+".join(digits) + ")"
+
+
+@pytest.fixture
+def spys_one_html() -> str:
+    rows: str = "".join(
+        f"<tr class=\"spy1x\" onmouseover=\"this.style.background='#002424'\">"
+        f"<td><font class=\"spy14\">{ip}<script type=\"text/javascript\">{obfuscate_port(port)}</script></font></td>"
+        f"<td><font class=\"spy1\">HTTP</font></td>"
+        f"<td><font class=\"spy1\">{anonymity}</font></td></tr>"
+        for ip, port, anonymity in ROWS
+    )
+
+    return (
+        "<html><head><script type=\"text/javascript\">" + PACKED_SCRIPT + "</script></head><body>"
+        "<table><tr><td>Header</td></tr></table>"
+        "<table><tr><td>Proxy servers sorted by country</td></tr>" + rows + "</table>"
+        "</body></html>"
+    )
+
+
+class TestSpysOneScrapper:
+    def test_get_proxies_deobfuscates_all_ports(self, spys_one_html) -> None:
+        proxies = SpysOneScrapper(_html = spys_one_html).get_proxies()
+
+        assert [proxy.port for proxy in proxies] == [port for _, port, _ in ROWS]
+        assert [proxy.anonymity_level for proxy in proxies] == ["HIGH", "MEDIUM", "LOW", "HIGH"]
+
+    def test_get_proxies_evaluates_ports_in_single_call(self, spys_one_html) -> None:
+        pool = MiniJSPool(_max_size = 1)
+        eval_calls: list[str] = []
+
+        with pool.borrow() as mini_js:
+            original_eval = mini_js.mini_racer.eval
+
+            def counting_eval(_script: str):
+                eval_calls.append(_script)
+                return original_eval(_script)
+
+            mini_js.mini_racer.eval = counting_eval
+
+        SpysOneScrapper(_html = spys_one_html, _mini_js_pool = pool).get_proxies()
+
+        # One call deobfuscates the packed script, one call evaluates every port. The release adds a reset call.
+        assert len([script for script in eval_calls if script.startswith("__proxysea_eval(")]) == 2
+        assert eval_calls[-1] == "__proxysea_reset()"
+
+    def test_get_proxies_reuses_pooled_mini_js(self, spys_one_html) -> None:
+        pool = MiniJSPool(_max_size = 1)
+
+        first = SpysOneScrapper(_html = spys_one_html, _mini_js_pool = pool).get_proxies()
+        second = SpysOneScrapper(_html = spys_one_html, _mini_js_pool = pool).get_proxies()
+
+        assert [proxy.id for proxy in first] == [proxy.id for proxy in second]
+        assert pool.created == 1
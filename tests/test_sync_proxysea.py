@@ -0,0 +1,107 @@
+import asyncio, threading, pytest
+from concurrent.futures import ThreadPoolExecutor
+from ProxySea import SyncProxySea
+from ProxySea.util import EventLoopThread
+from benchmarks.proxy_farm import ProxyFarm
+from test_pool_service import FakeProvider
+
+
+class TestEventLoopThread:
+    def setup_method(self):
+        self.loop_thread = EventLoopThread()
+        self.loop_thread.start()
+
+    def teardown_method(self):
+        self.loop_thread.stop()
+
+    def test_run_and_submit(self) -> None:
+        assert self.loop_thread.run(asyncio.sleep(0, "done")) == "done"
+        assert self.loop_thread.submit(asyncio.sleep(0.05, "later")).result(timeout = 5) == "later"
+
+    def test_loop_outlives_calls(self) -> None:
+        async def get_loop() -> asyncio.AbstractEventLoop:
+            return asyncio.get_running_loop()
+
+        assert self.loop_thread.run(get_loop()) is self.loop_thread.run(get_loop()) is self.loop_thread.loop
+
+    def test_iterate_and_stop_early(self) -> None:
+        closed = threading.Event()
+
+        async def numbers():
+            try:
+                for number in range(100):
+                    yield number
+
+            finally:
+                closed.set()
+
+        for number in self.loop_thread.iterate(numbers()):
+            if number == 3:
+                break
+
+        assert closed.is_set()
+        assert list(self.loop_thread.iterate(numbers())) == list(range(100))
+
+    def test_stop_cancels_remaining_tasks(self) -> None:
+        started, cancelled = threading.Event(), threading.Event()
+
+        async def forever() -> None:
+            started.set()
+
+            try:
+                await asyncio.sleep(3600)
+
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        self.loop_thread.submit(forever())
+        started.wait(5)
+        self.loop_thread.stop(_timeout = 5)
+
+        assert cancelled.is_set()
+        assert not self.loop_thread.is_running
+
+        with pytest.raises(RuntimeError):
+            self.loop_thread.submit(asyncio.sleep(0))
+
+
+class TestSyncProxySea:
+    def setup_method(self):
+        self.PS = SyncProxySea()
+        self.PS.proxy_sea.providers_proxy_tester.proxy_tester.proxy_scheme_detector.read_timeout = 0.3
+
+        # The farm runs on the same background loop
+        self.farm = ProxyFarm({"HTTP": 2, "SOCKS5": 2, "CLOSED": 2})
+        self.PS.run(self.farm.start())
+
+    def teardown_method(self):
+        if self.PS.loop_thread.is_running:
+            self.PS.run(self.farm.stop())
+            self.PS.close()
+
+    def test_blocking_calls_from_many_threads(self) -> None:
+        with ThreadPoolExecutor(max_workers = 4) as executor:
+            results = list(executor.map(lambda _: self.PS.test_proxies(self.farm.proxies()), range(4)))
+
+        assert all(self.farm.accuracy(tested) == 1.0 for tested in results)
+
+    def test_stream_and_futures(self) -> None:
+        streamed = list(self.PS.test_proxies_stream(self.farm.proxies(), _concurrent_tasks = 3))
+        future = self.PS.submit(self.PS.proxy_sea.test_proxies, self.farm.proxies())
+
+        assert self.farm.accuracy(streamed) == 1.0
+        assert self.farm.accuracy(future.result(timeout = 10)) == 1.0
+
+    def test_pool_service_runs_in_background(self) -> None:
+        self.PS.proxy_sea.providers_manager.PROVIDERS = [FakeProvider("farm.local", self.farm.proxies(_with_schemes = True))]
+
+        service = self.PS.start_pool_service(_retest_interval = 0)
+        snapshot = self.PS.run(service.wait_for_snapshot(_version = 0, _timeout = 10))
+
+        assert len(snapshot) == 4
+        assert service.is_running
+
+        self.PS.run(self.farm.stop())
+        self.PS.close()
+        assert not service.is_running
@@ -0,0 +1,130 @@
+import asyncio, time, pytest
+from ProxySea.util import TimerWheel
+
+
+class TestTimerWheel:
+    def setup_method(self):
+        self.wheel = TimerWheel(_tick = 0.01, _slots = 8)
+
+    def test_invalid_arguments(self) -> None:
+        with pytest.raises(ValueError):
+            TimerWheel(_tick = 0)
+
+        with pytest.raises(ValueError):
+            TimerWheel(_slots = 0)
+
+    def test_requires_uncancel(self, monkeypatch) -> None:
+        # Without Task.uncancel() an external cancel could be taken for a timeout
+        monkeypatch.setattr(TimerWheel, "SUPPORTED", False)
+
+        with pytest.raises(RuntimeError):
+            TimerWheel()
+
+    @pytest.mark.asyncio
+    async def test_timeout_raises(self) -> None:
+        start = time.perf_counter()
+
+        with pytest.raises(asyncio.TimeoutError):
+            async with self.wheel.timeout(0.05):
+                await asyncio.sleep(5)
+
+        assert 0.05 <= time.perf_counter() - start < 1
+        assert self.wheel.active == 0
+
+    @pytest.mark.asyncio
+    async def test_finished_in_time(self) -> None:
+        async with self.wheel.timeout(0.2):
+            await asyncio.sleep(0.01)
+
+        # The cancelled entry must not touch the task later on
+        await asyncio.sleep(0.3)
+
+        assert self.wheel.active == 0
+        assert self.wheel.handle is None
+
+    @pytest.mark.asyncio
+    async def test_no_timeout(self) -> None:
+        async with self.wheel.timeout(None):
+            await asyncio.sleep(0.01)
+
+        assert self.wheel.handle is None
+
+    @pytest.mark.asyncio
+    async def test_many_timeouts_past_one_round(self) -> None:
+        async def wait(_delay: float, _sleep: float) -> bool:
+            try:
+                async with self.wheel.timeout(_delay):
+                    await asyncio.sleep(_sleep)
+
+            except asyncio.TimeoutError:
+                return False
+
+            return True
+
+        # 8 slots of 10 ms, the 0.15 s timeouts go around the wheel
+        results = await asyncio.gather(
+            *[wait(0.15, 0.01) for _ in range(500)],
+            *[wait(0.02, 5) for _ in range(500)],
+            *[wait(0.15, 5) for _ in range(500)]
+        )
+
+        assert results == [True] * 500 + [False] * 1000
+        assert self.wheel.active == 0
+
+    @pytest.mark.asyncio
+    async def test_never_fires_early(self) -> None:
+        for delay in [0.013, 0.031, 0.09]:
+            start = time.perf_counter()
+
+            with pytest.raises(asyncio.TimeoutError):
+                async with self.wheel.timeout(delay):
+                    await asyncio.sleep(5)
+
+            assert time.perf_counter() - start >= delay
+
+    @pytest.mark.asyncio
+    async def test_external_cancel_propagates(self) -> None:
+        async def wait() -> None:
+            async with self.wheel.timeout(5):
+                await asyncio.sleep(5)
+
+        task = asyncio.create_task(wait())
+        await asyncio.sleep(0.02)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert self.wheel.active == 0
+
+    @pytest.mark.asyncio
+    async def test_external_cancel_in_the_expiring_tick_propagates(self) -> None:
+        async def wait() -> None:
+            async with self.wheel.timeout(0.02):
+                await asyncio.sleep(5)
+
+        task = asyncio.create_task(wait())
+        advance = self.wheel.advance
+
+        def advance_and_cancel() -> None:
+            advance()
+
+            # Cancelled from outside right after the wheel expired the timeout, before the task ran
+            if task.cancelling() == 1:
+                task.cancel()
+
+        self.wheel.advance = advance_and_cancel
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert self.wheel.active == 0
+
+    def test_rebinds_to_new_loop(self) -> None:
+        async def wait() -> None:
+            async with self.wheel.timeout(0.02):
+                await asyncio.sleep(5)
+
+        for _ in range(2):
+            with pytest.raises(asyncio.TimeoutError):
+                asyncio.run(wait())